@@ -0,0 +1,43 @@
+"""
+Throughput benchmark of RceNetwork.classify.
+
+Run from the root of the repository: python3 -m benchmarks.bench_classify
+"""
+import argparse
+import time
+import numpy as np
+from data.point import Point
+from rce.rce_trainer import RceTrainer
+
+def random_training_input(size, classes, seed):
+    generator = np.random.default_rng(seed)
+    coordinates = generator.uniform(0, 100, (size, 2))
+    class_indexes = generator.integers(0, classes, size)
+    return [Point(float(x), float(y), "Class {}".format(c)) for (x, y), c in zip(coordinates, class_indexes)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures classification throughput of a trained RCE network.")
+    parser.add_argument("--training-size", type=int, default=2000)
+    parser.add_argument("--query-size", type=int, default=1_000_000)
+    parser.add_argument("--r-max", type=float, default=5)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rce_trainer = RceTrainer(args.r_max)
+    rce_trainer.Train(random_training_input(args.training_size, 3, args.seed), record_trace=False)
+    rce_network = rce_trainer.rce_network
+    queries = np.random.default_rng(args.seed + 1).uniform(0, 100, (args.query_size, 2))
+
+    start = time.perf_counter()
+    labels, results = rce_network.classify(queries, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    print("hidden neurons: {}".format(len(rce_network.hidden_layer)))
+    print("classified points: {}".format(len(queries)))
+    print("time: {:.3f} s".format(elapsed))
+    print("throughput: {:.0f} points/s".format(len(queries) / elapsed))
+    print("results (unknown, unique, ambiguous): {}".format(np.bincount(results, minlength=3).tolist()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Comparison of distance metrics (rce.metrics) on synthetic datasets (benchmarks.datasets): epochs, wall time
+of training, hidden neurons, accuracy on held-out points and throughput of classification.
+
+Run from the root of the repository: python3 -m benchmarks.bench_metrics --sizes 20000
+"""
+import argparse
+import time
+import numpy as np
+from benchmarks.datasets import SHAPES, generate, to_points
+from rce.evaluation import score, split_holdout
+from rce.metrics import METRICS, WeightedEuclidean, get_metric
+from rce.rce_trainer import RceTrainer
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares training and classification of RCE networks with different metrics.")
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=["real", "radial"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20_000])
+    parser.add_argument("--dimensions", type=int, default=2)
+    parser.add_argument("--metrics", nargs="+", choices=list(METRICS), default=list(METRICS))
+    parser.add_argument("--weights", type=float, nargs="+", help="Weights of weighted_euclidean, by default from 0.5 to 2.")
+    parser.add_argument("--r-max", type=float, default=1.0)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--queries", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    weights = args.weights if args.weights is not None else np.linspace(0.5, 2, args.dimensions).tolist()
+
+    print("{:>10} {:>8} {:>19} {:>7} {:>9} {:>8} {:>9} {:>14}".format("shape", "size", "metric", "epochs", "time", "neurons",
+                                                                    "accuracy", "points/s"))
+    for size in args.sizes:
+        for shape in args.shapes:
+            coordinates, labels = generate(shape, size, args.dimensions, args.seed)
+            class_names, codes = np.unique(np.array(labels, dtype=object).astype(str), return_inverse=True)
+            training_indexes, holdout_indexes = split_holdout(len(labels), args.holdout, args.seed)
+            training_input = to_points(coordinates[training_indexes], [labels[index] for index in training_indexes])
+            queries = np.random.default_rng(args.seed).uniform(coordinates.min(axis=0), coordinates.max(axis=0),
+                                                               (args.queries, args.dimensions))
+            for name in args.metrics:
+                metric = get_metric(name, weights if name == WeightedEuclidean.name else None)
+                rce_trainer = RceTrainer(args.r_max, metric=metric)
+                start = time.perf_counter()
+                stats = rce_trainer.Train(training_input, record_trace=False)
+                elapsed = time.perf_counter() - start
+                accuracy, _, _ = score(rce_trainer.rce_network, coordinates[holdout_indexes], codes[holdout_indexes], class_names.tolist())
+                start = time.perf_counter()
+                rce_trainer.rce_network.classify(queries)
+                classification_time = time.perf_counter() - start
+                print("{:>10} {:>8} {:>19} {:>7} {:>8.2f}s {:>8} {:>9} {:>14.0f}".format(
+                    shape, len(labels), name, stats.epochs, elapsed, len(rce_trainer.rce_network.hidden_layer),
+                    "-" if accuracy is None else "{:.3f}".format(accuracy), args.queries / classification_time))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Comparison of the classic training (RceTrainer without trace) and the one-shot training (OneShotTrainer)
+on synthetic datasets (benchmarks.datasets): epochs, wall time, hidden neurons and accuracy on held-out points.
+
+Run from the root of the repository: python3 -m benchmarks.bench_one_shot --sizes 100000
+"""
+import argparse
+import time
+import numpy as np
+from benchmarks.datasets import SHAPES, generate, to_points
+from rce.evaluation import score, split_holdout
+from rce.one_shot_trainer import OneShotTrainer
+from rce.rce_trainer import RceTrainer
+
+def run(trainer, training_input, coordinates, codes, class_names, holdout_indexes):
+    start = time.perf_counter()
+    stats = trainer.Train(training_input, record_trace=False)
+    elapsed = time.perf_counter() - start
+    accuracy, _, _ = score(trainer.rce_network, coordinates[holdout_indexes], codes[holdout_indexes], class_names)
+    return stats.epochs, elapsed, len(trainer.rce_network.hidden_layer), accuracy
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares classic and one-shot training of RCE networks.")
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--dimensions", type=int, default=2)
+    parser.add_argument("--r-max", type=float, default=1.0)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("{:>10} {:>8} {:>9} {:>7} {:>9} {:>8} {:>9}".format("shape", "size", "trainer", "epochs", "time", "neurons", "accuracy"))
+    for size in args.sizes:
+        for shape in args.shapes:
+            coordinates, labels = generate(shape, size, args.dimensions, args.seed)
+            class_names, codes = np.unique(np.array(labels, dtype=object).astype(str), return_inverse=True)
+            training_indexes, holdout_indexes = split_holdout(len(labels), args.holdout, args.seed)
+            training_input = to_points(coordinates[training_indexes], [labels[index] for index in training_indexes])
+            for name, trainer in [("classic", RceTrainer(args.r_max)), ("one-shot", OneShotTrainer(args.r_max))]:
+                epochs, elapsed, neurons, accuracy = run(trainer, training_input, coordinates, codes, class_names.tolist(), holdout_indexes)
+                print("{:>10} {:>8} {:>9} {:>7} {:>8.2f}s {:>8} {:>9}".format(
+                    shape, len(labels), name, epochs, elapsed, neurons, "-" if accuracy is None else "{:.3f}".format(accuracy)))
+
+if __name__ == "__main__":
+    main()
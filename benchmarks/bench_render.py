@@ -0,0 +1,89 @@
+"""
+Compares time per frame of redrawing the whole plot (clear axes, scatter of every training point,
+circle patch for every hidden neuron) with the incremental NetworkRenderer when stepping through training.
+With decision regions it compares the cached raster updated only around changed hyperspheres with
+classification of all pixels in every frame.
+
+Runs without display on the Agg backend.
+Run from the root of the repository: python3 -m benchmarks.bench_render
+"""
+import argparse
+import time
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
+from benchmarks.bench_classify import random_training_input
+from gui.network_renderer import NetworkRenderer
+from rce.rce_trainer import RceTrainer
+
+def build_canvas():
+    figure = Figure(figsize=(5, 5), dpi=100)
+    ax = figure.add_subplot()
+    return FigureCanvasAgg(figure), ax
+
+def full_redraw(canvas, ax, training_input, rce_network, limits):
+    ax.cla()
+    ax.set_xlim(limits[0], limits[1])
+    ax.set_ylim(limits[2], limits[3])
+    for point in training_input:
+        ax.scatter(point.x, point.y, s=80, color=point.class_name)
+    for neuron in rce_network.hidden_layer:
+        ax.add_artist(Circle((neuron.weights[0], neuron.weights[1]), neuron.radius, color=neuron.output_neuron.class_name, fill=False, linewidth=3))
+    canvas.draw()
+
+def render_steps(training_input, coordinates, networks, limits, show_regions, cached_regions):
+    """
+    Returns time per frame of NetworkRenderer, without cached_regions all pixels of decision regions are classified in every frame.
+    """
+    canvas, ax = build_canvas()
+    renderer = NetworkRenderer(canvas, ax, show_regions)
+    renderer.set_training_data(coordinates, [point.class_name for point in training_input], limits)
+    start = time.perf_counter()
+    for rce_network in networks:
+        if not cached_regions:
+            renderer.regions = None
+        renderer.update(rce_network, rce_network.index_of_hidden_neuron, coordinates[rce_network.train_input_index])
+    return (time.perf_counter() - start) / len(networks)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares full redraw with incremental rendering of training steps.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 400, 1000])
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--r-max", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Class names are used as colors by the GUI
+    colors = {"Class 0": "red", "Class 1": "green", "Class 2": "blue"}
+    print("{:>8} {:>8} {:>14} {:>14} {:>8} {:>14} {:>14} {:>8}".format(
+        "points", "neurons", "full redraw", "incremental", "speedup", "full regions", "regions", "speedup"))
+    for size in args.sizes:
+        training_input = random_training_input(size, 3, args.seed)
+        for point in training_input:
+            point.class_name = colors[point.class_name]
+        rce_trainer = RceTrainer(args.r_max)
+        rce_trainer.Train(training_input)
+        trace = rce_trainer.rce_networks
+        indexes = np.linspace(0, len(trace) - 1, args.frames).astype(int)
+        networks = [trace[index] for index in indexes]
+
+        coordinates = np.array([(point.x, point.y) for point in training_input])
+        limits = (coordinates[:, 0].min() - 1.5, coordinates[:, 0].max() + 1.5, coordinates[:, 1].min() - 1.5, coordinates[:, 1].max() + 1.5)
+
+        canvas, ax = build_canvas()
+        start = time.perf_counter()
+        for rce_network in networks:
+            full_redraw(canvas, ax, training_input, rce_network, limits)
+        full_time = (time.perf_counter() - start) / len(networks)
+
+        incremental_time = render_steps(training_input, coordinates, networks, limits, False, False)
+        full_regions_time = render_steps(training_input, coordinates, networks, limits, True, False)
+        regions_time = render_steps(training_input, coordinates, networks, limits, True, True)
+
+        print("{:>8} {:>8} {:>11.1f} ms {:>11.1f} ms {:>7.1f}x {:>11.1f} ms {:>11.1f} ms {:>7.1f}x".format(
+              size, len(networks[-1].hidden_layer), 1000 * full_time, 1000 * incremental_time, full_time / incremental_time,
+              1000 * full_regions_time, 1000 * regions_time, full_regions_time / regions_time))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Compares the grid spatial index with the linear scan over all hidden neurons
+in training and classification as the number of hidden neurons grows.
+
+Run from the root of the repository: python3 -m benchmarks.bench_spatial_index
+"""
+import argparse
+import time
+import numpy as np
+from benchmarks.bench_classify import random_training_input
+from rce.rce_trainer import RceTrainer
+
+def measure(training_input, queries, r_max, use_spatial_index):
+    rce_trainer = RceTrainer(r_max, use_spatial_index=use_spatial_index)
+    start = time.perf_counter()
+    rce_trainer.Train(training_input, record_trace=False)
+    training_time = time.perf_counter() - start
+    start = time.perf_counter()
+    rce_trainer.rce_network.classify(queries)
+    return len(rce_trainer.rce_network.hidden_layer), training_time, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares grid spatial index with linear scan.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000, 8000])
+    parser.add_argument("--query-size", type=int, default=100_000)
+    parser.add_argument("--r-max", type=float, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    queries = np.random.default_rng(args.seed + 1).uniform(0, 100, (args.query_size, 2))
+    print("{:>8} {:>8} {:>12} {:>12} {:>12} {:>12}".format("points", "neurons", "train scan", "train grid", "infer scan", "infer grid"))
+    for size in args.sizes:
+        training_input = random_training_input(size, 3, args.seed)
+        neurons, scan_training, scan_inference = measure(training_input, queries, args.r_max, False)
+        _, grid_training, grid_inference = measure(training_input, queries, args.r_max, True)
+        print("{:>8} {:>8} {:>11.3f}s {:>11.3f}s {:>11.3f}s {:>11.3f}s".format(
+            size, neurons, scan_training, grid_training, scan_inference, grid_inference))
+
+if __name__ == "__main__":
+    main()
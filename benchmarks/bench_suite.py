@@ -0,0 +1,128 @@
+"""
+Benchmark suite of training and inference on synthetic datasets (benchmarks.datasets).
+
+For every shape and size it measures wall time and tracemalloc peak memory of RceTrainer.Train
+without trace, number of epochs and hidden neurons, inference throughput and, for datasets up to
+--trace-limit points, the same for training with trace together with the number of recorded steps
+(snapshots). Results are saved as JSON, --compare prints ratios against results of another run.
+
+Run from the root of the repository:
+    python3 -m benchmarks.bench_suite --sizes 100 1000 10000 --output results.json
+    python3 -m benchmarks.bench_suite --sizes 100 1000 10000 --compare results.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+import numpy as np
+from benchmarks.datasets import SHAPES, generate, to_points
+from rce.rce_trainer import RceTrainer
+
+def measure(function, memory : bool):
+    """
+    Runs the function and returns its result, wall time and tracemalloc peak memory (None without memory).
+    Time is measured in a run without tracemalloc, which slows down allocations.
+    """
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    if not memory:
+        return result, elapsed, None
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def train(training_input, r_max, record_trace):
+    rce_trainer = RceTrainer(r_max)
+    rce_trainer.Train(training_input, record_trace=record_trace)
+    return rce_trainer
+
+def run_case(shape, size, dimensions, args):
+    coordinates, labels = generate(shape, size, dimensions, args.seed)
+    training_input = to_points(coordinates, labels)
+    result = {"shape": shape, "size": len(training_input), "dimensions": dimensions, "r_max": args.r_max}
+
+    rce_trainer, result["train_time"], result["train_peak_bytes"] = measure(lambda: train(training_input, args.r_max, False), args.memory)
+    rce_network = rce_trainer.rce_network
+    result["epochs"] = rce_network.iteration
+    result["hidden_neurons"] = len(rce_network.hidden_layer)
+
+    queries = np.random.default_rng(args.seed + 1).uniform(coordinates.min(axis=0), coordinates.max(axis=0), (args.queries, dimensions))
+    _, inference_time, result["inference_peak_bytes"] = measure(lambda: rce_network.classify(queries), args.memory)
+    result["inference_points_per_second"] = args.queries / inference_time if inference_time > 0 else None
+
+    if len(training_input) <= args.trace_limit:
+        traced, result["traced_train_time"], result["traced_train_peak_bytes"] = measure(lambda: train(training_input, args.r_max, True), args.memory)
+        result["snapshots"] = len(traced.rce_networks)
+        result["events"] = len(traced.rce_networks.events)
+    return result
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, previous_results):
+    """
+    Prints ratios (current / previous) of times, memory and throughput of matching cases.
+    """
+    previous_cases = {(case["shape"], case["size"], case["dimensions"], case["r_max"]): case for case in previous_results["results"]}
+    keys = ["train_time", "train_peak_bytes", "inference_points_per_second", "traced_train_time", "traced_train_peak_bytes"]
+    print("\nratio to {} ({})".format(previous_results.get("commit"), previous_results.get("created")))
+    print("{:>10} {:>8} {:>4}".format("shape", "size", "dim") + "".join(" {:>14}".format(key[:14]) for key in keys))
+    for case in results:
+        previous = previous_cases.get((case["shape"], case["size"], case["dimensions"], case["r_max"]))
+        if previous is None:
+            continue
+        ratios = []
+        for key in keys:
+            if case.get(key) and previous.get(key):
+                ratios.append("{:>14.2f}".format(case[key] / previous[key]))
+            else:
+                ratios.append("{:>14}".format("-"))
+        print("{:>10} {:>8} {:>4} ".format(case["shape"], case["size"], case["dimensions"]) + " ".join(ratios))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks training and inference on synthetic datasets.")
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[2])
+    parser.add_argument("--r-max", type=float, default=1.0)
+    parser.add_argument("--queries", type=int, default=100_000)
+    parser.add_argument("--trace-limit", type=int, default=200, help="Largest dataset trained also with trace.")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip tracemalloc runs.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file for results.")
+    parser.add_argument("--compare", help="JSON file with results of a previous run.")
+    args = parser.parse_args()
+
+    results = []
+    print("{:>10} {:>8} {:>4} {:>7} {:>8} {:>10} {:>10} {:>12} {:>10}".format(
+        "shape", "size", "dim", "epochs", "neurons", "train", "peak MiB", "points/s", "snapshots"))
+    for dimensions in args.dimensions:
+        for size in args.sizes:
+            for shape in args.shapes:
+                result = run_case(shape, size, dimensions, args)
+                results.append(result)
+                peak = result["train_peak_bytes"]
+                print("{:>10} {:>8} {:>4} {:>7} {:>8} {:>9.3f}s {:>10} {:>12.0f} {:>10}".format(
+                    shape, result["size"], dimensions, result["epochs"], result["hidden_neurons"], result["train_time"],
+                    "-" if peak is None else "{:.1f}".format(peak / 2**20), result["inference_points_per_second"] or 0,
+                    result.get("snapshots", "-")))
+
+    output = {"commit": git_commit(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+              "numpy": np.__version__, "arguments": vars(args), "results": results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Seeded generators of synthetic datasets with the shapes of the datasets in test_files
+(Clustered, Diagonal, Linear, Radial, Random, Real) at any size and number of dimensions.
+
+Points fill a cube with side size ** (1 / dimensions), so the density of points (about one point
+per unit of volume) and therefore a sensible r_max does not depend on the size.
+"""
+import numpy as np
+from data.point import Point
+
+CLASS_NAMES = ["Red", "Green", "Blue", "Magenta", "Cyan", "Black"]
+
+def side(size : int, dimensions : int) -> float:
+    return max(1.0, size ** (1 / dimensions))
+
+def clustered(size : int, dimensions : int, generator : np.random.Generator):
+    # Few large clusters, one class per cluster
+    clusters = len(CLASS_NAMES) * 2
+    centers = generator.uniform(0, side(size, dimensions), (clusters, dimensions))
+    cluster_indexes = generator.integers(0, clusters, size)
+    spread = side(size, dimensions) / clusters
+    coordinates = centers[cluster_indexes] + generator.normal(0, spread, (size, dimensions))
+    return coordinates, cluster_indexes % len(CLASS_NAMES)
+
+def diagonal(size : int, dimensions : int, generator : np.random.Generator):
+    # Main diagonal, anti-diagonal (first coordinate reversed) and points scattered between them
+    length = side(size, dimensions)
+    class_indexes = generator.choice(3, size, p=[0.45, 0.45, 0.1])
+    positions = generator.uniform(0, length, size)
+    coordinates = np.repeat(positions[:, None], dimensions, axis=1)
+    coordinates[class_indexes == 1, 0] = length - coordinates[class_indexes == 1, 0]
+    scattered = class_indexes == 2
+    coordinates[scattered] = generator.uniform(0, length, (scattered.sum(), dimensions))
+    coordinates[~scattered] += generator.normal(0, 0.5, ((~scattered).sum(), dimensions))
+    return coordinates, class_indexes
+
+def linear(size : int, dimensions : int, generator : np.random.Generator):
+    # Parallel bands along the last coordinate, every other band belongs to the third class
+    length = side(size, dimensions)
+    coordinates = generator.uniform(0, length, (size, dimensions))
+    bands = max(3, int(length / 2))
+    band_indexes = generator.integers(0, bands, size)
+    coordinates[:, -1] = (band_indexes + 0.5) * length / bands + generator.normal(0, 0.1, size)
+    class_indexes = np.where(band_indexes % 2 == 1, 2, (band_indexes // 2) % 2)
+    return coordinates, class_indexes
+
+def radial(size : int, dimensions : int, generator : np.random.Generator):
+    # Concentric shells around the center, class by the shell
+    length = side(size, dimensions)
+    directions = generator.normal(0, 1, (size, dimensions))
+    directions /= np.linalg.norm(directions, axis=1)[:, None]
+    shells = max(3, int(length / 4))
+    shell_indexes = generator.integers(0, shells, size)
+    radii = (shell_indexes + 0.5) * length / (2 * shells) + generator.normal(0, 0.2, size)
+    coordinates = length / 2 + directions * radii[:, None]
+    return coordinates, shell_indexes % 3
+
+def random(size : int, dimensions : int, generator : np.random.Generator):
+    # Uniform points with uniform classes
+    coordinates = generator.uniform(0, side(size, dimensions), (size, dimensions))
+    return coordinates, generator.integers(0, len(CLASS_NAMES), size)
+
+def real(size : int, dimensions : int, generator : np.random.Generator):
+    # Many small tight clusters of a few points with random classes
+    clusters = max(1, size // 3)
+    centers = generator.uniform(0, side(size, dimensions), (clusters, dimensions))
+    cluster_indexes = generator.integers(0, clusters, size)
+    coordinates = centers[cluster_indexes] + generator.normal(0, 0.15, (size, dimensions))
+    return coordinates, generator.integers(0, len(CLASS_NAMES), clusters)[cluster_indexes]
+
+SHAPES = {"clustered": clustered, "diagonal": diagonal, "linear": linear, "radial": radial, "random": random, "real": real}
+
+def generate(shape : str, size : int, dimensions : int = 2, seed : int = 0):
+    """
+    Generates a dataset of the given shape. The same arguments always give the same dataset.
+
+    :param shape: One of SHAPES.
+    :param size: Number of points.
+    :param dimensions: Number of coordinates of points.
+    :param seed: Seed of the random generator.
+    :return: tuple (coordinates, labels) - (size, dimensions) float array without duplicated points and list of class names.
+    """
+    generator = np.random.default_rng(seed)
+    coordinates, class_indexes = SHAPES[shape](size, dimensions, generator)
+    # Rounding keeps datasets readable in JSON, points made equal by it are dropped
+    coordinates = np.round(coordinates, 6)
+    _, first = np.unique(coordinates, axis=0, return_index=True)
+    first.sort()
+    return coordinates[first], [CLASS_NAMES[class_index] for class_index in class_indexes[first]]
+
+def to_points(coordinates : np.ndarray, labels : list) -> list[Point]:
+    return [Point.from_coordinates(point_coordinates, label) for point_coordinates, label in zip(coordinates.tolist(), labels)]
@@ -0,0 +1,117 @@
+import json
+import os
+import numpy as np
+from .input_data import InputData
+from .json_serializer import JsonSerializer
+from .point import coordinates_dict, dict_coordinates
+
+# Binary dataset format - uncompressed NumPy archive with arrays coordinates (N, d) float64,
+# label_codes (N,) int32 and labels (class names as strings, label_codes index into it)
+BINARY_EXTENSION = ".npz"
+FILE_FILTER = "JSON Files (*.json);;NumPy Files (*.npz);;All Files (*)"
+
+def iter_json_points(file, read_size: int = 1 << 20):
+    """
+    Parses JSON array of points [{"x": .., "y": .., "class_name": ..}, ...] (points with other than 2 dimensions
+    have a list "coordinates" instead of "x" and "y") from an open text file incrementally, so only read_size characters and the currently parsed point are held in memory.
+
+    :param file: Text file opened for reading.
+    :param read_size: Number of characters read from the file at once.
+    :return: Generator of dicts of points.
+    :raises ValueError: If the file is not a JSON array of objects.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position = "", 0
+    started = False
+    while True:
+        # Skip whitespace and separators
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        point = None
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("Dataset file must contain a JSON array of points")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                point, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                point = None # Point may be split between reads
+        if point is not None:
+            if not isinstance(point, dict):
+                raise ValueError("Dataset file must contain a JSON array of points")
+            yield point
+            continue
+
+        data = file.read(read_size)
+        if not data:
+            if position < len(buffer):
+                # Report the actual syntax error
+                decoder.raw_decode(buffer, position)
+            raise ValueError("Unexpected end of dataset file")
+        buffer, position = buffer[position:] + data, 0
+
+def read_json_columns(file, batch_size: int = 65536):
+    """
+    Reads JSON array of points from an open text file in batches of columns.
+
+    :param file: Text file opened for reading.
+    :param batch_size: Number of points in a batch.
+    :return: Generator of tuples (coordinates, labels) - (n, d) float array and list of class names.
+    :raises ValueError: If points have different number of coordinates.
+    """
+    coordinates, labels = [], []
+    for point in iter_json_points(file):
+        coordinates.append(dict_coordinates(point))
+        labels.append(point['class_name'])
+        if len(coordinates) == batch_size:
+            yield np.asarray(coordinates, dtype=float), labels
+            coordinates, labels = [], []
+    if coordinates:
+        yield np.asarray(coordinates, dtype=float), labels
+
+def load_dataset(file_name: str) -> InputData:
+    """
+    Loads a dataset, the format is chosen by the extension of the file (.npz binary, JSON otherwise).
+
+    :param file_name: Path to the dataset file.
+    :return: InputData - Loaded points.
+    :raises AlreadyExists: If the dataset contains duplicated points (all of them are reported).
+    """
+    if is_binary(file_name):
+        with np.load(file_name, allow_pickle=False) as archive:
+            coordinates = archive["coordinates"]
+            labels = archive["labels"].astype(object)[archive["label_codes"]]
+        return InputData.from_coordinates(coordinates, labels)
+
+    coordinates, labels = [], []
+    with open(file_name, 'r') as f:
+        for batch_coordinates, batch_labels in read_json_columns(f):
+            coordinates.append(batch_coordinates)
+            labels.extend(batch_labels)
+    return InputData.from_coordinates(np.concatenate(coordinates) if coordinates else np.empty((0, 2)), labels)
+
+def save_dataset(file_name: str, input_data: InputData):
+    """
+    Saves a dataset, the format is chosen by the extension of the file (.npz binary, JSON otherwise).
+    JSON is written in chunks, the whole output is never built in memory.
+
+    :param file_name: Path to the dataset file.
+    :param input_data: Points to save.
+    """
+    coordinates, class_names = input_data.coordinates, input_data.class_names
+    if is_binary(file_name):
+        labels, label_codes = np.unique(class_names.astype(str), return_inverse=True)
+        np.savez(file_name, coordinates=coordinates, label_codes=label_codes.astype(np.int32), labels=labels)
+        return
+
+    points = (coordinates_dict(point_coordinates, class_name) for point_coordinates, class_name in zip(coordinates.tolist(), class_names.tolist()))
+    with open(file_name, 'w') as f:
+        JsonSerializer().write(points, f)
+
+def is_binary(file_name: str) -> bool:
+    return os.path.splitext(file_name)[1].lower() == BINARY_EXTENSION
@@ -1,17 +1,184 @@
+import numpy as np
 from .my_exceptions import AlreadyExists
-from .point import Point
+from .point import Point, dict_coordinates
+
+def object_array(values) -> np.ndarray:
+    """
+    Converts values to a 1-D object array (np.array would make a 2-D array of sequences or a str array).
+    """
+    values = values if isinstance(values, np.ndarray) else list(values)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
 
 class InputData:
     def __init__(self, points = None):
-        self.data = {}
+        # Points are kept either as a dict of Point objects (per-point API) or as columnar arrays
+        # (bulk API), the other representation is created from it only when it is needed
+        self._data = {}
+        self._coordinates = None
+        self._class_names = None
         if points is None:
             return
-        # Iterate over the data and create Point
-        for point in points:
-            x = float(point['x'])
-            y = float(point['y'])
-            point = Point(x, y, point['class_name'])  # Create Point
-            self.add_point(point)  # Add the Point to InputData
+        points = list(points)
+        self.add_coordinates([dict_coordinates(point) for point in points], [point['class_name'] for point in points])
+
+    @classmethod
+    def from_arrays(cls, xs, ys, labels) -> 'InputData':
+        """
+        Creates InputData from columns of coordinates and class names.
+
+        Args:
+            xs: Sequence or array of x coordinates.
+            ys: Sequence or array of y coordinates.
+            labels: Sequence or array of class names.
+
+        Returns:
+            InputData: New InputData with the given points.
+
+        Raises:
+            AlreadyExists: If the columns contain duplicated points.
+        """
+        input_data = cls()
+        input_data.add_points(xs, ys, labels)
+        return input_data
+
+    @classmethod
+    def from_coordinates(cls, coordinates, labels) -> 'InputData':
+        """
+        Creates InputData from points with any number of dimensions.
+
+        Args:
+            coordinates: (N, d) array or sequence of coordinates.
+            labels: Sequence or array of class names.
+
+        Returns:
+            InputData: New InputData with the given points.
+
+        Raises:
+            AlreadyExists: If the coordinates contain duplicated points.
+        """
+        input_data = cls()
+        input_data.add_coordinates(coordinates, labels)
+        return input_data
+
+    @property
+    def data(self) -> dict:
+        """
+        Points by their key (Point.key()), in the order they were added.
+        """
+        if self._data is None:
+            self._data = {}
+            for coordinates, class_name in zip(self._coordinates.tolist(), self._class_names.tolist()):
+                point = Point.from_coordinates(coordinates, class_name)
+                self._data[point.key()] = point
+        return self._data
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        """
+        (N, d) array of coordinates of all points, in the order they were added (d is 2 for no points).
+        """
+        if self._coordinates is None:
+            points = list(self._data.values())
+            dimensions = points[0].dimensions if points else 2
+            self._coordinates = np.array([point.coordinates for point in points], dtype=float).reshape(-1, dimensions)
+        return self._coordinates
+
+    @property
+    def dimensions(self) -> int:
+        """
+        Number of coordinates of points (2 for no points).
+        """
+        if self._coordinates is None and self._data:
+            return next(iter(self._data.values())).dimensions
+        return self.coordinates.shape[1]
+
+    @property
+    def class_names(self) -> np.ndarray:
+        """
+        Object array of class names of all points, in the order they were added.
+        """
+        if self._class_names is None:
+            self._class_names = object_array([point.class_name for point in self._data.values()])
+        return self._class_names
+
+    def points(self) -> list[Point]:
+        """
+        Returns all points in the order they were added. Unlike data, no keys are created for bulk loaded points.
+        """
+        if self._data is not None:
+            return list(self._data.values())
+        return [Point.from_coordinates(coordinates, class_name) for coordinates, class_name in
+                zip(self._coordinates.tolist(), self._class_names.tolist())]
+
+    def __len__(self):
+        return len(self._data) if self._data is not None else len(self._coordinates)
+
+    def add_points(self, xs, ys, labels):
+        """
+        Adds many points at once. Duplicates (among the new points or with points already in the
+        InputData) are found in one vectorized pass. If there are any, no point is added.
+
+        Args:
+            xs: Sequence or array of x coordinates.
+            ys: Sequence or array of y coordinates.
+            labels: Sequence or array of class names.
+
+        Raises:
+            ValueError: If the columns have different lengths or coordinates are not numbers.
+            AlreadyExists: If any point is duplicated, all duplicated points are in its duplicates attribute.
+        """
+        xs, ys = np.asarray(xs, dtype=float).ravel(), np.asarray(ys, dtype=float).ravel()
+        if len(xs) != len(ys):
+            raise ValueError("Columns of points have different lengths")
+        self.add_coordinates(np.column_stack((xs, ys)), labels)
+
+    def add_coordinates(self, coordinates, labels):
+        """
+        Adds many points with any number of dimensions at once, see add_points.
+
+        Args:
+            coordinates: (N, d) array or sequence of coordinates, d must match points already in the InputData.
+            labels: Sequence or array of class names.
+
+        Raises:
+            ValueError: If the number of coordinates and labels differ, points have different number of dimensions
+                or coordinates are not numbers.
+            AlreadyExists: If any point is duplicated, all duplicated points are in its duplicates attribute.
+        """
+        new_class_names = object_array(labels)
+        new_coordinates = np.asarray(coordinates, dtype=float)
+        if new_coordinates.size == 0:
+            new_coordinates = new_coordinates.reshape(0, self.dimensions)
+        if new_coordinates.ndim != 2 or len(new_coordinates) != len(new_class_names):
+            raise ValueError("Expected {} points with the same number of coordinates".format(len(new_class_names)))
+        existing = self.coordinates
+        if len(existing) == 0:
+            existing = existing.reshape(0, new_coordinates.shape[1])
+        elif existing.shape[1] != new_coordinates.shape[1]:
+            raise ValueError("Points have {} coordinates, expected {}".format(new_coordinates.shape[1], existing.shape[1]))
+
+        coordinates = np.concatenate((existing, new_coordinates))
+        # Coordinates are compared by their bits, so points are equal exactly when their keys are equal.
+        # Stable sort keeps equal points in the order they were added, all but the first one are duplicates.
+        bits = coordinates.view(np.uint64)
+        order = np.lexsort(bits.T[::-1])
+        sorted_bits = bits[order]
+        repeated = (sorted_bits[1:] == sorted_bits[:-1]).all(axis=1)
+        if repeated.any():
+            duplicated = np.zeros(len(coordinates), dtype=bool)
+            duplicated[order[1:][repeated]] = True
+            # Existing points are unique, so only new points can be duplicates
+            duplicated = duplicated[len(coordinates) - len(new_coordinates):]
+            duplicates = [Point.from_coordinates(point_coordinates, class_name) for point_coordinates, class_name in
+                          zip(new_coordinates[duplicated].tolist(), new_class_names[duplicated].tolist())]
+            print("{} points already exist".format(len(duplicates)))
+            raise AlreadyExists(duplicates)
+
+        self._class_names = np.concatenate((self.class_names, new_class_names))
+        self._coordinates = coordinates
+        self._data = None
 
     def add_point(self, point: Point) -> bool:
         """
@@ -30,13 +197,16 @@ class InputData:
         try:
             if self.contains_point(point):
                 print("Point already exists")
-                raise AlreadyExists
+                raise AlreadyExists([point])
+            if len(self) > 0 and point.dimensions != self.dimensions:
+                raise ValueError("Point has {} coordinates, expected {}".format(point.dimensions, self.dimensions))
             self.data[point.key()] = point
+            self._invalidate_arrays()
             return True
         except ValueError:
             print("Invalid Point")
             return False
-    
+
     def remove_point(self, point: Point) -> bool:
         """
         Removes a point from the InputData if it exists.
@@ -53,15 +223,17 @@ class InputData:
         """
         if self.contains_point(point):
             self.data.pop(point.key())
+            self._invalidate_arrays()
             return True
 
         return False
-    
+
     def remove_all_points(self):
         """
         Removes all points from the InputData.
         """
-        self.data.clear()
+        self._data = {}
+        self._invalidate_arrays()
 
     def contains_point(self, point: Point) -> bool:
         """
@@ -74,4 +246,8 @@ class InputData:
             bool: True if the point exists in the InputData, False otherwise.
         """
 
-        return point.key() in self.data
\ No newline at end of file
+        return point.key() in self.data
+
+    def _invalidate_arrays(self):
+        self._coordinates = None
+        self._class_names = None
@@ -4,9 +4,30 @@ import json
 class JsonSerializer:
     def serialize(self, obj) -> str:
         return json.dumps(obj, default=self.custom_serializer)
-    
+
+    def write(self, items, file, chunk_size: int = 4096):
+        """
+        Writes items as a JSON array to an open text file, chunk_size items at a time, so the whole
+        output is never built in memory. Output is the same as from serialize(list(items)).
+
+        :param items: Iterable of objects (with to_dict) or of JSON serializable values.
+        :param file: Text file opened for writing.
+        :param chunk_size: Number of items serialized and written at once.
+        """
+        file.write("[")
+        chunk = []
+        separator = ""
+        for item in items:
+            chunk.append(json.dumps(item, default=self.custom_serializer))
+            if len(chunk) == chunk_size:
+                file.write(separator + ", ".join(chunk))
+                separator = ", "
+                chunk.clear()
+        if chunk:
+            file.write(separator + ", ".join(chunk))
+        file.write("]")
+
     def custom_serializer(self, obj):
         if hasattr(obj, 'to_dict'):
             return obj.to_dict()
         raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
-
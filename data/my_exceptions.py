@@ -1,2 +1,7 @@
 class AlreadyExists(Exception):
-    pass
\ No newline at end of file
+    def __init__(self, duplicates = None):
+        """
+        :param duplicates: list of Point, points which already existed.
+        """
+        self.duplicates = duplicates if duplicates is not None else []
+        super().__init__("{} points already exist".format(len(self.duplicates)) if self.duplicates else "Point already exists")
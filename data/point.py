@@ -7,10 +7,42 @@ class Point:
         :param y: int or float, y-coordinate of the point.
         :param class_name: str, class name of the point.
         """
-        self.x = x
-        self.y = y
+        self.coordinates = (x, y)
         self.class_name = class_name
 
+    @classmethod
+    def from_coordinates(cls, coordinates, class_name) -> 'Point':
+        """
+        Creates a point with any number of coordinates.
+
+        :param coordinates: Sequence of int or float coordinates.
+        :param class_name: str, class name of the point.
+        :return: Point - New point.
+        """
+        point = cls.__new__(cls)
+        point.coordinates = tuple(coordinates)
+        point.class_name = class_name
+        return point
+
+    @classmethod
+    def from_dict(cls, point : dict) -> 'Point':
+        """
+        Creates a point from a dict of the JSON format ({"x", "y", "class_name"} or {"coordinates", "class_name"}).
+        """
+        return cls.from_coordinates(dict_coordinates(point), point['class_name'])
+
+    @property
+    def x(self):
+        return self.coordinates[0]
+
+    @property
+    def y(self):
+        return self.coordinates[1]
+
+    @property
+    def dimensions(self) -> int:
+        return len(self.coordinates)
+
     def get_color(self):
         """
         Returns the color of the point - currently class_name = color
@@ -18,21 +50,34 @@ class Point:
         :return: str, color of the point.
         """
         return self.class_name
-    
+
     def key(self):
         """
-        Returns a unique string key for the point. The key is a comma-separated value of the x and y coordinates.
+        Returns a unique string key for the point. The key is a comma-separated value of the coordinates.
         :return: str, unique string key for the point.
         """
-        return f"{self.x},{self.y}"
-    
+        return ",".join(f"{coordinate}" for coordinate in self.coordinates)
+
     def __str__(self):
-        str = "[{}, {}, class = {}]".format(self.x, self.y, self.class_name)
+        str = "[{}, class = {}]".format(", ".join(f"{coordinate}" for coordinate in self.coordinates), self.class_name)
         return str
-    
+
     def to_dict(self):
-        return {
-            "x": self.x,
-            "y": self.y,
-            "class_name": self.class_name
-        }
\ No newline at end of file
+        return coordinates_dict(self.coordinates, self.class_name)
+
+def dict_coordinates(point : dict) -> list:
+    """
+    Returns coordinates of a point of the JSON format - 2D points have keys x and y, points with other
+    number of dimensions have a list coordinates.
+    """
+    if 'coordinates' in point:
+        return point['coordinates']
+    return [point['x'], point['y']]
+
+def coordinates_dict(coordinates, class_name) -> dict:
+    """
+    Returns a point in the JSON format (see dict_coordinates).
+    """
+    if len(coordinates) == 2:
+        return {"x": coordinates[0], "y": coordinates[1], "class_name": class_name}
+    return {"coordinates": list(coordinates), "class_name": class_name}
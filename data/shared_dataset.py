@@ -0,0 +1,63 @@
+from multiprocessing import shared_memory
+import numpy as np
+
+class SharedDataset:
+    def __init__(self, coordinates : np.ndarray, labels):
+        """
+        Copies a dataset to shared memory once, so worker processes attach to it instead of receiving a copy.
+        Classes are stored as int32 codes into class_names. Use as a context manager, shared memory is freed
+        (unlinked) by close().
+
+        Args:
+            coordinates: (N, d) array of coordinates.
+            labels: Sequence of class names of the points.
+        """
+        coordinates = np.asarray(coordinates, dtype=float)
+        self.class_names, codes = np.unique(np.asarray(list(labels), dtype=object).astype(str), return_inverse=True)
+        self.class_names = self.class_names.tolist()
+        self._blocks = []
+        self.coordinates = self._share(coordinates)
+        self.codes = self._share(codes.astype(np.int32))
+
+    def _share(self, array : np.ndarray) -> np.ndarray:
+        block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        self._blocks.append(block)
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        shared[:] = array
+        return shared
+
+    def handle(self) -> tuple:
+        """
+        Returns a small picklable description of the dataset for attach() in another process.
+        """
+        return (self._blocks[0].name, self.coordinates.shape, self._blocks[1].name, len(self.codes), self.class_names)
+
+    @staticmethod
+    def attach(handle : tuple):
+        """
+        Attaches to a dataset shared by another process.
+
+        Args:
+            handle: Result of handle() of the SharedDataset.
+
+        Returns:
+            tuple: (blocks, coordinates, codes, class_names) - blocks have to be kept referenced while the arrays are used.
+        """
+        coordinates_name, coordinates_shape, codes_name, size, class_names = handle
+        blocks = [shared_memory.SharedMemory(name=coordinates_name), shared_memory.SharedMemory(name=codes_name)]
+        coordinates = np.ndarray(coordinates_shape, dtype=float, buffer=blocks[0].buf)
+        codes = np.ndarray((size,), dtype=np.int32, buffer=blocks[1].buf)
+        return blocks, coordinates, codes, class_names
+
+    def close(self):
+        self.coordinates = self.codes = None
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -2,12 +2,11 @@ from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QLineEdit
 from PyQt5.QtCore import Qt
 
 from data.input_data import InputData
-from data.json_serializer import JsonSerializer
+from data import dataset_io
 from data.my_exceptions import AlreadyExists
 from .styles import get_button_style, get_red_button_style
 from .mpl_canvas import MplCanvas
 from data.point import Point
-import json
 
 class CreateDatasetScreen(QWidget):
     def __init__(self, switch_screen):
@@ -102,7 +101,9 @@ class CreateDatasetScreen(QWidget):
             x = float(self.x_input.text())
             y = float(self.y_input.text())
             point = Point(x, y, self.class_input.currentText())
-            self.input.add_point(point)
+            if not self.input.add_point(point):
+                QMessageBox.warning(self, "Warning", "Point can not be added to a dataset with {} dimensions".format(self.input.dimensions))
+                return
             self.canvas.ax.scatter(x, y, color=point.get_color(), label=point.class_name)
             x_values = [point.x for point in self.input.data.values()] if self.input.data else [0]
             y_values = [point.y for point in self.input.data.values()] if self.input.data else [0]
@@ -163,7 +164,7 @@ class CreateDatasetScreen(QWidget):
 
     def load_dataset(self):
         """
-        Attempts to load a dataset from a JSON file.
+        Attempts to load a dataset from a JSON file (or binary .npz file, by the extension).
 
         If the dataset contains duplicated points, a warning message is displayed. 
         If the input is invalid, an error message is displayed.
@@ -171,34 +172,29 @@ class CreateDatasetScreen(QWidget):
         :return: None
         """
         options = QFileDialog.Options()
-        file_name, _ = QFileDialog.getOpenFileName(self, "Load Dataset", "", "JSON Files (*.json);;All Files (*)", options=options)
+        file_name, _ = QFileDialog.getOpenFileName(self, "Load Dataset", "", dataset_io.FILE_FILTER, options=options)
         try:
             if file_name:
-                with open(file_name, 'r') as f:
-                    parsed_data = json.loads(f.read())
-                    self.input = InputData(parsed_data)
-                    self.redraw_all_points()
+                self.input = dataset_io.load_dataset(file_name)
+                self.redraw_all_points()
                 print(f"Loaded dataset: {file_name}")
-        except AlreadyExists:
-            QMessageBox.warning(self, "Warning", "Dataset contains duplicated points!")
+        except AlreadyExists as e:
+            duplicates = "\n".join(str(point) for point in e.duplicates[:10]) + ("\n..." if len(e.duplicates) > 10 else "")
+            QMessageBox.warning(self, "Warning", "Dataset contains {} duplicated points!\n{}".format(len(e.duplicates), duplicates))
         except Exception as e:
             QMessageBox.warning(self, "Warning", "An error occurred while loading the dataset!\nError: {}".format(e))
 
     def save_dataset(self):
         """
-        Saves the current dataset list(Point) to a JSON file.
+        Saves the current dataset list(Point) to a JSON file (or binary .npz file, by the extension).
 
         :return: None
         """
         options = QFileDialog.Options()
-        file_name, _ = QFileDialog.getSaveFileName(self, "Save Dataset", "", "JSON Files (*.json);;All Files (*)", options=options)
+        file_name, _ = QFileDialog.getSaveFileName(self, "Save Dataset", "", dataset_io.FILE_FILTER, options=options)
         try:
             if file_name:
-                with open(file_name, 'w') as f:
-                    jsonSerializer = JsonSerializer()
-                    json_output = jsonSerializer.serialize(list(self.input.data.values()))
-                    print(json_output)
-                    f.write(json_output)
+                dataset_io.save_dataset(file_name, self.input)
 
                 QMessageBox.information(self, "Saving Finished", f"Dataset successfully saved to {file_name}!")
         except Exception as e:
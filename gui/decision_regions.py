@@ -0,0 +1,96 @@
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.colors import to_rgba
+from rce.rce_network import AMBIGUOUS
+
+class DecisionRegions():
+    def __init__(self, limits : tuple, shape : tuple, alpha : float = 0.25, ambiguous_color = "orange"):
+        """
+        Initialize a raster of decision regions of a 2D RCE network - color of the class of every pixel
+        (transparent for unknown pixels, ambiguous_color for ambiguous ones).
+
+        The raster is cached together with a copy of the shown state of the network (centers, radii and classes
+        of hidden neurons and the metric). A new state is compared with the cached one and only pixels inside of the bounding box
+        of hyperspheres (Metric.ball_extents) which were added, removed or changed their radius are classified again, so stepping through
+        training updates a small part of a full resolution raster.
+
+        :param limits: (x_min, x_max, y_min, y_max) of the raster.
+        :param shape: (height, width) of the raster in pixels.
+        :param alpha: Opacity of regions of classes.
+        :param ambiguous_color: Color of pixels inside of hyperspheres of more classes.
+        """
+        self.limits = limits
+        self.shape = shape
+        self.alpha = alpha
+        self.ambiguous_color = to_rgba(ambiguous_color, alpha)
+        self.image = np.zeros(shape + (4,), dtype=np.uint8) # RGBA, row 0 is y_min
+        self.x = limits[0] + (np.arange(shape[1]) + 0.5) * (limits[1] - limits[0]) / shape[1] # Centers of pixels
+        self.y = limits[2] + (np.arange(shape[0]) + 0.5) * (limits[3] - limits[2]) / shape[0]
+        self.centers = None # Shown state of the network, None before the first update
+        self.radii = None
+        self.class_ids = None
+        self.class_names = None
+        self.metric = None
+        self.colors = np.zeros((1, 4), dtype=np.uint8) # Row 0 is unknown, row i + 1 is the class i
+        self.classified_pixels = 0 # Pixels classified by all updates
+
+    def update(self, rce_network) -> bool:
+        """
+        Shows the given state of the network.
+
+        :param rce_network: 2D network to show.
+        :return: bool - True if any pixel was classified again.
+        """
+        centers, radii, class_ids = rce_network.centers, rce_network.radii, rce_network.class_ids
+        class_names = [output_neuron.class_name for output_neuron in rce_network.output_layer]
+        common = 0 if self.radii is None else min(len(radii), len(self.radii))
+        if (self.radii is None or rce_network.metric != self.metric
+                or class_names[:len(self.class_names)] != self.class_names[:len(class_names)]
+                or not np.array_equal(centers[:common], self.centers[:common])
+                or not np.array_equal(class_ids[:common], self.class_ids[:common])):
+            # Another network
+            box = (self.limits[0], self.limits[1], self.limits[2], self.limits[3])
+        else:
+            changed = np.flatnonzero(radii[:common] != self.radii[:common])
+            box_centers = [centers[changed], centers[common:], self.centers[common:]]
+            box_radii = [np.maximum(radii[changed], self.radii[changed]), radii[common:], self.radii[common:]]
+            box_centers, box_radii = np.concatenate(box_centers), np.concatenate(box_radii)
+            extents = self.metric.ball_extents(box_radii, 2)
+            box = None if len(box_radii) == 0 else ((box_centers[:, 0] - extents[:, 0]).min(), (box_centers[:, 0] + extents[:, 0]).max(),
+                                                    (box_centers[:, 1] - extents[:, 1]).min(), (box_centers[:, 1] + extents[:, 1]).max())
+
+        if class_names != self.class_names:
+            self.class_names = class_names
+            self.colors = np.array([(0, 0, 0, 0)] + [self.class_color(index, class_name) for index, class_name in enumerate(class_names)])
+            self.colors = np.round(self.colors * 255).astype(np.uint8)
+        if box is None:
+            return False
+        self.centers, self.radii, self.class_ids = centers.copy(), radii.copy(), class_ids.copy()
+        self.metric = rce_network.metric
+        return self.classify_box(rce_network, box)
+
+    def class_color(self, index : int, class_name) -> tuple:
+        """
+        Returns RGBA color of a class - class names are colors in the GUI, other names get colors of a palette.
+        """
+        try:
+            return to_rgba(class_name, self.alpha)
+        except ValueError:
+            return colormaps["tab10"](index % 10, alpha=self.alpha)
+
+    def classify_box(self, rce_network, box : tuple) -> bool:
+        """
+        Classifies pixels whose centers are inside of the box (x_min, x_max, y_min, y_max) again.
+        """
+        columns = slice(np.searchsorted(self.x, box[0]), np.searchsorted(self.x, box[1], side="right"))
+        rows = slice(np.searchsorted(self.y, box[2]), np.searchsorted(self.y, box[3], side="right"))
+        x, y = self.x[columns], self.y[rows]
+        if len(x) == 0 or len(y) == 0:
+            return False
+        grid_x, grid_y = np.meshgrid(x, y)
+        class_ids, results = rce_network.classify_ids(np.column_stack((grid_x.ravel(), grid_y.ravel())))
+        pixels = self.colors[class_ids + 1]
+        pixels[results == AMBIGUOUS] = np.round(np.array(self.ambiguous_color) * 255).astype(np.uint8)
+        self.image[rows, columns] = pixels.reshape(len(y), len(x), 4)
+        self.classified_pixels += len(class_ids)
+        return True
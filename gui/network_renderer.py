@@ -0,0 +1,223 @@
+import numpy as np
+from matplotlib.collections import EllipseCollection, PolyCollection
+from matplotlib.patches import Ellipse, Polygon
+from gui.decision_regions import DecisionRegions
+
+# Vertices of outlines of hyperspheres of metrics (Metric.outline) with extents 1, ellipses are EllipseCollection
+OUTLINES = {"diamond": np.array([[1, 0], [0, 1], [-1, 0], [0, -1]], dtype=float),
+            "square": np.array([[1, 1], [-1, 1], [-1, -1], [1, -1]], dtype=float)}
+
+def project(coordinates : np.ndarray) -> np.ndarray:
+    """
+    Projects (N, d) coordinates to the plane of the first two coordinates (1D points get y = 0).
+    A hypersphere is projected to its outline in the plane (see projected_extents) around the projected center.
+    """
+    coordinates = np.asarray(coordinates, dtype=float)
+    if coordinates.shape[1] >= 2:
+        return coordinates[:, :2]
+    return np.column_stack((coordinates[:, 0], np.zeros(len(coordinates))))
+
+def projected_extents(metric, radii : np.ndarray, dimensions : int) -> np.ndarray:
+    """
+    Returns (H, 2) half-widths and half-heights of outlines of hyperspheres projected by project.
+    Projection of a hypersphere is the 2D hypersphere of the metric with the same radius - a circle (ellipse
+    for weighted metrics), diamond or square.
+    """
+    extents = metric.ball_extents(radii, dimensions)
+    return extents[:, :2] if dimensions >= 2 else np.repeat(extents, 2, axis=1)
+
+class NetworkRenderer():
+    def __init__(self, canvas, ax, show_regions : bool = False):
+        """
+        Initialize renderer of the training progress of RCE network.
+
+        Training points are drawn once as a single scatter collection and kept as a cached background.
+        Hyperspheres of hidden neurons are a single EllipseCollection (PolyCollection for metrics whose hyperspheres
+        are diamonds or squares, see Metric.outline) and together with the highlighted
+        hidden neuron and training input they are drawn over the background (blitting). Between steps only
+        changed radii, new hidden neurons and the highlights are updated.
+
+        Decision regions (classes of pixels, see DecisionRegions) of 2D networks are a single image under
+        the training points. When they are shown, the training points are drawn over the image in every step
+        instead of being part of the background.
+
+        :param canvas: Matplotlib canvas (Qt canvas or Agg canvas without display).
+        :param ax: Axes to draw into.
+        :param show_regions: If True, decision regions are shown.
+        """
+        self.canvas = canvas
+        self.ax = ax
+        self.show_regions = show_regions
+        self.background = None
+        self.spheres = None
+        self.highlighted_neuron = None
+        self.metric = None # Metric of the shown outlines
+        self.dimensions = 2
+        self.points = None
+        self.regions = None
+        self.regions_image = None
+        self.limits = None
+        self.rce_network = None # Last shown network
+        self.radii = np.empty(0)
+        self.sphere_count = 0
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+
+    def set_training_data(self, coordinates : np.ndarray, colors : list, limits : tuple):
+        """
+        Draws static training points and prepares dynamic artists. Points with more than two
+        dimensions are shown projected to the first two coordinates.
+
+        :param coordinates: (N, d) array of training points.
+        :param colors: Colors of training points.
+        :param limits: (x_min, x_max, y_min, y_max) of the plot.
+        """
+        self.ax.cla()
+        self.ax.set_xlim(limits[0], limits[1])
+        self.ax.set_ylim(limits[2], limits[3])
+        if coordinates.shape[1] != 2:
+            self.ax.set_title("Projection of {}-dimensional data to the first two coordinates".format(coordinates.shape[1]))
+        projected = project(coordinates)
+        self.limits = limits
+        self.dimensions = coordinates.shape[1]
+        self.rce_network = None
+        # Regions of projected networks would not match the classification of the data
+        self.regions = None
+        self.regions_image = None
+        if coordinates.shape[1] == 2:
+            self.regions_image = self.ax.imshow(np.zeros((1, 1, 4), dtype=np.uint8), extent=limits, origin="lower", aspect="auto",
+                                                interpolation="none", animated=True, visible=self.show_regions)
+            self.ax.set_xlim(limits[0], limits[1])
+            self.ax.set_ylim(limits[2], limits[3])
+        self.points = self.ax.scatter(projected[:, 0], projected[:, 1], s=80, c=colors)
+        self.points.set_animated(self.show_regions and self.regions_image is not None)
+
+        self.highlighted_input, = self.ax.plot([], [], 'o', markersize=4, color="yellow", visible=False, animated=True)
+        self.spheres = None
+        self.create_sphere_artists(self.metric)
+        # Full draw captures the background in on_draw
+        self.canvas.draw()
+
+    def create_sphere_artists(self, metric):
+        """
+        Creates (empty) artists of hyperspheres and of the highlighted hidden neuron for outlines of the metric.
+        """
+        if self.spheres is not None:
+            self.spheres.remove()
+            self.highlighted_neuron.remove()
+        self.metric = metric
+        if metric is None or metric.outline == "ellipse":
+            self.spheres = EllipseCollection(np.empty(0), np.empty(0), np.empty(0), units='xy', offsets=np.empty((0, 2)),
+                                             offset_transform=self.ax.transData, facecolors='none', linewidths=3)
+            self.highlighted_neuron = Ellipse((0, 0), 0, 0, color="yellow", fill=False, linewidth=1, visible=False)
+        else:
+            self.spheres = PolyCollection([], facecolors='none', linewidths=3)
+            self.highlighted_neuron = Polygon(OUTLINES[metric.outline] * 0, color="yellow", fill=False, linewidth=1, visible=False)
+        for artist in (self.spheres, self.highlighted_neuron):
+            artist.set_animated(True)
+        self.ax.add_collection(self.spheres, autolim=False)
+        self.ax.add_patch(self.highlighted_neuron)
+        self.radii = np.empty(0)
+        self.sphere_count = 0
+
+    def update(self, rce_network, highlighted_neuron : int = None, highlighted_input = None):
+        """
+        Shows the given state of the network.
+
+        :param rce_network: Network to show.
+        :param highlighted_neuron: Index of hidden neuron to highlight or None.
+        :param highlighted_input: Projected coordinates (x, y) of training input to highlight or None.
+        """
+        self.rce_network = rce_network
+        if self.regions_image is not None and self.show_regions:
+            self.update_regions()
+        if rce_network.metric != self.metric:
+            self.create_sphere_artists(rce_network.metric)
+        centers, radii = rce_network.centers, rce_network.radii
+        if len(radii) != self.sphere_count:
+            # Hidden neurons were added (or another network is shown)
+            class_names = [output_neuron.class_name for output_neuron in rce_network.output_layer]
+            self.spheres.set_edgecolor([class_names[class_id] for class_id in rce_network.class_ids])
+            if isinstance(self.spheres, EllipseCollection):
+                self.spheres.set_offsets(project(centers).copy())
+                self.spheres.set_angles(np.zeros(len(radii)))
+            self.sphere_count = len(radii)
+            self.radii = None
+        if self.radii is None or not np.array_equal(self.radii, radii):
+            self.radii = radii.copy()
+            extents = projected_extents(self.metric, self.radii, self.dimensions)
+            if isinstance(self.spheres, EllipseCollection):
+                self.spheres.set_widths(2 * extents[:, 0])
+                self.spheres.set_heights(2 * extents[:, 1])
+            else:
+                self.spheres.set_verts(project(centers)[:, None, :] + extents[:, None, :] * OUTLINES[self.metric.outline])
+
+        if highlighted_neuron is not None and highlighted_neuron < len(radii):
+            center = project(centers[highlighted_neuron:highlighted_neuron + 1])[0]
+            extents = projected_extents(self.metric, radii[highlighted_neuron:highlighted_neuron + 1], self.dimensions)[0]
+            if isinstance(self.highlighted_neuron, Ellipse):
+                self.highlighted_neuron.set_center(center)
+                self.highlighted_neuron.set_width(2 * extents[0])
+                self.highlighted_neuron.set_height(2 * extents[1])
+            else:
+                self.highlighted_neuron.set_xy(center + extents * OUTLINES[self.metric.outline])
+            self.highlighted_neuron.set_visible(True)
+        else:
+            self.highlighted_neuron.set_visible(False)
+        if highlighted_input is not None:
+            self.highlighted_input.set_data([highlighted_input[0]], [highlighted_input[1]])
+            self.highlighted_input.set_visible(True)
+        else:
+            self.highlighted_input.set_visible(False)
+        self.blit()
+
+    def set_show_regions(self, show_regions : bool):
+        """
+        Shows or hides decision regions. Training points move between the background and the dynamic artists,
+        so the whole canvas is drawn again.
+        """
+        self.show_regions = show_regions
+        if self.regions_image is None:
+            return
+        self.regions_image.set_visible(show_regions)
+        self.points.set_animated(show_regions)
+        if show_regions and self.rce_network is not None:
+            self.update_regions()
+        self.canvas.draw()
+
+    def regions_shape(self) -> tuple:
+        """
+        Size (height, width) of the axes in pixels, decision regions have one pixel per pixel of the screen.
+        """
+        return max(1, int(round(self.ax.bbox.height))), max(1, int(round(self.ax.bbox.width)))
+
+    def update_regions(self):
+        """
+        Updates decision regions to the last shown network. The raster is created again when the size of the axes changes.
+        """
+        if self.regions is None or self.regions.shape != self.regions_shape():
+            self.regions = DecisionRegions(self.limits, self.regions_shape())
+        if self.regions.update(self.rce_network) or self.regions_image.get_array().shape[:2] != self.regions.shape:
+            self.regions_image.set_data(self.regions.image)
+
+    def on_draw(self, event):
+        if self.spheres is None:
+            return
+        if self.show_regions and self.rce_network is not None and self.regions_image is not None:
+            self.update_regions()
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.draw_dynamic_artists()
+
+    def blit(self):
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_dynamic_artists()
+        self.canvas.blit(self.ax.bbox)
+
+    def draw_dynamic_artists(self):
+        if self.show_regions and self.regions_image is not None:
+            self.ax.draw_artist(self.regions_image)
+            self.ax.draw_artist(self.points)
+        for artist in (self.spheres, self.highlighted_neuron, self.highlighted_input):
+            self.ax.draw_artist(artist)
@@ -1,22 +1,57 @@
-import json
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QMessageBox, QLabel, QLineEdit
-from PyQt5.QtCore import Qt
-import matplotlib.pyplot as plt
+import functools
+import threading
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QMessageBox, QLabel, QLineEdit, QSlider, QSpinBox, QCheckBox, QComboBox
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
+import numpy as np
 from data.my_exceptions import AlreadyExists
 from gui.mpl_canvas import MplCanvas
-from data.input_data import InputData
+from gui.network_renderer import NetworkRenderer, project
+from data.dataset_io import FILE_FILTER, load_dataset
 from rce.rce_trainer import RceTrainer
+from rce.metrics import METRICS, Euclidean, get_metric
+from rce.model_file import save_model
+from rce.training_worker import TrainingWorker
 from .styles import get_button_style, get_font_size_16_style
 
 info_text = "Welcome to RCE training screen!\n1. Load dataset\n2. Train network\n3. Use arrows to step through the training process\n"
 info_text += "<<< - skips to first training iteration\n>>> - skips to last training iteration\n<< - skips to beggining of iteration or previous training iteration if currently positioned on first training input\n"
-info_text += ">> - skips to end of iteration or next training iteration if currently positioned on last training input\n < - skips to previous training input\n > - skips to next training input"
+info_text += ">> - skips to end of iteration or next training iteration if currently positioned on last training input\n < - skips to previous training input\n > - skips to next training input\n"
+info_text += "Slider - jumps to any computed step\nEpoch, Vector - jump to the first step of the epoch or of the training vector in the current epoch\n"
+info_text += "Show decision regions - colors the plot by the class of every pixel (orange for ambiguous pixels), only for 2D data\n"
+info_text += "Metric - distance of points to hidden neurons, weighted_euclidean needs one weight per coordinate (e.g. 1 0.5)"
+
+def with_trace_lock(method):
+    """
+    Runs the method while holding the lock of the training trace, so the background training
+    does not modify the trace in the middle of reading it.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.trace_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+class TrainingSignals(QObject):
+    """
+    Delivers callbacks of TrainingWorker from the worker thread to the GUI thread.
+    """
+    progress = pyqtSignal(object)
+    preview = pyqtSignal(int, object)
+    finished = pyqtSignal(bool)
 
 class TrainNetworkScreen(QWidget):
     def __init__(self, switch_screen):
         super().__init__()
         self.switch_screen = switch_screen
         self.rce_trainer = None
+        self.training_steps = None
+        self.training_worker = None
+        self.trace_lock = threading.RLock()
+        self.follow_training = True # Show the latest trained step until user navigates
+        self.training_signals = TrainingSignals()
+        self.training_signals.progress.connect(self.show_training_progress)
+        self.training_signals.preview.connect(self.show_training_preview)
+        self.training_signals.finished.connect(self.training_finished)
         self.rce_current_network_index = 0
         self.graph_border_offset = 1.5
         self.r_max = 3
@@ -48,6 +83,8 @@ class TrainNetworkScreen(QWidget):
         # Matplotlib canvas and information layout
         canvas_info_layout = QHBoxLayout()
         self.canvas = MplCanvas(self)
+        self.renderer = NetworkRenderer(self.canvas, self.canvas.ax)
+        self.rendered_training_data = None
         canvas_info_layout.addWidget(self.canvas)
 
         main_layout.addLayout(canvas_info_layout)
@@ -63,6 +100,7 @@ class TrainNetworkScreen(QWidget):
         nav_layout.addWidget(self.build_button(">>>", self.last_iteration))
 
         main_layout.addLayout(nav_layout)
+        main_layout.addLayout(self.build_timeline())
 
         # Control buttons layout
         controls_layout = QVBoxLayout()
@@ -74,6 +112,10 @@ class TrainNetworkScreen(QWidget):
         train_network_button = self.build_button("Train Network", self.train_network)
         controls_layout.addWidget(train_network_button)
 
+        # Cancel Training button
+        cancel_training_button = self.build_button("Cancel Training", self.cancel_training)
+        controls_layout.addWidget(cancel_training_button)
+
         # R max input
         train_widget = QWidget()
         train_widget.setMaximumWidth(400)
@@ -86,9 +128,31 @@ class TrainNetworkScreen(QWidget):
         train_widget.setLayout(train_layout)
         controls_layout.addWidget(train_widget)
 
+        # Metric
+        metric_widget = QWidget()
+        metric_widget.setMaximumWidth(400)
+        metric_layout = QHBoxLayout()
+        self.metric_input = QComboBox(self)
+        self.metric_input.addItems(list(METRICS))
+        self.weights_input = QLineEdit()
+        self.weights_input.setPlaceholderText("Weights")
+        metric_layout.addWidget(QLabel("Metric:", self))
+        metric_layout.addWidget(self.metric_input)
+        metric_layout.addWidget(self.weights_input)
+        metric_widget.setLayout(metric_layout)
+        controls_layout.addWidget(metric_widget)
+
+        # Decision regions
+        self.regions_checkbox = QCheckBox("Show decision regions", self)
+        self.regions_checkbox.toggled.connect(self.renderer.set_show_regions)
+        controls_layout.addWidget(self.regions_checkbox)
+
         # Show results
         show_results_button = self.build_button("Show results", self.show_results)
         controls_layout.addWidget(show_results_button)
+        # Save trained network
+        save_model_button = self.build_button("Save Model", self.save_model)
+        controls_layout.addWidget(save_model_button)
         # Help button
         help_button = self.build_button("Help", self.showHelp)
         controls_layout.addWidget(help_button)
@@ -109,10 +173,12 @@ class TrainNetworkScreen(QWidget):
     
     def showHelp(self):
         QMessageBox.information(self, "Help", info_text)
+    @with_trace_lock
     def show_results(self):
         if self.rce_trainer is None:
             QMessageBox.warning(self, "No results", "No trained network yet.")
             return
+        self.compute_all_steps()
 
         last_network = self.rce_trainer.rce_networks[-1]
 
@@ -121,6 +187,7 @@ class TrainNetworkScreen(QWidget):
         output += "<p><b>Hidden neurons:</b> {}</p>".format(len(last_network.hidden_layer))
         output += "<p><b>Output neurons:</b> {}</p>".format(len(last_network.output_layer))
         output += "<p><b>R max:</b> {}</p>".format(last_network.r_max)
+        output += "<p><b>Metric:</b> {}</p>".format(last_network.metric.name)
 
         output += "<h3>Output neurons:</h3>"
         for neuron in last_network.output_layer:
@@ -133,6 +200,19 @@ class TrainNetworkScreen(QWidget):
         QMessageBox.information(self, "RCE Network", output)
 
 
+    def save_model(self):
+        if self.rce_trainer is None or not self.rce_trainer.training_done:
+            QMessageBox.warning(self, "Warning", "Training is not finished yet.")
+            return
+        options = QFileDialog.Options()
+        file_name, _ = QFileDialog.getSaveFileName(self, "Save Model", "", "RCE Model Files (*.rce);;All Files (*)", options=options)
+        try:
+            if file_name:
+                save_model(file_name, self.rce_trainer.rce_network)
+                QMessageBox.information(self, "Saving Finished", f"Model successfully saved to {file_name}!")
+        except Exception as e:
+            QMessageBox.warning(self, "Warning", "An error occurred while saving the model!\nError: {}".format(e))
+
     def build_info_label(self):
         self.info_label = QLabel(info_text, self)
         self.info_label.setAlignment(Qt.AlignTop)
@@ -143,7 +223,8 @@ class TrainNetworkScreen(QWidget):
         button = QPushButton(title, self)
         button.setStyleSheet(get_button_style())
         if function is not None:
-            button.clicked.connect(function)
+            # clicked passes the checked state, which the handlers do not take
+            button.clicked.connect(lambda checked: function())
         return button
 
     def build_progress_info(self):
@@ -154,14 +235,49 @@ class TrainNetworkScreen(QWidget):
         self.filename_label = self.build_label("File Name: None", alignment = Qt.AlignLeft, style = get_font_size_16_style())
         self.action_label = self.build_label("Action: None", alignment = Qt.AlignLeft, style = get_font_size_16_style())
         self.comment_label = self.build_label("Comment: None", alignment = Qt.AlignLeft, style = get_font_size_16_style())
+        self.training_progress_label = self.build_label("Training: None", alignment = Qt.AlignLeft, style = get_font_size_16_style())
         iteration__training_layout.addWidget(self.iteration_label)
         iteration__training_layout.addWidget(self.training_vector_label)
         iteration__training_layout.addWidget(self.filename_label)
         progress_info_layout.addLayout(iteration__training_layout)
+        progress_info_layout.addWidget(self.training_progress_label)
         progress_info_layout.addWidget(self.action_label)
         progress_info_layout.addWidget(self.comment_label)
         return progress_info_layout
 
+    def build_timeline(self):
+        timeline_layout = QHBoxLayout()
+        self.step_slider = QSlider(Qt.Horizontal, self)
+        self.step_slider.setRange(0, 0)
+        self.step_slider.valueChanged.connect(self.jump_to_step)
+        self.epoch_input = QSpinBox(self)
+        self.epoch_input.setRange(0, 0)
+        self.epoch_input.editingFinished.connect(self.jump_to_epoch)
+        self.training_vector_input = QSpinBox(self)
+        self.training_vector_input.setRange(0, 0)
+        self.training_vector_input.editingFinished.connect(self.jump_to_training_vector)
+        timeline_layout.addWidget(self.build_label("Step:", style = get_font_size_16_style()))
+        timeline_layout.addWidget(self.step_slider)
+        timeline_layout.addWidget(self.build_label("Epoch:", style = get_font_size_16_style()))
+        timeline_layout.addWidget(self.epoch_input)
+        timeline_layout.addWidget(self.build_label("Vector:", style = get_font_size_16_style()))
+        timeline_layout.addWidget(self.training_vector_input)
+        return timeline_layout
+
+    def update_timeline(self):
+        """
+        Updates ranges and values of the timeline widgets without triggering jumps.
+        """
+        trace = self.rce_trainer.rce_networks
+        current_step = trace.step(self.rce_current_network_index)
+        for widget, maximum, value in ((self.step_slider, len(trace) - 1, self.rce_current_network_index),
+                                       (self.epoch_input, len(trace.epoch_steps) - 1, current_step.iteration),
+                                       (self.training_vector_input, len(self.training_data) - 1, current_step.train_input_index)):
+            widget.blockSignals(True)
+            widget.setMaximum(max(0, maximum))
+            widget.setValue(value)
+            widget.blockSignals(False)
+
     def build_label(self, text, alignment = None, style:str = None):
         label = QLabel(text, self)
         if alignment:
@@ -178,20 +294,19 @@ class TrainNetworkScreen(QWidget):
 
     def load_data(self):
         options = QFileDialog.Options()
-        file_name, _ = QFileDialog.getOpenFileName(self, "Load Dataset", "", "JSON Files (*.json);;All Files (*)", options=options)
+        file_name, _ = QFileDialog.getOpenFileName(self, "Load Dataset", "", FILE_FILTER, options=options)
 
         try:
             if file_name:
-                with open(file_name, 'r') as f:
-                    parsed_data = json.loads(f.read())
-                    self.input = InputData(parsed_data)
-                    self.training_data = list(self.input.data.values())
+                self.input = load_dataset(file_name)
+                self.training_data = self.input.points()
                 self.filename_label.setText("File Name: {}".format(file_name.split("/")[-1]))
                 self.info_label.setText("Dataset loaded successfully!\nReady for training.")
                 QMessageBox.information(self, "Loading Finished", "Dataset was loaded successfully!")
                 self.train_network()
-        except AlreadyExists:
-            QMessageBox.warning(self, "Warning", "Dataset contains duplicated points!")
+        except AlreadyExists as e:
+            duplicates = "\n".join(str(point) for point in e.duplicates[:10]) + ("\n..." if len(e.duplicates) > 10 else "")
+            QMessageBox.warning(self, "Warning", "Dataset contains {} duplicated points!\n{}".format(len(e.duplicates), duplicates))
         except Exception as e:
             QMessageBox.warning(self, "Warning", "An error occurred while loading the dataset!\nError: {}".format(e))
 
@@ -204,118 +319,241 @@ class TrainNetworkScreen(QWidget):
                     r_max = new_r_max
             except Exception:
                 QMessageBox.warning(self, "Warning", "Invalid input for r_max: {}".format(self.r_input.text()) + "\nUsing default value!")
-            self.rce_trainer = RceTrainer(r_max)
-            self.rce_trainer.Train(self.training_data)
+            metric = self.read_metric()
+            self.stop_training_worker()
+            self.rce_trainer = RceTrainer(r_max, metric=metric)
+            self.training_steps = self.rce_trainer.iter_steps(self.training_data)
+            if not self.compute_next_step():
+                QMessageBox.warning(self, "Warning", "Training dataset is empty!")
+                return
             self.rce_current_network_index = 0
+            self.follow_training = True
             self.plot_network()
-            self.info_label.setText("Training finished successfully!")
-            QMessageBox.information(self, "Training Finished", "Training finished successfully!")
+            # Rest of the training runs in background, computed steps can be browsed meanwhile
+            self.training_worker = TrainingWorker(self.rce_trainer, training_steps=self.training_steps, lock=self.trace_lock,
+                                                  on_progress=self.training_signals.progress.emit,
+                                                  on_preview=lambda index, rce_network: self.training_signals.preview.emit(index, rce_network),
+                                                  on_finished=self.training_signals.finished.emit)
+            self.training_worker.start()
         else:
             QMessageBox.warning(self, "Warning", "No training data loaded!")
 
-    def plot_network(self):
-        self.canvas.ax.cla()
+    def read_metric(self):
+        """
+        Returns the selected metric, the Euclidean metric (with a warning) if the weights do not match it or the dataset.
+        """
+        weights = self.weights_input.text().replace(",", " ").split()
+        try:
+            metric = get_metric(self.metric_input.currentText(), [float(weight) for weight in weights] if weights else None)
+            if self.training_data:
+                metric.check_dimensions(self.training_data[0].dimensions)
+            return metric
+        except ValueError as e:
+            QMessageBox.warning(self, "Warning", "Invalid metric: {}".format(e) + "\nUsing Euclidean metric!")
+            return Euclidean()
+
+    def cancel_training(self):
+        if self.training_worker is None or not self.training_worker.is_running():
+            QMessageBox.warning(self, "Warning", "No training is running!")
+            return
+        self.training_worker.cancel()
+
+    def stop_training_worker(self):
+        if self.training_worker is not None:
+            self.training_worker.cancel()
+            self.training_worker.join()
+            self.training_worker = None
+
+    def show_training_progress(self, progress):
+        self.training_progress_label.setText("Training: epoch {}, training vector {}, hidden neurons {}, steps {}".format(
+            progress.iteration, progress.train_input_index, progress.hidden_neurons, progress.steps))
+        self.step_slider.blockSignals(True)
+        self.step_slider.setMaximum(max(0, progress.steps - 1))
+        self.step_slider.blockSignals(False)
+
+    def show_training_preview(self, index, rce_network):
+        if self.follow_training and self.rce_trainer is not None and index < len(self.rce_trainer.rce_networks):
+            self.rce_current_network_index = index
+            self.plot_network()
+
+    def training_finished(self, cancelled):
+        if cancelled:
+            # Steps computed so far can still be browsed
+            self.training_steps = None
+            self.info_label.setText("Training was cancelled!")
+            return
+        if self.follow_training:
+            self.last_iteration()
+        self.info_label.setText("Training finished successfully!")
+
+    def compute_next_step(self) -> bool:
+        """
+        Computes the next step of the training, unless it is being computed in background.
+
+        :return: bool - False if no step was computed (training is done, cancelled or running in background).
+        """
+        if self.training_steps is None or (self.training_worker is not None and self.training_worker.is_running()):
+            return False
+        try:
+            with self.trace_lock:
+                next(self.training_steps)
+            return True
+        except StopIteration:
+            return False
+
+    def compute_all_steps(self):
+        while self.compute_next_step():
+            pass
 
+    def is_last_step(self) -> bool:
+        return self.rce_trainer.training_done and self.rce_current_network_index == len(self.rce_trainer.rce_networks) - 1
+
+    @with_trace_lock
+    def plot_network(self):
         current_network = self.rce_trainer.rce_networks[self.rce_current_network_index]
-        last_network = self.rce_trainer.rce_networks[len(self.rce_trainer.rce_networks) - 1]
-        self.iteration_label.setText("Training Iteration: {}/{}".format(current_network.iteration, last_network.iteration))
-        self.training_vector_label.setText("Training Vector: {}/{}".format(current_network.train_input_index, len(self.input.data.values()) - 1))
-        self.comment_label.setText("Comment: {}".format(self.rce_trainer.rce_networks[self.rce_current_network_index].comment))
-        self.action_label.setText("Action: {}".format(self.rce_trainer.rce_networks[self.rce_current_network_index].action))
-        # Get the min and max values for x and y
-        x_values = [point.x for point in self.training_data]
-        y_values = [point.y for point in self.training_data]
-        x_min, x_max = min(x_values) - self.graph_border_offset, max(x_values) + self.graph_border_offset
-        y_min, y_max = min(y_values) - self.graph_border_offset, max(y_values) + self.graph_border_offset
-
-        self.canvas.ax.set_xlim(x_min, x_max)
-        self.canvas.ax.set_ylim(y_min, y_max)
-
-        for point in self.training_data:
-            self.canvas.ax.scatter(point.x, point.y, s=80, color=point.class_name)
-
-        
+        last_iteration = self.rce_trainer.rce_networks.step(len(self.rce_trainer.rce_networks) - 1).iteration if self.rce_trainer.training_done else "?"
+        self.iteration_label.setText("Training Iteration: {}/{}".format(current_network.iteration, last_iteration))
+        self.training_vector_label.setText("Training Vector: {}/{}".format(current_network.train_input_index, len(self.training_data) - 1))
+        self.comment_label.setText("Comment: {}".format(current_network.comment))
+        self.action_label.setText("Action: {}".format(current_network.action))
         self.info_label.setText(current_network.__str__())
-        # Show neurons
-        for neuron in current_network.hidden_layer:
-            circle = plt.Circle((neuron.weights[0], neuron.weights[1]), neuron.radius, color=neuron.output_neuron.class_name, fill=False, linewidth=3)
-            self.canvas.ax.add_artist(circle)
 
-        if self.rce_current_network_index != len(self.rce_trainer.rce_networks) - 1 and self.rce_current_network_index != 0:
+        if self.rendered_training_data is not self.training_data:
+            # Static layer of training points is drawn only once for a dataset
+            coordinates = np.array([point.coordinates for point in self.training_data], dtype=float)
+            x_min, y_min = project(coordinates).min(axis=0) - self.graph_border_offset
+            x_max, y_max = project(coordinates).max(axis=0) + self.graph_border_offset
+            self.renderer.set_training_data(coordinates, [point.class_name for point in self.training_data], (x_min, x_max, y_min, y_max))
+            self.rendered_training_data = self.training_data
+
+        highlighted_neuron = highlighted_input = None
+        if not self.is_last_step() and self.rce_current_network_index != 0:
             # Show current action
             if len(current_network.hidden_layer) > 0 and current_network.index_of_hidden_neuron is not None:
-                current_hidden_neuron = current_network.hidden_layer[current_network.index_of_hidden_neuron]
-                circle = plt.Circle((current_hidden_neuron.weights[0], current_hidden_neuron.weights[1]), current_hidden_neuron.radius, color="yellow", fill=False, linewidth=1)
-                self.canvas.ax.add_artist(circle)
-
-            current_input = list(self.input.data.values())[current_network.train_input_index if current_network.train_input_index is not None else 0]
-            self.canvas.ax.scatter(current_input.x, current_input.y, s=15, color="yellow")
-
-        self.canvas.draw()
+                highlighted_neuron = current_network.index_of_hidden_neuron
+            current_input = self.training_data[current_network.train_input_index if current_network.train_input_index is not None else 0]
+            highlighted_input = tuple(project(np.array([current_input.coordinates]))[0])
+        self.renderer.update(current_network, highlighted_neuron, highlighted_input)
+        self.update_timeline()
 
     def can_click_arrows(self) -> bool:
         if not hasattr(self, 'training_data'):
             QMessageBox.warning(self, "Warning", "Please load data first!")
             return False
-        if not self.rce_trainer.training_done:
+        if self.rce_trainer is None:
             QMessageBox.warning(self, "Warning", "Please train model first!")
             return False
         return True
 
+    @with_trace_lock
     def first_iteration(self):
         if not self.can_click_arrows():
             return
+        self.follow_training = False
         self.rce_current_network_index = 0
         self.plot_network()
 
+    @with_trace_lock
     def last_iteration(self):
         if not self.can_click_arrows():
             return
+        self.follow_training = False
+        self.compute_all_steps()
         self.rce_current_network_index = len(self.rce_trainer.rce_networks) - 1
         self.plot_network()
 
+    @with_trace_lock
     def prev_iteration(self):
         if not self.can_click_arrows():
             return
-        current_network = self.rce_trainer.rce_networks[self.rce_current_network_index]
-        iteration = current_network.iteration
+        self.follow_training = False
+        iteration = self.rce_trainer.rce_networks.step(self.rce_current_network_index).iteration
         if iteration <= 0:
             return
 
-        while self.rce_current_network_index > 0:
-            self.rce_current_network_index -= 1
-            current_network = self.rce_trainer.rce_networks[self.rce_current_network_index]
-            prev_network_same_iteration = False
-            if self.rce_current_network_index - 1 >= 0:
-                prev_network_same_iteration = self.rce_trainer.rce_networks[self.rce_current_network_index - 1].iteration == current_network.iteration
-            if current_network.train_input_index == 0 and current_network.index_of_hidden_neuron == 0 and not prev_network_same_iteration:
-                break
+        # Beginning of the current iteration, or of the previous one when already positioned on it
+        epoch_start = self.rce_trainer.rce_networks.epoch_start(iteration)
+        if self.rce_current_network_index == epoch_start:
+            epoch_start = self.rce_trainer.rce_networks.epoch_start(iteration - 1)
+        self.rce_current_network_index = epoch_start
         self.plot_network()
 
+    @with_trace_lock
     def prev_step(self):
         if not self.can_click_arrows():
             return
+        self.follow_training = False
         if self.rce_current_network_index > 0:
             self.rce_current_network_index -= 1
             self.plot_network()
 
+    @with_trace_lock
     def next_step(self):
         if not self.can_click_arrows():
             return
-        if self.rce_current_network_index < len(self.rce_trainer.rce_networks) - 1:
+        self.follow_training = False
+        if self.rce_current_network_index < len(self.rce_trainer.rce_networks) - 1 or self.compute_next_step():
             self.rce_current_network_index += 1
             self.plot_network()
 
+    @with_trace_lock
     def next_iteration(self):
         if not self.can_click_arrows():
             return
-        next_iteration = self.rce_trainer.rce_networks[self.rce_current_network_index].iteration + 1
-        while self.rce_current_network_index < len(self.rce_trainer.rce_networks) - 1:
-            self.rce_current_network_index += 1
-            current_network = self.rce_trainer.rce_networks[self.rce_current_network_index]
-            if current_network.iteration == next_iteration:
-                break
+        self.follow_training = False
+        next_iteration = self.rce_trainer.rce_networks.step(self.rce_current_network_index).iteration + 1
+        self.rce_current_network_index = self.find_epoch_start(next_iteration)
+        self.plot_network()
+
+    def find_epoch_start(self, iteration : int) -> int:
+        """
+        Returns the first step of the given iteration, computes further steps if it was not computed yet.
+        If there is no such iteration, returns the last computed step.
+        """
+        trace = self.rce_trainer.rce_networks
+        while trace.epoch_start(iteration) is None and self.compute_next_step():
+            pass
+        epoch_start = trace.epoch_start(iteration)
+        return epoch_start if epoch_start is not None else len(trace) - 1
+
+    @with_trace_lock
+    def jump_to_step(self, index : int = None):
+        """
+        Shows the step with the given index (value of the slider by default).
+        """
+        if self.rce_trainer is None:
+            return
+        self.follow_training = False
+        index = self.step_slider.value() if index is None else index
+        self.rce_current_network_index = min(index, len(self.rce_trainer.rce_networks) - 1)
+        self.plot_network()
+
+    @with_trace_lock
+    def jump_to_epoch(self):
+        if self.rce_trainer is None:
+            return
+        self.follow_training = False
+        self.rce_current_network_index = self.find_epoch_start(self.epoch_input.value())
+        self.plot_network()
+
+    @with_trace_lock
+    def jump_to_training_vector(self):
+        if self.rce_trainer is None:
+            return
+        self.follow_training = False
+        trace = self.rce_trainer.rce_networks
+        iteration = trace.step(self.rce_current_network_index).iteration
+        training_vector = self.training_vector_input.value()
+        while trace.training_vector_start(iteration, training_vector) is None and self.compute_next_step():
+            pass
+        index = trace.training_vector_start(iteration, training_vector)
+        if index is not None:
+            self.rce_current_network_index = index
         self.plot_network()
 
     def goBack(self):
         self.switch_screen("main_menu")
+
+    def closeEvent(self, event):
+        self.stop_training_worker()
+        super().closeEvent(event)
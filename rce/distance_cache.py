@@ -0,0 +1,74 @@
+from collections import OrderedDict
+import numpy as np
+
+class DistanceCache():
+    def __init__(self, coordinates : np.ndarray, max_bytes : int = 64 * 1024 * 1024):
+        """
+        Initialize a cache of distances between training points and hidden neurons.
+
+        Centers of hidden neurons never move and radii only shrink below r_max, so a hidden neuron
+        farther than r_max from a training point can never contain it. For every training point the cache
+        keeps sorted indexes of hidden neurons within r_max together with comparable values of their distances
+        in the metric of the network (squared distances for the Euclidean metric).
+        A row is extended only with hidden neurons added since the last visit of the point, later visits
+        just compare cached distances with current radii.
+
+        Rows are evicted in least recently used order when they take more than max_bytes,
+        an evicted row is calculated again at the next visit of its point.
+
+        :param coordinates: (N, d) array of training points.
+        :param max_bytes: Memory limit for cached rows.
+        """
+        self.coordinates = coordinates
+        self.max_bytes = max_bytes
+        self.rows : OrderedDict[int, tuple] = OrderedDict() # Point index -> (checked neurons, indexes, values of distances)
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def candidate_neurons(self, point_index : int, rce_network) -> np.ndarray:
+        """
+        Returns the same candidates as RceNetwork.candidate_neurons for the training point with the given index.
+
+        :param point_index: Index of the training point in coordinates.
+        :param rce_network: Trained network, must be the same network for all calls (hidden neurons are only appended).
+        :return: np.ndarray - Sorted indexes of candidate hidden neurons.
+        """
+        row = self.rows.pop(point_index, None)
+        if row is None:
+            self.misses += 1
+            checked, indexes, values = 0, np.empty(0, dtype=np.int64), np.empty(0)
+        else:
+            self.hits += 1
+            checked, indexes, values = row
+            self.size_bytes -= self._row_bytes(row)
+
+        size = len(rce_network.hidden_layer)
+        if checked < size:
+            point = self.coordinates[point_index]
+            if rce_network.spatial_index is None:
+                new_indexes = np.arange(checked, size)
+            else:
+                new_indexes = rce_network.spatial_index.candidates(point)
+                new_indexes = new_indexes[new_indexes >= checked]
+            rce_network.distance_evaluations += len(new_indexes)
+            metric = rce_network.metric
+            new_values = metric.point_values(point, rce_network._centers[new_indexes])
+            near = new_values <= metric.to_comparable(rce_network.r_max) * (1 + 1e-9)
+            indexes = np.concatenate((indexes, new_indexes[near]))
+            values = np.concatenate((values, new_values[near]))
+
+        row = (size, indexes, values)
+        self.rows[point_index] = row
+        self.size_bytes += self._row_bytes(row)
+        while self.size_bytes > self.max_bytes and len(self.rows) > 1:
+            _, evicted = self.rows.popitem(last=False)
+            self.size_bytes -= self._row_bytes(evicted)
+            self.evictions += 1
+
+        return indexes[values <= rce_network.metric.to_comparable(rce_network._radii[indexes]) * (1 + 1e-9)]
+
+    def _row_bytes(self, row : tuple) -> int:
+        # Arrays and a fixed estimate of the overhead of python objects of the row
+        return row[1].nbytes + row[2].nbytes + 300
@@ -0,0 +1,166 @@
+"""
+Evaluation of RCE networks on held-out points - k-fold cross-validation and holdout split.
+Folds are trained in a process pool, the dataset is shared by all processes in shared memory
+(data.shared_dataset), so workers receive only the index of their fold.
+"""
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from data.input_data import InputData
+from data.point import Point
+from data.shared_dataset import SharedDataset
+from rce.metrics import Metric
+from rce.rce_network import AMBIGUOUS, UNIQUE, UNKNOWN
+from rce.rce_trainer import RceTrainer
+
+# Result of one fold
+#   accuracy - fraction of test points classified uniquely to their class
+#   ambiguous_rate, unknown_rate - fractions of test points with AMBIGUOUS and UNKNOWN result
+#   training_time, classification_time - wall times in seconds
+FoldResult = namedtuple("FoldResult", ["fold", "training_points", "test_points", "hidden_neurons", "epochs", "training_time",
+                                       "classification_time", "accuracy", "ambiguous_rate", "unknown_rate"])
+# Means over folds, accuracy_std is the standard deviation of accuracy of folds, times are sums over folds
+EvaluationSummary = namedtuple("EvaluationSummary", ["folds", "accuracy", "accuracy_std", "ambiguous_rate", "unknown_rate",
+                                                     "training_time", "classification_time"])
+
+_dataset = None # (blocks, coordinates, codes, class_names) of the dataset in the current process
+
+def _attach(handle : tuple):
+    global _dataset
+    _dataset = SharedDataset.attach(handle)
+
+def _call(task : tuple):
+    function, arguments = task
+    return function(_dataset, arguments)
+
+def run_parallel(coordinates : np.ndarray, labels, function, tasks : list, workers : int = None) -> list:
+    """
+    Calls function(dataset, task) for every task in a process pool with the dataset in shared memory.
+
+    :param coordinates: (N, d) array of coordinates of the dataset.
+    :param labels: Class names of the points.
+    :param function: Module level function (it is sent to the workers by name), dataset is the tuple
+        (blocks, coordinates, codes, class_names) as returned by SharedDataset.attach.
+    :param tasks: Picklable arguments of the calls, they should be small.
+    :param workers: Number of processes, None for the number of CPUs, 1 calls the function in the current process.
+    :return: list - Results in the order of tasks.
+    """
+    global _dataset
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    with SharedDataset(coordinates, labels) as dataset:
+        if workers <= 1:
+            _dataset = (None, dataset.coordinates, dataset.codes, dataset.class_names)
+            try:
+                return [_call((function, task)) for task in tasks]
+            finally:
+                _dataset = None
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(dataset.handle(),)) as executor:
+            return list(executor.map(_call, [(function, task) for task in tasks]))
+
+def split_holdout(size : int, holdout : float, seed : int):
+    """
+    Splits indexes of a dataset to training and held-out points. The split depends only on the arguments.
+
+    :param size: Number of points.
+    :param holdout: Fraction of held-out points (at least one point is always kept for training).
+    :param seed: Seed of the split.
+    :return: tuple (training_indexes, holdout_indexes) - sorted arrays of indexes.
+    """
+    permutation = np.random.default_rng(seed).permutation(size)
+    holdout_size = min(int(round(size * holdout)), size - 1)
+    return np.sort(permutation[holdout_size:]), np.sort(permutation[:holdout_size])
+
+def split_folds(size : int, folds : int, seed : int, fold : int):
+    """
+    Returns the split of the given fold of k-fold cross-validation. Test sets of all folds are disjoint,
+    cover the whole dataset and their sizes differ at most by one.
+
+    :param size: Number of points.
+    :param folds: Number of folds (k).
+    :param seed: Seed of the assignment of points to folds.
+    :param fold: Index of the fold.
+    :return: tuple (training_indexes, test_indexes) - sorted arrays of indexes.
+    """
+    test_indexes = np.sort(np.array_split(np.random.default_rng(seed).permutation(size), folds)[fold])
+    return np.setdiff1d(np.arange(size), test_indexes, assume_unique=True), test_indexes
+
+def to_points(coordinates : np.ndarray, codes : np.ndarray, class_names : list, indexes : np.ndarray) -> list[Point]:
+    return [Point.from_coordinates(point_coordinates, class_names[code]) for point_coordinates, code in
+            zip(coordinates[indexes].tolist(), codes[indexes].tolist())]
+
+def score(rce_network, coordinates : np.ndarray, codes : np.ndarray, class_names : list):
+    """
+    Classifies points (in vectorized batches) and compares results with their classes.
+
+    :return: tuple (accuracy, ambiguous_rate, unknown_rate) - fractions of the points, None for no points.
+    """
+    if len(codes) == 0:
+        return None, None, None
+    labels, results = rce_network.classify(coordinates)
+    expected = np.array(class_names, dtype=object)[codes]
+    return (float(np.count_nonzero((results == UNIQUE) & (labels == expected)) / len(codes)),
+            float(np.count_nonzero(results == AMBIGUOUS) / len(codes)), float(np.count_nonzero(results == UNKNOWN) / len(codes)))
+
+def _evaluate_fold(dataset : tuple, task : tuple) -> FoldResult:
+    fold, folds, holdout, r_max, seed, use_spatial_index, metric = task
+    _, coordinates, codes, class_names = dataset
+    if folds is None:
+        training_indexes, test_indexes = split_holdout(len(codes), holdout, seed)
+    else:
+        training_indexes, test_indexes = split_folds(len(codes), folds, seed, fold)
+
+    rce_trainer = RceTrainer(r_max, use_spatial_index=use_spatial_index, metric=metric)
+    stats = rce_trainer.Train(to_points(coordinates, codes, class_names, training_indexes), record_trace=False)
+    start = time.perf_counter()
+    accuracy, ambiguous_rate, unknown_rate = score(rce_trainer.rce_network, coordinates[test_indexes], codes[test_indexes], class_names)
+    classification_time = time.perf_counter() - start
+    return FoldResult(fold, len(training_indexes), len(test_indexes), len(rce_trainer.rce_network.hidden_layer), stats.epochs,
+                      stats.total_time, classification_time, accuracy, ambiguous_rate, unknown_rate)
+
+def cross_validate(input_data : InputData, r_max : float, folds : int = 5, seed : int = 0, workers : int = None,
+                   use_spatial_index : bool = True, metric : Metric = None) -> list[FoldResult]:
+    """
+    K-fold cross-validation, every fold trains on the other folds and classifies its points. Folds are trained
+    in parallel. Results (except times) depend only on the dataset and the arguments, not on the number of workers.
+
+    :param input_data: Dataset.
+    :param r_max: Maximum radius of hidden neurons.
+    :param folds: Number of folds, at least 2 and at most the number of points.
+    :param seed: Seed of the assignment of points to folds.
+    :param workers: Number of processes, None for the number of CPUs, 1 evaluates in the current process.
+    :param use_spatial_index: As in RceTrainer.
+    :param metric: As in RceTrainer.
+    :return: list[FoldResult] - Results of folds ordered by fold.
+    """
+    if not 2 <= folds <= len(input_data):
+        raise ValueError("Number of folds must be between 2 and the number of points")
+    tasks = [(fold, folds, None, r_max, seed, use_spatial_index, metric) for fold in range(folds)]
+    return run_parallel(input_data.coordinates, input_data.class_names, _evaluate_fold, tasks, workers)
+
+def holdout_evaluation(input_data : InputData, r_max : float, holdout : float = 0.2, seed : int = 0,
+                       use_spatial_index : bool = True, metric : Metric = None) -> FoldResult:
+    """
+    Trains on a seeded random part of the dataset and classifies the held-out rest (see split_holdout).
+
+    :return: FoldResult - Result of the only fold (0).
+    """
+    if len(input_data) < 2:
+        raise ValueError("Holdout evaluation needs at least 2 points")
+    return run_parallel(input_data.coordinates, input_data.class_names, _evaluate_fold,
+                        [(0, None, holdout, r_max, seed, use_spatial_index, metric)], 1)[0]
+
+def summarize(results : list[FoldResult]) -> EvaluationSummary:
+    """
+    Averages results of folds, weighted by the number of their test points.
+    """
+    results = [result for result in results if result.test_points > 0]
+    if not results:
+        return EvaluationSummary(0, None, None, None, None, 0.0, 0.0)
+    weights = np.array([result.test_points for result in results], dtype=float)
+    accuracies = np.array([result.accuracy for result in results])
+    return EvaluationSummary(len(results), float(np.average(accuracies, weights=weights)), float(accuracies.std()),
+                             float(np.average([result.ambiguous_rate for result in results], weights=weights)),
+                             float(np.average([result.unknown_rate for result in results], weights=weights)),
+                             sum(result.training_time for result in results), sum(result.classification_time for result in results))
@@ -3,7 +3,7 @@ class HiddenNeuron():
         """
         Initialize HiddenNeuron with given weights and activation radius.
 
-        :param weights: List of two floats, weights of the neuron.
+        :param weights: List of floats, weights (center) of the neuron, one per dimension.
         :param activation: Float, activation radius of the neuron.
         """
         self.weights = weights
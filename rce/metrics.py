@@ -0,0 +1,216 @@
+"""
+Distance metrics of hidden neurons. A hypersphere of a hidden neuron contains points whose distance
+to its center (in the metric of the network) is at most its radius.
+
+Every metric has an exact scalar distance used by training (RceTrainer.calculate_distance) and batch kernels
+used by vectorized checks (RceNetwork.candidate_neurons, RceNetwork.classify, DistanceCache, ...). Kernels
+return comparable values - a monotonic function of the distance (e.g. squared Euclidean distance, so no
+square root is computed) - which are compared with radii converted by to_comparable.
+"""
+import numpy as np
+
+class Metric():
+    name = None
+    outline = "ellipse" # Shape of a hypersphere projected to the plane of two coordinates - ellipse, diamond or square
+
+    def distance(self, a, b) -> float:
+        """
+        Exact distance of two points (sequences of coordinates).
+        """
+        raise NotImplementedError
+
+    def point_values(self, point : np.ndarray, centers : np.ndarray) -> np.ndarray:
+        """
+        Comparable values of distances of one point to (H, d) centers.
+        """
+        raise NotImplementedError
+
+    def pairwise(self, points : np.ndarray, centers : np.ndarray) -> np.ndarray:
+        """
+        (N, H) matrix of comparable values of distances of (N, d) points to (H, d) centers. Coordinates are processed
+        one at a time, so besides the result there is only one temporary (N, H) matrix.
+        """
+        values = np.zeros((len(points), len(centers)))
+        differences = np.empty_like(values)
+        for dimension in range(points.shape[1]):
+            np.subtract(points[:, dimension, None], centers[None, :, dimension], out=differences)
+            self._accumulate(values, differences, dimension)
+        return values
+
+    def _accumulate(self, values : np.ndarray, differences : np.ndarray, dimension : int):
+        raise NotImplementedError
+
+    def to_comparable(self, distances):
+        """
+        Converts distances (or radii) to comparable values.
+        """
+        return distances
+
+    def from_comparable(self, values):
+        """
+        Converts comparable values to distances.
+        """
+        return values
+
+    def ball_extents(self, radii, dimensions : int) -> np.ndarray:
+        """
+        Largest differences of coordinates between centers of hyperspheres with the given radii and their points.
+
+        :param radii: Radius or vector of radii.
+        :param dimensions: Number of coordinates.
+        :return: np.ndarray - (d,) vector for a radius, (H, d) matrix for a vector of radii.
+        """
+        return np.multiply.outer(np.asarray(radii, dtype=float), np.ones(dimensions))
+
+    def coordinate_bound(self, radius : float, dimensions : int) -> float:
+        """
+        Largest difference of any coordinate of points within the radius, used as the cell size of grids (GridIndex).
+        """
+        return float(self.ball_extents(radius, max(1, dimensions)).max())
+
+    def check_dimensions(self, dimensions : int):
+        """
+        :raises ValueError: If the metric can not measure points with the given number of coordinates.
+        """
+
+    def to_dict(self) -> dict:
+        return {"name": self.name}
+
+    def __eq__(self, other):
+        return isinstance(other, Metric) and self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, self.to_dict())
+
+class Euclidean(Metric):
+    name = "euclidean"
+
+    def distance(self, a, b) -> float:
+        # Squares are summed in the order of coordinates, for 2D points the result is exactly sqrt(a^2 + b^2)
+        return sum((coordinate - weight) ** 2 for coordinate, weight in zip(a, b)) ** 0.5
+
+    def point_values(self, point, centers):
+        differences = centers - point
+        return (differences * differences).sum(axis=1)
+
+    def _accumulate(self, values, differences, dimension):
+        np.multiply(differences, differences, out=differences)
+        values += differences
+
+    def to_comparable(self, distances):
+        return distances * distances
+
+    def from_comparable(self, values):
+        return np.sqrt(values)
+
+class SquaredEuclidean(Euclidean):
+    # Sum of squared differences without square root, a hypersphere of radius r is a Euclidean ball of radius sqrt(r)
+    name = "sqeuclidean"
+
+    def distance(self, a, b) -> float:
+        return sum((coordinate - weight) ** 2 for coordinate, weight in zip(a, b))
+
+    def to_comparable(self, distances):
+        return distances
+
+    def from_comparable(self, values):
+        return values
+
+    def ball_extents(self, radii, dimensions):
+        return np.multiply.outer(np.sqrt(np.asarray(radii, dtype=float)), np.ones(dimensions))
+
+class Manhattan(Metric):
+    name = "manhattan"
+    outline = "diamond"
+
+    def distance(self, a, b) -> float:
+        return sum(abs(coordinate - weight) for coordinate, weight in zip(a, b))
+
+    def point_values(self, point, centers):
+        return np.abs(centers - point).sum(axis=1)
+
+    def _accumulate(self, values, differences, dimension):
+        np.abs(differences, out=differences)
+        values += differences
+
+class Chebyshev(Metric):
+    name = "chebyshev"
+    outline = "square"
+
+    def distance(self, a, b) -> float:
+        return max((abs(coordinate - weight) for coordinate, weight in zip(a, b)), default=0.0)
+
+    def point_values(self, point, centers):
+        return np.abs(centers - point).max(axis=1, initial=0.0)
+
+    def _accumulate(self, values, differences, dimension):
+        np.abs(differences, out=differences)
+        np.maximum(values, differences, out=values)
+
+class WeightedEuclidean(Euclidean):
+    name = "weighted_euclidean"
+
+    def __init__(self, weights):
+        """
+        Euclidean distance with squared difference of every coordinate multiplied by its weight.
+
+        :param weights: Positive weights of coordinates.
+        :raises ValueError: If a weight is not positive.
+        """
+        self.weights = np.asarray(weights, dtype=float).reshape(-1)
+        if len(self.weights) == 0 or not (self.weights > 0).all():
+            raise ValueError("Weights of coordinates must be positive")
+
+    def distance(self, a, b) -> float:
+        return sum(weight * (coordinate - center) ** 2 for coordinate, center, weight in zip(a, b, self.weights.tolist())) ** 0.5
+
+    def point_values(self, point, centers):
+        differences = centers - point
+        return (differences * differences) @ self.weights
+
+    def _accumulate(self, values, differences, dimension):
+        np.multiply(differences, differences, out=differences)
+        differences *= self.weights[dimension]
+        values += differences
+
+    def ball_extents(self, radii, dimensions):
+        return np.multiply.outer(np.asarray(radii, dtype=float), 1 / np.sqrt(self.weights[:dimensions]))
+
+    def check_dimensions(self, dimensions):
+        if len(self.weights) != dimensions:
+            raise ValueError("Metric has {} weights, points have {} coordinates".format(len(self.weights), dimensions))
+
+    def to_dict(self):
+        return {"name": self.name, "weights": self.weights.tolist()}
+
+METRICS = {metric.name: metric for metric in (Euclidean, SquaredEuclidean, Manhattan, Chebyshev, WeightedEuclidean)}
+
+def get_metric(name : str = "euclidean", weights = None) -> Metric:
+    """
+    Creates a metric by its name.
+
+    :param name: One of METRICS.
+    :param weights: Weights of coordinates, required by weighted_euclidean and not allowed for other metrics.
+    :return: Metric - New metric.
+    :raises ValueError: If the name is unknown or weights do not match the metric.
+    """
+    if name not in METRICS:
+        raise ValueError("Unknown metric {}, expected one of {}".format(name, ", ".join(METRICS)))
+    if name == WeightedEuclidean.name:
+        if weights is None:
+            raise ValueError("Metric {} needs weights of coordinates".format(name))
+        return WeightedEuclidean(weights)
+    if weights is not None:
+        raise ValueError("Metric {} does not use weights".format(name))
+    return METRICS[name]()
+
+def metric_from_dict(metric : dict) -> Metric:
+    """
+    Creates a metric from its description (Metric.to_dict), None gives the Euclidean metric.
+    """
+    if metric is None:
+        return Euclidean()
+    return get_metric(metric["name"], metric.get("weights"))
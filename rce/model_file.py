@@ -0,0 +1,81 @@
+import json
+import struct
+import numpy as np
+from rce.metrics import metric_from_dict
+from rce.rce_network import RceNetwork
+
+# File of a trained RCE network:
+#   header (HEADER) - magic, version, dimensions, number of hidden neurons and offsets of the sections
+#   metadata - UTF-8 JSON {"r_max": .., "class_names": [..], "metric": {"name": .., ..}}, files without metric are Euclidean
+#   centers (H, d) float64, radii (H,) float64, class_ids (H,) int64 - little endian, aligned to ALIGNMENT bytes
+MAGIC = b"RCEMODEL"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQQQQQ") # magic, version, dimensions, hidden neurons, metadata offset and size, offsets of arrays
+ALIGNMENT = 64
+
+def save_model(file_name : str, rce_network : RceNetwork):
+    """
+    Saves the hidden and output layer of a trained network to a model file.
+
+    :param file_name: Path to the model file.
+    :param rce_network: Trained network.
+    """
+    centers = np.ascontiguousarray(rce_network.centers, dtype="<f8")
+    radii = np.ascontiguousarray(rce_network.radii, dtype="<f8")
+    class_ids = np.ascontiguousarray(rce_network.class_ids, dtype="<i8")
+    metadata = json.dumps({"r_max": rce_network.r_max,
+                           "class_names": [output_neuron.class_name for output_neuron in rce_network.output_layer],
+                           "metric": rce_network.metric.to_dict()}).encode("utf-8")
+
+    offsets = []
+    offset = HEADER.size + len(metadata)
+    for array in (centers, radii, class_ids):
+        offset = aligned(offset)
+        offsets.append(offset)
+        offset += array.nbytes
+
+    with open(file_name, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, centers.shape[1], len(radii), HEADER.size, len(metadata), *offsets))
+        f.write(metadata)
+        for array, offset in zip((centers, radii, class_ids), offsets):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(array.tobytes())
+
+def load_model(file_name : str, memory_map : bool = True, use_spatial_index : bool = True) -> RceNetwork:
+    """
+    Loads a trained network from a model file.
+
+    With memory_map the arrays of hidden neurons are mapped from the file instead of being read, so
+    loading is almost instant and processes which load the same model share its pages. The mapping is
+    copy-on-write, changes of the loaded network (further training) are never written to the file.
+
+    :param file_name: Path to the model file.
+    :param memory_map: If False, the arrays are read into memory.
+    :param use_spatial_index: As in RceNetwork.
+    :return: RceNetwork - Loaded network.
+    :raises ValueError: If the file is not a model file or has an unsupported version.
+    """
+    with open(file_name, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError("{} is not an RCE model file".format(file_name))
+        _, version, dimensions, size, metadata_offset, metadata_size, *offsets = HEADER.unpack(header)
+        if version != VERSION:
+            raise ValueError("Unsupported version {} of RCE model file {}".format(version, file_name))
+        f.seek(metadata_offset)
+        metadata = json.loads(f.read(metadata_size).decode("utf-8"))
+
+        arrays = []
+        for offset, dtype, shape in zip(offsets, ("<f8", "<f8", "<i8"), ((size, dimensions), (size,), (size,))):
+            if size == 0:
+                arrays.append(np.empty(shape, dtype=dtype))
+            elif memory_map:
+                arrays.append(np.memmap(file_name, dtype=dtype, mode='c', offset=offset, shape=shape))
+            else:
+                f.seek(offset)
+                arrays.append(np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape))
+    return RceNetwork.from_arrays(metadata["r_max"], *arrays, metadata["class_names"], use_spatial_index,
+                                  metric_from_dict(metadata.get("metric")))
+
+def aligned(offset : int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
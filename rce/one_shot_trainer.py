@@ -0,0 +1,131 @@
+"""
+One-shot training of RCE networks. A new hidden neuron gets its final radius when it is created -
+half of the distance to the nearest training point of another class (at most r_max) - so radii never
+shrink and one pass over the training dataset is enough.
+
+Differences from the classic algorithm (RceTrainer):
+  - Radius of a hidden neuron is min(r_max, d / 2), where d is the distance to the nearest training point
+    of another class anywhere in the dataset. Classic training shrinks a radius to d / 2 only for conflicting
+    points it visits while they are inside of the hypersphere, so its final radius depends on the order of
+    visits and can be anywhere below the distance to the nearest point of another class (larger or smaller
+    than d / 2).
+  - Hyperspheres never contain a training point of another class and never shrink, so a point covered by
+    its class stays covered and the network is final after one pass (iteration 1, no shrinks). A classic
+    epoch run on the result would not change it. Classic training may need many epochs, because a shrink
+    can uncover points visited earlier.
+  - Neurons are usually smaller than in classic training from the start, so points visited later are less
+    often covered by an existing hypersphere and the network can have more hidden neurons. Unknown regions
+    between classes are wider, the margin between hyperspheres of different classes is at least half of the
+    distance of their nearest points.
+  - Points of different classes at the same position (which classic training never finishes) get neurons
+    with radius 0, their positions are classified as ambiguous.
+  - Training trace (steps for the GUI) and worklist are not supported.
+"""
+import numpy as np
+from data.point import Point
+from rce.metrics import Euclidean, Metric
+from rce.rce_trainer import RceTrainer
+from rce.spatial_index import GridIndex
+
+def nearest_opposite_distances(coordinates : np.ndarray, class_names, max_distance : float,
+                               max_chunk_bytes : int = 32 * 1024 * 1024, metric : Metric = None) -> np.ndarray:
+    """
+    For every point finds the distance to the nearest point of another class, if it is not farther than max_distance.
+    Points are grouped by cells of a grid with cells of the size of the largest coordinate difference within
+    max_distance and every group is compared with the points of the neighbouring cells at once.
+
+    :param coordinates: (N, d) array of points.
+    :param class_names: Class names of the points.
+    :param max_distance: Distances larger than max_distance are not searched, they are reported as inf.
+    :param max_chunk_bytes: Approximate memory limit for temporary (group chunk, neighbours) matrices.
+    :param metric: Metric of distances, Euclidean by default.
+    :return: np.ndarray - Distances (inf if there is no point of another class within max_distance).
+    """
+    metric = metric if metric is not None else Euclidean()
+    distances = np.full(len(coordinates), np.inf)
+    if len(coordinates) == 0 or max_distance <= 0:
+        return distances
+    _, codes = np.unique(np.asarray(list(class_names), dtype=object).astype(str), return_inverse=True)
+    codes = codes.reshape(-1)
+    point_index = GridIndex(metric.coordinate_bound(max_distance, coordinates.shape[1]), coordinates.shape[1])
+    point_index.insert_many(np.arange(len(coordinates)), coordinates)
+
+    for point_indexes, neighbour_indexes in point_index.group_candidates(coordinates):
+        neighbours, neighbour_codes = coordinates[neighbour_indexes], codes[neighbour_indexes]
+        chunk_size = max(1, max_chunk_bytes // (16 * len(neighbour_indexes)))
+        for start in range(0, len(point_indexes), chunk_size):
+            chunk_indexes = point_indexes[start:start + chunk_size]
+            values = metric.pairwise(coordinates[chunk_indexes], neighbours)
+            values[codes[chunk_indexes, None] == neighbour_codes[None, :]] = np.inf
+            nearest = metric.from_comparable(values.min(axis=1))
+            distances[chunk_indexes] = np.where(nearest <= max_distance, nearest, np.inf)
+    return distances
+
+class OneShotTrainer(RceTrainer):
+    def Train(self, training_input: list[Point], record_trace: bool = False, use_worklist: bool = False):
+        """
+        Trains rce network in one pass, radii of new hidden neurons are set from the nearest training point
+        of another class (see the module documentation for differences from RceTrainer.Train).
+
+        Args:
+            training_input (list[Point]): List of training points.
+            record_trace (bool): Not supported, must be False.
+            use_worklist (bool): Not supported, must be False.
+
+        Returns:
+            TrainingStats: Statistics of the training (also in self.stats), None for an empty dataset.
+        """
+        if record_trace or use_worklist:
+            raise ValueError("One-shot training supports neither trace nor worklist")
+        if len(training_input) == 0:
+            print("RCE Network: Training dataset is empty!")
+            return
+
+        self.set_initial_state_for_training(False, training_input)
+        coordinates = np.array([point.coordinates for point in training_input], dtype=float)
+        # Only points of another class closer than 2 * r_max can make a radius smaller than r_max
+        radii = np.minimum(self.r_max, nearest_opposite_distances(coordinates, [point.class_name for point in training_input],
+                                                                  2 * self.r_max, metric=self.metric) / 2).tolist()
+        self.train_one_pass(training_input, radii)
+        return self.finish_training()
+
+    def train_one_pass(self, training_input: list[Point], radii: list[float]):
+        """
+        Visits every training point once, a point not covered by a hypersphere of its class gets a new hidden neuron.
+
+        :param training_input: List of training points.
+        :param radii: Radius of a hidden neuron created at every training point.
+        """
+        counters, observers = self.counters, self.observers
+        rce_network = self.rce_network
+        rce_network.modification = False
+        counters.start_epoch()
+        for observer in observers:
+            observer.epoch_started(rce_network.iteration)
+        for index, training_point in enumerate(training_input):
+            rce_network.train_input_index = index
+            if observers:
+                for observer in observers:
+                    observer.point_started(index)
+            activations = self.find_activations(training_point)
+            counters.point_visits += 1
+            point_class_id = rce_network.class_id(training_point.class_name)
+            class_ids = rce_network.class_ids
+            rce_network.hit = any(class_ids[neuron_index] == point_class_id for neuron_index in activations)
+            counters.hits += rce_network.hit
+            if not rce_network.hit:
+                rce_network.add_new_neuron(training_point, radii[index])
+                counters.neurons_added += 1
+                for observer in observers:
+                    observer.neuron_added(len(rce_network.hidden_layer) - 1)
+            if observers:
+                for observer in observers:
+                    observer.point_finished(index, activations, rce_network.hit)
+        # Hidden neurons never change after they are created, so another pass would not modify the network
+        rce_network.modification = False
+        rce_network.train_input_index = 0
+        rce_network.index_of_hidden_neuron = len(rce_network.hidden_layer)
+        elapsed = counters.finish_epoch()
+        for observer in observers:
+            observer.epoch_finished(rce_network.iteration, elapsed)
+        rce_network.iteration += 1
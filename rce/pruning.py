@@ -0,0 +1,170 @@
+"""
+Pruning of trained RCE networks - consolidation and removal of redundant hidden neurons without changing
+the classification of the given points (usually the training points).
+
+Consolidation grows the radius of every hidden neuron (up to r_max) as long as the hypersphere gains only points
+classified uniquely to its class, so it takes over points of neighbouring hyperspheres of the same class.
+A hidden neuron is redundant if every point inside of its hypersphere is also inside of another hypersphere
+of the same class (for example a small hypersphere lying in a larger one of the same class) and it is not
+the nearest activated neuron of an ambiguous point, whose label it decides. Removing it changes neither the
+classes which activate the points nor their labels. Neurons are removed greedily from the smallest radius,
+so larger hyperspheres, which cover more of the space, are kept.
+"""
+import time
+from collections import namedtuple
+import numpy as np
+from rce.rce_network import UNIQUE, RceNetwork
+
+# Result of pruning
+#   inference_time_before, inference_time_after - best wall time (s) of RceNetwork.classify of the query points
+#   speedup - inference_time_before / inference_time_after
+PruningReport = namedtuple("PruningReport", ["neurons_before", "neurons_after", "queries", "inference_time_before",
+                                             "inference_time_after", "speedup"])
+
+def neighbour_pairs(rce_network : RceNetwork, coordinates : np.ndarray, radii : np.ndarray,
+                    max_chunk_bytes : int = 32 * 1024 * 1024):
+    """
+    Finds pairs of points and hidden neurons with the point inside of the hypersphere with the given radius.
+    Distances are compared in the same way (in comparable values of the metric of the network) as in RceNetwork.classify,
+    so with the radii of the network the pairs are exactly the activations of classify.
+
+    :param rce_network: Trained network.
+    :param coordinates: (N, d) array of points.
+    :param radii: Radii of hidden neurons, at most r_max.
+    :param max_chunk_bytes: Approximate memory limit for temporary (chunk, candidates) matrices.
+    :return: tuple (point_indexes, neuron_indexes, values) - arrays of the pairs, values are comparable values
+        of distances (see Metric.to_comparable).
+    """
+    centers, metric = rce_network.centers, rce_network.metric
+    pairs = ([np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)], [np.empty(0)])
+    if len(coordinates) == 0 or len(radii) == 0:
+        return tuple(np.concatenate(arrays) for arrays in pairs)
+    if rce_network.spatial_index is not None:
+        groups = rce_network.spatial_index.group_candidates(coordinates)
+    elif rce_network.r_max > 0:
+        neuron_index = rce_network.create_spatial_index(centers.shape[1])
+        neuron_index.insert_many(np.arange(len(radii)), centers)
+        groups = neuron_index.group_candidates(coordinates)
+    else:
+        groups = [(np.arange(len(coordinates)), np.arange(len(radii)))]
+
+    for point_indexes, neuron_indexes in groups:
+        if len(neuron_indexes) == 0:
+            continue
+        thresholds = metric.to_comparable(radii[neuron_indexes])
+        neuron_centers = centers[neuron_indexes]
+        chunk_size = max(1, max_chunk_bytes // (17 * len(neuron_indexes)))
+        for start in range(0, len(point_indexes), chunk_size):
+            chunk_indexes = point_indexes[start:start + chunk_size]
+            values = metric.pairwise(coordinates[chunk_indexes], neuron_centers)
+            rows, columns = np.nonzero(values <= thresholds)
+            pairs[0].append(chunk_indexes[rows])
+            pairs[1].append(neuron_indexes[columns])
+            pairs[2].append(values[rows, columns])
+    return tuple(np.concatenate(arrays) for arrays in pairs)
+
+def grown_radii(rce_network : RceNetwork, coordinates : np.ndarray) -> np.ndarray:
+    """
+    Returns radii of hidden neurons grown up to r_max, so the hyperspheres gain only points which are
+    classified uniquely to their class. Classification of the points does not change with the grown radii.
+
+    :param rce_network: Trained network.
+    :param coordinates: (N, d) array of points.
+    :return: np.ndarray - Radii, none of them is smaller than in the network.
+    """
+    class_ids = rce_network.class_ids
+    labels, results = rce_network.classify_ids(coordinates)
+    point_class_ids = np.where(results == UNIQUE, labels, -1)
+    metric = rce_network.metric
+    point_indexes, neuron_indexes, values = neighbour_pairs(
+        rce_network, coordinates, np.full(len(class_ids), float(rce_network.r_max)))
+
+    # Nearest point which must stay outside, the tolerance covers rounding of the conversion of the new radius
+    blocking = point_class_ids[point_indexes] != class_ids[neuron_indexes]
+    blocking_values = np.full(len(class_ids), np.inf)
+    np.minimum.at(blocking_values, neuron_indexes[blocking], values[blocking])
+    allowed = ~blocking & (values < blocking_values[neuron_indexes] * (1 - 1e-9))
+    radii_values = metric.to_comparable(rce_network.radii)
+    np.maximum.at(radii_values, neuron_indexes[allowed], values[allowed])
+    return np.maximum(rce_network.radii, np.minimum(metric.from_comparable(radii_values), rce_network.r_max))
+
+def redundant_neurons(rce_network : RceNetwork, coordinates : np.ndarray, radii : np.ndarray = None) -> np.ndarray:
+    """
+    Selects hidden neurons which can be removed together without changing the classification of the points.
+
+    :param rce_network: Trained network.
+    :param coordinates: (N, d) array of points whose classification must not change.
+    :param radii: Radii of hidden neurons, radii of the network by default.
+    :return: np.ndarray - Bool mask of removed hidden neurons.
+    """
+    class_ids = rce_network.class_ids
+    radii = rce_network.radii if radii is None else radii
+    classes = max(1, len(rce_network.output_layer))
+    removed = np.zeros(len(class_ids), dtype=bool)
+    point_indexes, neuron_indexes, values = neighbour_pairs(rce_network, coordinates, radii)
+
+    # Number of activated neurons of every (point, class) pair
+    unique_keys, key_indexes, counts = np.unique(point_indexes * classes + class_ids[neuron_indexes],
+                                                 return_inverse=True, return_counts=True)
+    key_indexes = key_indexes.reshape(-1)
+    # Nearest activated neuron (the first one of equally distant) of an ambiguous point decides its label
+    classes_per_point = np.bincount(unique_keys // classes, minlength=len(coordinates))
+    order = np.lexsort((neuron_indexes, values, point_indexes))
+    first = order[np.r_[True, point_indexes[order][1:] != point_indexes[order][:-1]]] if len(order) else order
+    protected = np.zeros(len(class_ids), dtype=bool)
+    protected[neuron_indexes[first][classes_per_point[point_indexes[first]] > 1]] = True
+
+    order = np.argsort(neuron_indexes, kind="stable")
+    key_indexes = key_indexes[order]
+    boundaries = np.searchsorted(neuron_indexes[order], np.arange(len(class_ids) + 1))
+    for index in np.argsort(radii, kind="stable").tolist():
+        if protected[index]:
+            continue
+        keys = key_indexes[boundaries[index]:boundaries[index + 1]]
+        # Every point of the hypersphere stays activated by its class (a neuron without points is not needed at all)
+        if (counts[keys] > 1).all():
+            counts[keys] -= 1
+            removed[index] = True
+    return removed
+
+def prune(rce_network : RceNetwork, coordinates : np.ndarray, consolidate : bool = True) -> RceNetwork:
+    """
+    Removes redundant hidden neurons (see redundant_neurons), after growing the radii (see grown_radii) if consolidate
+    is True. Classification of the given points (labels and results of RceNetwork.classify) is the same with the pruned
+    network, other points may be classified differently.
+
+    :param rce_network: Trained network, it is not changed.
+    :param coordinates: (N, d) array (or sequence) of points whose classification must not change, usually the training points.
+    :param consolidate: If True, radii are grown first, so more neurons become redundant.
+    :return: RceNetwork - New network with the remaining hidden neurons in their original order and all output neurons.
+    """
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, rce_network.dimensions)
+    radii = grown_radii(rce_network, coordinates) if consolidate else rce_network.radii
+    kept = ~redundant_neurons(rce_network, coordinates, radii)
+    pruned = RceNetwork.from_arrays(rce_network.r_max, rce_network.centers[kept], radii[kept], rce_network.class_ids[kept],
+                                    [output_neuron.class_name for output_neuron in rce_network.output_layer],
+                                    rce_network.spatial_index is not None, rce_network.metric)
+    pruned.iteration = rce_network.iteration
+    return pruned
+
+def inference_time(rce_network : RceNetwork, queries : np.ndarray, repeats : int = 3) -> float:
+    """
+    Returns the best wall time (s) of classification of the query points.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        rce_network.classify(queries)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def pruning_report(rce_network : RceNetwork, pruned : RceNetwork, queries : np.ndarray, repeats : int = 3) -> PruningReport:
+    """
+    Compares the number of hidden neurons and inference time of a network and its pruned version.
+
+    :param queries: (N, d) array of points classified to measure inference time.
+    """
+    time_before = inference_time(rce_network, queries, repeats)
+    time_after = inference_time(pruned, queries, repeats)
+    return PruningReport(len(rce_network.hidden_layer), len(pruned.hidden_layer), len(queries), time_before, time_after,
+                         time_before / time_after if time_after > 0 else None)
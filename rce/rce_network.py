@@ -1,74 +1,373 @@
+import numpy as np
 from data.input_data import Point
 from rce.hidden_neuron import HiddenNeuron
+from rce.metrics import Euclidean, Metric
 from rce.output_neuron import OutputNeuron
+from rce.spatial_index import GridIndex
+from rce.step_description import NeuronAdded, describe_action, describe_comment
+
+# Result of classification of a point
+UNKNOWN = 0 # Point is not inside of any hypersphere
+UNIQUE = 1 # Point is inside of hyperspheres of exactly one class
+AMBIGUOUS = 2 # Point is inside of hyperspheres of more classes
+
+MAX_LISTED_NEURONS = 20 # Hidden and output neurons listed by RceNetwork.__str__
+
+class LazyHiddenLayer():
+    def __init__(self, rce_network, size : int):
+        """
+        Hidden layer of a network created from arrays (see RceNetwork.from_arrays). HiddenNeuron objects
+        are created only when they are accessed, so a network with many hidden neurons is created instantly.
+
+        :param rce_network: Network whose arrays back the hidden layer.
+        :param size: Number of hidden neurons in the arrays.
+        """
+        self.rce_network = rce_network
+        self.size = size
+        self.neurons : dict[int, HiddenNeuron] = {} # Already created hidden neurons
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if index < 0 or index >= self.size:
+            raise IndexError("hidden layer index out of range")
+        hidden_neuron = self.neurons.get(index)
+        if hidden_neuron is None:
+            hidden_neuron = HiddenNeuron(self.rce_network._centers[index].tolist(), float(self.rce_network._radii[index]))
+            hidden_neuron.output_neuron = self.rce_network.output_layer[self.rce_network._class_ids[index]]
+            self.neurons[index] = hidden_neuron
+        return hidden_neuron
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self[index]
+
+    def append(self, hidden_neuron : HiddenNeuron):
+        self.neurons[self.size] = hidden_neuron
+        self.size += 1
 
 class RceNetwork():
-    def __init__(self, r_max: int = 3):
+    def __init__(self, r_max: int = 3, use_spatial_index: bool = True, dimensions: int = 2, metric: Metric = None):
         """
         Initialize RCE Network with given maximum radius.
 
         :param r_max: Maximum radius of all hidden neurons. Default value is 3.
+        :param use_spatial_index: If True, hidden neurons are kept in a grid with cells of the size of the largest
+            hypersphere (r_max in most metrics) and only hidden neurons from neighbouring cells are tested, otherwise
+            all hidden neurons are tested.
+        :param dimensions: Number of coordinates of points, it is changed by the first added hidden neuron.
+        :param metric: Distance of points to centers of hidden neurons (see rce.metrics), Euclidean by default.
         """
         self.r_max = r_max
+        self.metric = metric if metric is not None else Euclidean()
         self.modification = False # Modification flag
         self.train_input_index = 0 # Index of training for dataset
         self.hit = None # Hit flag
         self.index_of_hidden_neuron = 0
         self.hidden_layer : list[HiddenNeuron] = []
         self.output_layer : list[OutputNeuron] = []
+        # Array-backed copy of the hidden layer, row i belongs to hidden_layer[i]
+        self._centers = np.empty((0, dimensions))
+        self._radii = np.empty(0)
+        self._class_ids = np.empty(0, dtype=np.int64) # Index of output neuron in output_layer
+        self.spatial_index = self.create_spatial_index(dimensions) if use_spatial_index and r_max > 0 else None
         self.iteration = 0
-        self.comment = ""
-        self.action = ""
+        self.distance_evaluations = 0 # Distances to hidden neurons evaluated by candidate_neurons (and DistanceCache)
+        # Descriptions of the last step (see rce.step_description), formatted only by comment and action
+        self.step_comment = None
+        self.step_action = None
+
+    @property
+    def comment(self) -> str:
+        return describe_comment(self.step_comment)
+
+    @comment.setter
+    def comment(self, comment):
+        self.step_comment = comment
+
+    @property
+    def action(self) -> str:
+        return describe_action(self.step_action)
+
+    @action.setter
+    def action(self, action):
+        self.step_action = action
 
     def __str__(self):
-        output_message = "######################\n"
-        output_message += "RCE Network\n"
-        output_message += f"iteration: {self.iteration}\n"
-        output_message += f"index of train vector: {self.train_input_index}\n"
-        output_message += f"index of hidden neuron: {self.index_of_hidden_neuron}\n"
-        output_message += f"action: {self.action}\n"
-        output_message += f"{self.comment}\n"
-        output_message += "----------------------\n"
-        output_message += f"r_max: {self.r_max};"
-        output_message += f"neurons in hidden layer: {len(self.hidden_layer)};"
-        output_message += f"neurons in output layer: {len(self.output_layer)}\n"
-        output_message += f"modification: {self.modification};"
-        output_message += f"hit: {self.hit}\n"
-        output_message += "hidden layer: "
-        for i, item in enumerate(self.hidden_layer):
-            output_message += "{}, " .format(item)
-        output_message += "\n"    
-        output_message += "output layer: "
-        for i, item in enumerate(self.output_layer):   
-            output_message += "{}, " .format(item)
-        output_message += "\n"
-        output_message += "######################\n"
-        return output_message
+        return self.to_string(MAX_LISTED_NEURONS)
+
+    def to_string(self, max_neurons : int = None) -> str:
+        """
+        Detailed description of the network.
+
+        :param max_neurons: Maximum number of listed hidden and output neurons, None lists all of them.
+        :return: str - Description of the network.
+        """
+        lines = [
+            "######################",
+            "RCE Network",
+            f"iteration: {self.iteration}",
+            f"index of train vector: {self.train_input_index}",
+            f"index of hidden neuron: {self.index_of_hidden_neuron}",
+            f"action: {self.action}",
+            f"{self.comment}",
+            "----------------------",
+            f"r_max: {self.r_max};neurons in hidden layer: {len(self.hidden_layer)};neurons in output layer: {len(self.output_layer)}",
+            f"modification: {self.modification};hit: {self.hit}",
+            "hidden layer: " + self._list_neurons(self.hidden_layer, max_neurons),
+            "output layer: " + self._list_neurons(self.output_layer, max_neurons),
+            "######################",
+        ]
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _list_neurons(layer, max_neurons : int = None) -> str:
+        count = len(layer) if max_neurons is None else min(len(layer), max_neurons)
+        listed = "".join("{}, ".format(layer[i]) for i in range(count))
+        if count < len(layer):
+            listed += "... ({} more)".format(len(layer) - count)
+        return listed
             
-    def add_new_neuron(self, training_point : Point):
+    def create_spatial_index(self, dimensions : int) -> GridIndex:
+        return GridIndex(self.metric.coordinate_bound(self.r_max, dimensions), dimensions)
+
+    @classmethod
+    def from_arrays(cls, r_max, centers : np.ndarray, radii : np.ndarray, class_ids : np.ndarray, class_names : list,
+                    use_spatial_index : bool = True, metric : Metric = None) -> 'RceNetwork':
+        """
+        Creates a trained network from arrays of its hidden neurons. The arrays are used without copying
+        (they can be memory mapped), hidden neurons and output neurons are created from them on demand.
+
+        :param r_max: Maximum radius of hidden neurons.
+        :param centers: (H, d) array of centers of hidden neurons.
+        :param radii: Vector of radii of hidden neurons.
+        :param class_ids: Vector of indexes of classes (into class_names) of hidden neurons.
+        :param class_names: Class names of output neurons.
+        :param use_spatial_index: As in RceNetwork.
+        :param metric: As in RceNetwork.
+        :return: RceNetwork - Network with the given hidden and output layer.
+        """
+        rce_network = cls(r_max, use_spatial_index, centers.shape[1], metric)
+        rce_network.output_layer = [OutputNeuron(class_name) for class_name in class_names]
+        rce_network._centers, rce_network._radii, rce_network._class_ids = centers, radii, class_ids
+        rce_network.hidden_layer = LazyHiddenLayer(rce_network, len(radii))
+        if rce_network.spatial_index is not None:
+            rce_network.spatial_index.insert_many(np.arange(len(radii)), centers)
+        return rce_network
+
+    @property
+    def dimensions(self) -> int:
+        """
+        Number of coordinates of centers of hidden neurons.
+        """
+        return self._centers.shape[1]
+
+    def set_dimensions(self, dimensions : int):
+        """
+        Sets the number of coordinates of points, only a network without hidden neurons can change it.
+        """
+        if len(self.hidden_layer) > 0:
+            raise ValueError("Network with hidden neurons has {} dimensions".format(self.dimensions))
+        self._centers = np.empty((len(self._radii), dimensions))
+        if self.spatial_index is not None:
+            self.spatial_index = self.create_spatial_index(dimensions)
+
+    @property
+    def centers(self) -> np.ndarray:
+        """
+        (H, d) matrix of the centers (weights) of hidden neurons.
+        """
+        return self._centers[:len(self.hidden_layer)]
+
+    @property
+    def radii(self) -> np.ndarray:
+        """
+        Vector of activation radii of hidden neurons.
+        """
+        return self._radii[:len(self.hidden_layer)]
+
+    @property
+    def class_ids(self) -> np.ndarray:
+        """
+        Vector of indexes of output neurons (in output_layer) assigned to hidden neurons.
+        """
+        return self._class_ids[:len(self.hidden_layer)]
+
+    def class_id(self, class_name) -> int:
+        """
+        Returns index of the output neuron for the given class or -1 if there is none.
+        """
+        for index, output_neuron in enumerate(self.output_layer):
+            if output_neuron.class_name == class_name:
+                return index
+        return -1
+
+    def candidate_neurons(self, point : Point) -> np.ndarray:
+        """
+        Tests the point against all hidden neurons in one vectorized operation. Comparable values of distances
+        to the centers (e.g. squared Euclidean distances) are compared with radii converted to the same values,
+        no square root is computed.
+
+        The comparison is widened by a tiny relative tolerance, so the result is a superset
+        of neurons whose hypersphere contains the point - it may contain neurons with the point
+        lying exactly on the boundary, which have to be confirmed with the exact distance.
+
+        :param point: Point to test.
+        :return: np.ndarray - Sorted indexes of candidate hidden neurons.
+        """
+        if self.spatial_index is None:
+            indexes = np.arange(len(self.hidden_layer))
+        else:
+            indexes = self.spatial_index.candidates(point.coordinates)
+        self.distance_evaluations += len(indexes)
+        values = self.metric.point_values(point.coordinates, self._centers[indexes])
+        return indexes[values <= self.metric.to_comparable(self._radii[indexes]) * (1 + 1e-9)]
+
+    def add_hidden_neuron(self, hidden_neuron : HiddenNeuron):
+        """
+        Appends a hidden neuron, which already has its output neuron assigned, to the hidden layer.
+
+        :param hidden_neuron: Hidden neuron to append.
+        """
+        size = len(self.hidden_layer)
+        if size == 0 and len(hidden_neuron.weights) != self.dimensions:
+            self.set_dimensions(len(hidden_neuron.weights))
+        if size == len(self._radii):
+            # Grow arrays geometrically so adding neurons is amortized O(1)
+            capacity = max(16, 2 * size)
+            self._centers = np.resize(self._centers, (capacity, self._centers.shape[1]))
+            self._radii = np.resize(self._radii, capacity)
+            self._class_ids = np.resize(self._class_ids, capacity)
+        self._centers[size] = hidden_neuron.weights
+        self._radii[size] = hidden_neuron.radius
+        self._class_ids[size] = self.output_layer.index(hidden_neuron.output_neuron)
+        self.hidden_layer.append(hidden_neuron)
+        if self.spatial_index is not None:
+            self.spatial_index.insert(size, hidden_neuron.weights)
+
+    def shrink_neuron(self, index : int, radius : float):
+        """
+        Sets a new activation radius of the hidden neuron.
+
+        :param index: Index of the hidden neuron in hidden_layer.
+        :param radius: New activation radius.
+        """
+        self.hidden_layer[index].radius = radius
+        self._radii[index] = radius
+
+    def add_new_neuron(self, training_point : Point, radius : float = None):
         """
         Adds a new hidden neuron to the network at the location of the given training point
-        with max radius. If an output neuron for the class of the training point already
+        with max radius (or the given radius). If an output neuron for the class of the training point already
         exists in the network, it is assigned to the new hidden neuron. If not, a new output neuron
         is created and added to the network and assigned to the new hidden neuron.
 
         :param training_point: The location of the new hidden neuron.
+        :param radius: Radius of the new hidden neuron, r_max by default.
         """
-        self.action = "Adding new hidden neuron at ({},{}) r = {}" .format(training_point.x, training_point.y, self.r_max)
-        new_hidden_neuron = HiddenNeuron([training_point.x, training_point.y], self.r_max)
+        radius = self.r_max if radius is None else radius
+        new_hidden_neuron = HiddenNeuron(list(training_point.coordinates), radius)
         self.modification = True
-        self.hidden_layer.append(new_hidden_neuron)
 
         # Check if an output neuron for the class of the training point already exists
         for output_neuron in self.output_layer:
             if output_neuron.class_name == training_point.class_name:
                 new_hidden_neuron.output_neuron = output_neuron
-                self.action += "; Output neuron already existed for class {}" .format(training_point.class_name)
+                self.add_hidden_neuron(new_hidden_neuron)
+                self.step_action = NeuronAdded(training_point, radius, False)
                 return
         
         # Output neuron for class does not exist, create a new one
         new_output_neuron = OutputNeuron(training_point.class_name)
         new_hidden_neuron.output_neuron = new_output_neuron
         self.output_layer.append(new_output_neuron)
-        self.action += "; Adding new output neuron {}" .format(new_output_neuron)
-        
+        self.add_hidden_neuron(new_hidden_neuron)
+        self.step_action = NeuronAdded(training_point, radius, True)
+
+    def classify(self, points, chunk_size : int = None, max_chunk_bytes : int = 32 * 1024 * 1024):
+        """
+        Classifies points with the network. Points are processed in chunks, every chunk is tested against
+        all hidden neurons (or all candidates from the spatial index for points of one grid cell) at once,
+        so memory stays bounded for any number of points.
+
+        A point is classified by the classes of hyperspheres which contain it. If there is exactly one such
+        class the result is UNIQUE, if there are more classes the result is AMBIGUOUS and the label is the
+        class of the nearest activated hidden neuron, if there is none the result is UNKNOWN and label is None.
+
+        :param points: (N, d) array (or sequence) of coordinates or iterable of Point.
+        :param chunk_size: Number of points classified at once. By default it is derived from max_chunk_bytes.
+        :param max_chunk_bytes: Approximate memory limit for all temporary (chunk, candidates) matrices.
+        :return: tuple (labels, results) - object array of class names and int8 array of UNIQUE/AMBIGUOUS/UNKNOWN.
+        :raises ValueError: If points do not have the same number of coordinates as hidden neurons.
+        """
+        class_ids, results = self.classify_ids(points, chunk_size, max_chunk_bytes)
+        labels = np.full(len(class_ids), None, dtype=object)
+        found = class_ids >= 0
+        labels[found] = np.array([output_neuron.class_name for output_neuron in self.output_layer], dtype=object)[class_ids[found]]
+        return labels, results
+
+    def classify_ids(self, points, chunk_size : int = None, max_chunk_bytes : int = 32 * 1024 * 1024):
+        """
+        Classifies points as classify, labels are indexes of output neurons (in output_layer) instead of class names.
+
+        :return: tuple (class_ids, results) - int64 array of indexes of output neurons (-1 for UNKNOWN) and int8 array
+            of UNIQUE/AMBIGUOUS/UNKNOWN.
+        """
+        dimensions = self._centers.shape[1]
+        if not isinstance(points, np.ndarray):
+            points = list(points)
+            if len(points) > 0 and isinstance(points[0], Point):
+                points = [point.coordinates for point in points]
+        coordinates = np.asarray(points, dtype=float)
+        if coordinates.size == 0:
+            coordinates = coordinates.reshape(0, dimensions)
+        elif coordinates.ndim == 1:
+            coordinates = coordinates.reshape(1, -1) # Single point
+        if coordinates.ndim != 2 or coordinates.shape[1] != dimensions:
+            raise ValueError("Expected points with {} coordinates, got array of shape {}".format(dimensions, coordinates.shape))
+        labels = np.full(len(coordinates), -1, dtype=np.int64)
+        results = np.full(len(coordinates), UNKNOWN, dtype=np.int8)
+        if len(coordinates) == 0 or len(self.hidden_layer) == 0:
+            return labels, results
+
+        if self.spatial_index is None:
+            groups = [(slice(None), np.arange(len(self.hidden_layer)))]
+        else:
+            groups = self.spatial_index.group_candidates(coordinates)
+
+        for point_indexes, neuron_indexes in groups:
+            group = coordinates[point_indexes]
+            if len(neuron_indexes) == 0:
+                continue
+            centers, class_ids = self._centers[neuron_indexes], self._class_ids[neuron_indexes]
+            thresholds = self.metric.to_comparable(self._radii[neuron_indexes])
+            # Columns of candidates belonging to every class present among them
+            class_columns = [np.flatnonzero(class_ids == class_id) for class_id in np.unique(class_ids)]
+            # Per (point, candidate) pair: float64 values of distances and differences, bool activations, its negation
+            # and a bool column copy when counting classes
+            group_chunk_size = chunk_size or max(1, max_chunk_bytes // (19 * len(neuron_indexes)))
+            group_labels = np.full(len(group), -1, dtype=np.int64)
+            group_results = np.full(len(group), UNKNOWN, dtype=np.int8)
+
+            for start in range(0, len(group), group_chunk_size):
+                chunk = group[start:start + group_chunk_size]
+                values = self.metric.pairwise(chunk, centers)
+                activated = values <= thresholds
+                activated_classes = np.zeros(len(chunk), dtype=np.int64)
+                for columns in class_columns:
+                    activated_classes += activated[:, columns].any(axis=1)
+
+                # Nearest activated hidden neuron decides the label (the only class for unique results)
+                np.putmask(values, ~activated, np.inf)
+                nearest_class = class_ids[np.argmin(values, axis=1)]
+                found = activated_classes > 0
+                group_labels[start:start + len(chunk)] = np.where(found, nearest_class, -1)
+                group_results[start:start + len(chunk)] = np.where(activated_classes > 1, AMBIGUOUS, np.where(found, UNIQUE, UNKNOWN))
+            labels[point_indexes] = group_labels
+            results[point_indexes] = group_results
+        return labels, results
@@ -1,116 +1,423 @@
-import copy
+import heapq
+from collections import namedtuple
+import numpy as np
 from rce.rce_network import HiddenNeuron, RceNetwork
+from rce.metrics import Euclidean, Metric
+from rce.distance_cache import DistanceCache
+from rce.training_trace import TrainingTrace, COMPARE, SHRINK, ADD_HIDDEN, ADD_OUTPUT, EPOCH_END
+from rce.step_description import Comparison, NetworkCreated, CONFLICT, HIT, NO_HIT
+from rce.training_stats import TrainingCounters, TrainingObserver, TrainingStats
 from data.point import Point
 
+# Work saved by training with worklist compared to full passes over the training dataset
+WorklistReport = namedtuple("WorklistReport", ["epochs", "skipped_epochs", "point_visits", "saved_point_visits",
+                                               "comparisons", "saved_comparisons"])
+
 class RceTrainer:
-    def __init__(self, r_max: int = 3):
+    def __init__(self, r_max: int = 3, keyframe_interval: int = 256, use_spatial_index: bool = True,
+                 distance_cache_bytes: int = None, metric: Metric = None):
         """
         Initialize RCE Trainer.
 
+        self.metric = metric
+            Distance of training points to centers of hidden neurons (see rce.metrics), Euclidean by default.
+
+        self.distance_cache_bytes = distance_cache_bytes
+            If set, distances between training points and nearby hidden neurons are cached across epochs
+            (self.distance_cache) using at most about this many bytes.
+
+        self.use_spatial_index = use_spatial_index
+            If True, trained networks look up hidden neurons near a training point in a grid instead of testing all of them.
+
+        self.keyframe_interval = keyframe_interval
+            Minimal number of training events between two full copies of the network in self.rce_networks.
+
         self.rce_network : RceNetwork = RceNetwork()
             Current RCE network.
 
-        self.rce_networks : list[RceNetwork] = []
-            List of all RCE networks created during training. Progression of training.
+        self.rce_networks : TrainingTrace = TrainingTrace()
+            All RCE networks created during training (progression of training). Indexable like a list,
+            networks are rebuilt on demand from a compact log of training events.
 
         self.training_done = False
             Flag indicating if training is done.
+
+        self.worklist_report : WorklistReport = None
+            Work saved by the last training with use_worklist=True.
+
+        self.stats : TrainingStats = None
+            Statistics of the last finished training (counters are in self.counters while training).
+
+        self.observers : list[TrainingObserver] = []
+            Observers notified about the progress of training, see add_observer.
         """
         self.r_max = r_max
-        self.rce_network : RceNetwork = RceNetwork(self.r_max)
-        self.rce_networks : list[RceNetwork] = []
+        self.keyframe_interval = keyframe_interval
+        self.use_spatial_index = use_spatial_index
+        self.distance_cache_bytes = distance_cache_bytes
+        self.distance_cache : DistanceCache = None
+        self.metric = metric if metric is not None else Euclidean()
+        self.rce_network : RceNetwork = RceNetwork(self.r_max, self.use_spatial_index, metric=self.metric)
+        self.rce_networks : TrainingTrace = TrainingTrace(self.keyframe_interval)
         self.training_done = False
+        self.worklist_report : WorklistReport = None
+        self.counters = TrainingCounters()
+        self.stats : TrainingStats = None
+        self.observers : list[TrainingObserver] = []
 
-    def Train(self, training_input: list[Point]):
+    def add_observer(self, observer : TrainingObserver):
+        """
+        Adds an observer, its methods are called at the start and end of training and of every epoch, around
+        the visit of every training point and at every change of the network. Without observers
+        the training only updates a few counters.
+        """
+        self.observers.append(observer)
+
+    def remove_observer(self, observer : TrainingObserver):
+        self.observers.remove(observer)
+
+    def Train(self, training_input: list[Point], record_trace: bool = True, use_worklist: bool = False):
         """
         Trains rce network. Saves all intermediate results in self.rce_networks.
 
         Args:
             training_input (list[Point]): List of training points.
+            record_trace (bool): If False, no intermediate results are saved (self.rce_networks stays
+                empty) and comments/actions are not built. The final network in self.rce_network
+                is the same as with record_trace=True.
+            use_worklist (bool): If True (requires record_trace=False), every epoch visits only training points which could be
+                affected by changes of the network since their last visit, see train_with_worklist.
+
+        Returns:
+            TrainingStats: Statistics of the training (also in self.stats), None for an empty dataset.
         """
+        if use_worklist and record_trace:
+            raise ValueError("Training with worklist does not visit all steps, it can not record trace")
         if len(training_input) == 0:
             print("RCE Network: Training dataset is empty!")
             return
         
-        self.set_initial_state_for_training()
+        self.set_initial_state_for_training(record_trace, training_input)
+        if use_worklist:
+            self.train_with_worklist(training_input)
+        else:
+            for _ in self.train_epochs(training_input, record_trace):
+                pass
+        return self.finish_training()
+
+    def iter_steps(self, training_input: list[Point]):
+        """
+        Trains rce network lazily, one recorded step at a time. Steps are saved in self.rce_networks
+        as they are produced, so the training can be inspected (and stepped back) while it is running.
+        Training is done (self.training_done) when the generator is exhausted.
 
+        Args:
+            training_input (list[Point]): List of training points.
+
+        Yields:
+            tuple (index, step, events) - index of the step in self.rce_networks, its state (TraceStep)
+            and events which changed the network since the previous step.
+        """
+        if len(training_input) == 0:
+            print("RCE Network: Training dataset is empty!")
+            return
+
+        self.set_initial_state_for_training(True, training_input)
+        yield self.rce_networks.last_change()
+        yield from self.train_epochs(training_input, True)
+        self.finish_training()
+
+    def finish_training(self) -> TrainingStats:
+        self.training_done = True
+        self.stats = self.counters.stats(self.rce_network)
+        for observer in self.observers:
+            observer.training_finished(self.stats)
+        return self.stats
+
+    def train_epochs(self, training_input: list[Point], record_trace: bool):
+        """
+        Runs training epochs until the network is not modified. Expects initialized state
+        (set_initial_state_for_training).
+
+        Yields:
+            Every recorded step as in iter_steps. Nothing is yielded when record_trace is False.
+        """
+        counters, observers = self.counters, self.observers
         # Set modification to True for first iteration
         self.rce_network.modification = True
         # Train until any modification occurs
         while self.rce_network.modification:
             self.rce_network.modification = False
+            counters.start_epoch()
+            for observer in observers:
+                observer.epoch_started(self.rce_network.iteration)
             # Go through all training vectors
             while self.rce_network.train_input_index < len(training_input):
                 self.rce_network.hit = False
                 # Go through all hidden neurons (hyperspheres) for current training vector
                 training_point : Point = training_input[self.rce_network.train_input_index]
-                self.rce_network.index_of_hidden_neuron = 0
-                self.rce_network.comment = ""
-                self.rce_network.action = ""
-                while self.rce_network.index_of_hidden_neuron < len(self.rce_network.hidden_layer):
-                    hidden_neuron : HiddenNeuron = self.rce_network.hidden_layer[self.rce_network.index_of_hidden_neuron]
-                    # Calculate distance between training point and hidden neuron
-                    distance = self.calculate_distance(training_point, hidden_neuron)
+                self.rce_network.step_comment = None
+                self.rce_network.step_action = None
+                if observers:
+                    for observer in observers:
+                        observer.point_started(self.rce_network.train_input_index)
+                activations = self.find_activations(training_point, self.rce_network.train_input_index)
+                counters.point_visits += 1
+                point_class_id = self.rce_network.class_id(training_point.class_name)
+                # Without trace only activated hidden neurons need to be visited, all other are "no hit"
+                neuron_indexes = range(len(self.rce_network.hidden_layer)) if record_trace else activations
+                for index in neuron_indexes:
+                    self.rce_network.index_of_hidden_neuron = index
+                    hidden_neuron : HiddenNeuron = self.rce_network.hidden_layer[index]
+                    distance = activations.get(index)
+                    if record_trace:
+                        self.rce_networks.record(COMPARE, self.rce_network.train_input_index, index)
 
                     # Check if training point is in hidden neuron
-                    if distance <= hidden_neuron.radius:
+                    if distance is not None:
                         # Check if training point class matches hidden neuron class
-                        if hidden_neuron.output_neuron.class_name == training_point.class_name:
+                        if self.rce_network.class_ids[index] == point_class_id:
                             # Classes match - hit = True => no need to create new hidden neuron
                             self.rce_network.hit = True
-                            self.rce_network.comment = "Comparing training point {} to hidden neuron {} - hit, class matches".format(training_point, hidden_neuron)
+                            if record_trace:
+                                self.rce_network.step_comment = Comparison(training_point, hidden_neuron.weights, hidden_neuron.radius,
+                                                                           hidden_neuron.output_neuron.class_name, HIT, None)
                         else:
                             # Classes don't match - modfiy hidden neuron activation radius
                             self.rce_network.modification = True
-                            self.rce_network.comment = "Comparing training point {} to hidden neuron {} - hit, class doesn't match".format(training_point, hidden_neuron)
-                            old_hidden_neuron = copy.deepcopy(hidden_neuron)
-                            hidden_neuron.radius = distance / 2
-                            self.rce_network.comment += " - updating hidden neuron to {}" .format(self.rce_network.hidden_layer[self.rce_network.index_of_hidden_neuron])
-                            self.rce_network.action = "Modifying hidden neuron {} to {}" .format(old_hidden_neuron, hidden_neuron)
-                    else:
-                        self.rce_network.comment = "Comparing training point {} to hidden neuron {} - no hit".format(training_point, hidden_neuron)
-                    # Make a copy of current training progress
-                    self.rce_networks.append(copy.deepcopy(self.rce_network))
-                    self.rce_network.index_of_hidden_neuron += 1
+                            old_radius = hidden_neuron.radius
+                            self.rce_network.shrink_neuron(index, distance / 2)
+                            counters.shrinks += 1
+                            for observer in observers:
+                                observer.neuron_shrunk(index, hidden_neuron.radius)
+                            if record_trace:
+                                self.rce_networks.record(SHRINK, index, hidden_neuron.radius)
+                                self.rce_network.step_comment = self.rce_network.step_action = Comparison(
+                                    training_point, hidden_neuron.weights, old_radius, hidden_neuron.output_neuron.class_name, CONFLICT, hidden_neuron.radius)
+                    elif record_trace:
+                        self.rce_network.step_comment = Comparison(training_point, hidden_neuron.weights, hidden_neuron.radius,
+                                                                   hidden_neuron.output_neuron.class_name, NO_HIT, None)
+                    # Save current training progress
+                    if record_trace:
+                        self.rce_networks.snapshot(self.rce_network)
+                        yield self.rce_networks.last_change()
+                self.rce_network.index_of_hidden_neuron = len(self.rce_network.hidden_layer)
+                counters.hits += self.rce_network.hit
                 
                 # No sufficient hidden neuron for training point => add new hidden neuron
                 if not self.rce_network.hit:
+                    output_layer_size = len(self.rce_network.output_layer)
                     self.rce_network.add_new_neuron(training_point)
                     self.rce_network.modification = True
-                    self.rce_network.comment = "No sufficient hidden neuron for training point {} - adding new hidden neuron".format(training_point)
-                    self.rce_networks.append(copy.deepcopy(self.rce_network))
+                    counters.neurons_added += 1
+                    for observer in observers:
+                        observer.neuron_added(len(self.rce_network.hidden_layer) - 1)
+                    if record_trace:
+                        self.rce_network.step_comment = self.rce_network.step_action
+                        if len(self.rce_network.output_layer) > output_layer_size:
+                            self.rce_networks.record(ADD_OUTPUT, training_point.class_name)
+                        new_hidden_neuron = self.rce_network.hidden_layer[-1]
+                        self.rce_networks.record(ADD_HIDDEN, new_hidden_neuron.weights, new_hidden_neuron.radius, training_point.class_name)
+                        self.rce_networks.snapshot(self.rce_network)
+                        yield self.rce_networks.last_change()
                 
+                if observers:
+                    for observer in observers:
+                        observer.point_finished(self.rce_network.train_input_index, activations, self.rce_network.hit)
                 self.rce_network.train_input_index += 1
             # Reset train_input_index for next iteration if any modification occured
             self.rce_network.train_input_index = 0
+            if record_trace:
+                self.rce_networks.record(EPOCH_END, self.rce_network.iteration)
+            elapsed = counters.finish_epoch()
+            for observer in observers:
+                observer.epoch_finished(self.rce_network.iteration, elapsed)
             self.rce_network.iteration += 1
 
-        self.training_done = True
-
-    def set_initial_state_for_training(self):
+    def set_initial_state_for_training(self, record_trace: bool = True, training_input: list[Point] = None):
         """
         Resets the state of the RCE Trainer for a new training session.
+
+        :param record_trace: If False, the initial network is not saved to self.rce_networks.
+        :param training_input: Training points, their number of coordinates is the dimension of the network.
+        :raises ValueError: If training points have different number of coordinates or the metric does not match them.
         """
+        dimensions = training_input[0].dimensions if training_input else 2
+        if training_input is not None and any(point.dimensions != dimensions for point in training_input):
+            raise ValueError("All training points must have {} coordinates".format(dimensions))
+        if training_input:
+            self.metric.check_dimensions(dimensions)
         self.rce_network.hidden_layer = []
         self.rce_network.output_layer = []
         self.rce_network.train_input_index = 0
         self.rce_network.index_of_hidden_neuron = 0
         self.rce_network.iteration = 1
-        self.rce_network : RceNetwork = RceNetwork(self.r_max)
-        self.rce_network.action = "No action - new network was created"
-        self.rce_networks : list[RceNetwork] = [copy.deepcopy(self.rce_network)]
+        self.rce_network : RceNetwork = RceNetwork(self.r_max, self.use_spatial_index, dimensions, self.metric)
+        self.rce_network.step_action = NetworkCreated()
+        self.rce_networks : TrainingTrace = TrainingTrace(self.keyframe_interval)
+        self.distance_cache = None
+        self.counters = TrainingCounters()
+        self.stats = None
+        if self.distance_cache_bytes and training_input is not None:
+            coordinates = np.array([point.coordinates for point in training_input], dtype=float)
+            self.distance_cache = DistanceCache(coordinates, self.distance_cache_bytes)
+        if record_trace:
+            self.rce_networks.snapshot(self.rce_network)
         self.training_done = False
+        for observer in self.observers:
+            observer.training_started(self)
+
+    def train_with_worklist(self, training_input: list[Point]):
+        """
+        Trains rce network with the same result (including the number of iterations) as full passes over
+        the training dataset, but every epoch visits only training points which could be affected by changes.
+
+        A visit of a training point changes the network only if the point is inside of a hypersphere of
+        another class or not inside of any hypersphere of its class. Right after its visit neither is true,
+        so the point has to be visited again only if a new hidden neuron of another class covers it or
+        a hidden neuron of its class which contained it shrinks. Such points are added to the worklist -
+        to the current epoch if they are after the changing point, otherwise to the next epoch.
+        Points are visited in the order of the dataset, so the changes happen in the same order as in full passes.
+
+        Saved work is stored in self.worklist_report. Comparisons are counted as in a linear scan (every visited
+        point against every existing hidden neuron), the spatial index and the exact candidate check are not taken
+        into account, so comparisons and saved_comparisons are comparable with full passes, not measured tests.
+
+        :param training_input: List of training points.
+        """
+        size = len(training_input)
+        coordinates = np.array([point.coordinates for point in training_input], dtype=float)
+        class_names = [point.class_name for point in training_input]
+        point_index = self.rce_network.create_spatial_index(coordinates.shape[1]) if self.r_max > 0 else None
+        if point_index is not None:
+            for index, point_coordinates in enumerate(coordinates.tolist()):
+                point_index.insert(index, point_coordinates)
+
+        def points_inside(center, radius, class_name, same_class):
+            # Conservative (slightly widened) test, an extra visit of a point never changes the result
+            indexes = np.arange(size) if point_index is None else point_index.candidates(center)
+            values = self.metric.point_values(center, coordinates[indexes])
+            inside = indexes[values <= self.metric.to_comparable(radius) * (1 + 1e-9)].tolist()
+            return [index for index in inside if (class_names[index] == class_name) == same_class]
+
+        epochs = skipped_epochs = point_visits = saved_point_visits = comparisons = saved_comparisons = 0
+        counters, observers = self.counters, self.observers
+        worklist = list(range(size))
+        queued = [True] * size
+        self.rce_network.modification = True
+        while self.rce_network.modification:
+            self.rce_network.modification = False
+            counters.start_epoch()
+            for observer in observers:
+                observer.epoch_started(self.rce_network.iteration)
+            next_worklist = []
+            epochs += 1
+            skipped_epochs += len(worklist) == 0
+            # Comparisons of a full pass: every point compared with all hidden neurons existing at its visit
+            full_pass_comparisons = size * len(self.rce_network.hidden_layer)
+            visited = 0
+            while worklist:
+                index = heapq.heappop(worklist)
+                queued[index] = False
+                visited += 1
+                comparisons += len(self.rce_network.hidden_layer)
+                training_point = training_input[index]
+                self.rce_network.train_input_index = index
+                self.rce_network.hit = False
+                changes = []
+                if observers:
+                    for observer in observers:
+                        observer.point_started(index)
+
+                activations = self.find_activations(training_point, index)
+                counters.point_visits += 1
+                point_class_id = self.rce_network.class_id(training_point.class_name)
+                for neuron_index, distance in activations.items():
+                    if self.rce_network.class_ids[neuron_index] == point_class_id:
+                        self.rce_network.hit = True
+                    else:
+                        hidden_neuron = self.rce_network.hidden_layer[neuron_index]
+                        changes.append((hidden_neuron.weights, hidden_neuron.radius, hidden_neuron.output_neuron.class_name, True))
+                        self.rce_network.modification = True
+                        self.rce_network.shrink_neuron(neuron_index, distance / 2)
+                        counters.shrinks += 1
+                        for observer in observers:
+                            observer.neuron_shrunk(neuron_index, hidden_neuron.radius)
+                self.rce_network.index_of_hidden_neuron = len(self.rce_network.hidden_layer)
+                counters.hits += self.rce_network.hit
+                if not self.rce_network.hit:
+                    self.rce_network.add_new_neuron(training_point)
+                    self.rce_network.modification = True
+                    changes.append((self.rce_network.hidden_layer[-1].weights, self.r_max, training_point.class_name, False))
+                    full_pass_comparisons += size - 1 - index
+                    counters.neurons_added += 1
+                    for observer in observers:
+                        observer.neuron_added(len(self.rce_network.hidden_layer) - 1)
+                if observers:
+                    for observer in observers:
+                        observer.point_finished(index, activations, self.rce_network.hit)
+
+                for center, radius, class_name, same_class in changes:
+                    for affected in points_inside(center, radius, class_name, same_class):
+                        if queued[affected]:
+                            continue
+                        queued[affected] = True
+                        if affected > index:
+                            heapq.heappush(worklist, affected)
+                        else:
+                            next_worklist.append(affected)
+
+            point_visits += visited
+            saved_point_visits += size - visited
+            saved_comparisons += full_pass_comparisons
+            worklist = next_worklist
+            heapq.heapify(worklist)
+            elapsed = counters.finish_epoch()
+            for observer in observers:
+                observer.epoch_finished(self.rce_network.iteration, elapsed)
+            self.rce_network.iteration += 1
+        saved_comparisons -= comparisons
+        self.rce_network.train_input_index = 0
+        self.worklist_report = WorklistReport(epochs, skipped_epochs, point_visits, saved_point_visits, comparisons, saved_comparisons)
+
+    def find_activations(self, point : Point, point_index : int = None) -> dict[int, float]:
+        """
+        Finds hidden neurons whose hypersphere contains the point (distance <= radius).
+
+        All hidden neurons are tested at once with the vectorized distance check of the network
+        (or with cached distances), the exact distance is calculated only for the few candidates
+        it returns. The result is the same as comparing calculate_distance with the radius for every
+        hidden neuron one by one.
+
+        :param point: Training point.
+        :param point_index: Index of the training point in the training dataset, used by the distance cache.
+        :return: dict[int, float] - Index of activated hidden neuron -> distance, ordered by index.
+        """
+        if self.distance_cache is not None and point_index is not None:
+            candidates = self.distance_cache.candidate_neurons(point_index, self.rce_network)
+        else:
+            candidates = self.rce_network.candidate_neurons(point)
+        self.counters.exact_distances += len(candidates)
+        activations = {}
+        for index in candidates.tolist():
+            hidden_neuron = self.rce_network.hidden_layer[index]
+            distance = self.calculate_distance(point, hidden_neuron)
+            if distance <= hidden_neuron.radius:
+                activations[index] = distance
+        return activations
 
     def calculate_distance(self, point : Point, hidden_neuron : HiddenNeuron) -> float:
         """
-        Calculates the Euclidean distance between a point and a hidden neuron.
+        Calculates the distance between a point and a hidden neuron in the metric of the trainer.
+
+        For the Euclidean metric squares are summed in the order of coordinates, for 2D points the result is exactly
+        sqrt(a^2 + b^2). Vectorized checks (RceNetwork.candidate_neurons) only preselect hidden neurons
+        for this exact distance, so their rounding never changes the result of training.
 
         :param point: Point whose distance to the hidden neuron is to be calculated.
         :param hidden_neuron: Hidden neuron whose distance to the point is to be calculated.
-        :return: float - The Euclidean distance between the point and the hidden neuron.
+        :return: float - The distance between the point and the hidden neuron.
         """
-        # sqrt(a^2 + b^2)
-        return ((point.x - hidden_neuron.weights[0]) ** 2 
-                + (point.y - hidden_neuron.weights[1]) ** 2) ** 0.5
+        return self.metric.distance(point.coordinates, hidden_neuron.weights)
 
     
\ No newline at end of file
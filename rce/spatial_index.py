@@ -0,0 +1,86 @@
+import itertools
+import math
+import numpy as np
+
+MAX_GRID_DIMENSIONS = 3 # Leading coordinates used by the grid, a cell has 3 ** dimensions neighbours
+
+class GridIndex():
+    def __init__(self, cell_size : float, dimensions : int = 2):
+        """
+        Initialize a uniform grid over centers of hidden neurons.
+
+        Cells are cubes with side cell_size. If no hidden neuron has radius larger than cell_size
+        (radius of hidden neurons is at most r_max and only shrinks), every hypersphere which contains
+        a point has its center in the cell of the point or in one of the neighbouring cells.
+        Shrinking of radii therefore never invalidates the index.
+
+        Points with more than MAX_GRID_DIMENSIONS coordinates are indexed only by the leading ones. The distance
+        in these coordinates is not larger than the full distance, so candidates are still a superset of
+        hyperspheres containing the point, they are just less selective.
+
+        :param cell_size: Side of a cell, must not be smaller than the largest radius (r_max).
+        :param dimensions: Number of coordinates of centers.
+        """
+        self.cell_size = cell_size
+        self.dimensions = dimensions
+        self.grid_dimensions = min(dimensions, MAX_GRID_DIMENSIONS)
+        self.cells : dict[tuple, list[int]] = {} # Cell coordinates -> indexes of hidden neurons
+        self.neighbour_offsets = list(itertools.product((-1, 0, 1), repeat=self.grid_dimensions))
+
+    def cell(self, coordinates) -> tuple:
+        """
+        Returns coordinates of the cell which contains the given point.
+        """
+        return tuple(math.floor(coordinates[i] / self.cell_size) for i in range(self.grid_dimensions))
+
+    def insert(self, index : int, center):
+        """
+        Adds hidden neuron with the given index and center to the index.
+        """
+        self.cells.setdefault(self.cell(center), []).append(index)
+
+    def insert_many(self, indexes : np.ndarray, centers : np.ndarray):
+        """
+        Adds hidden neurons with the given indexes and (N, d) array of centers to the index at once.
+        """
+        if len(indexes) == 0:
+            return
+        cells = np.floor(centers[:, :self.grid_dimensions] / self.cell_size).astype(np.int64)
+        unique_cells, inverse = np.unique(cells, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        boundaries = np.cumsum(np.bincount(inverse, minlength=len(unique_cells)))
+        start = 0
+        for cell, end in zip(unique_cells.tolist(), boundaries.tolist()):
+            self.cells.setdefault(tuple(cell), []).extend(np.asarray(indexes)[order[start:end]].tolist())
+            start = end
+
+    def candidates(self, coordinates) -> np.ndarray:
+        """
+        Returns sorted indexes of hidden neurons whose hypersphere can contain the given point.
+        """
+        return self._neighbourhood(self.cell(coordinates))
+
+    def group_candidates(self, coordinates : np.ndarray):
+        """
+        Groups points by their cell, so whole groups can be tested against the same candidates at once.
+
+        :param coordinates: (N, d) array of points.
+        :return: Generator of tuples (indexes of points, sorted indexes of candidate hidden neurons).
+        """
+        cells = np.floor(coordinates[:, :self.grid_dimensions] / self.cell_size).astype(np.int64)
+        unique_cells, inverse = np.unique(cells, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        boundaries = np.cumsum(np.bincount(inverse, minlength=len(unique_cells)))
+        start = 0
+        for cell, end in zip(unique_cells.tolist(), boundaries.tolist()):
+            yield order[start:end], self._neighbourhood(tuple(cell))
+            start = end
+
+    def _neighbourhood(self, cell : tuple) -> np.ndarray:
+        indexes = []
+        for offset in self.neighbour_offsets:
+            indexes.extend(self.cells.get(tuple(c + o for c, o in zip(cell, offset)), ()))
+        indexes.sort()
+        return np.array(indexes, dtype=np.int64)
@@ -0,0 +1,63 @@
+from collections import namedtuple
+from rce.hidden_neuron import HiddenNeuron
+from rce.output_neuron import OutputNeuron
+
+# Results of a comparison of a training point with a hidden neuron
+NO_HIT = "no_hit"
+HIT = "hit"               # Point is inside of a hypersphere of its class
+CONFLICT = "conflict"     # Point is inside of a hypersphere of another class, the hypersphere shrinks to new_radius
+
+# Structured descriptions of steps (RceNetwork.step_comment and step_action). Training stores only
+# these records, text is formatted by describe() when the step is shown.
+Comparison = namedtuple("Comparison", ["training_point", "weights", "radius", "class_name", "result", "new_radius"])
+NeuronAdded = namedtuple("NeuronAdded", ["training_point", "radius", "new_output_neuron"])
+NetworkCreated = namedtuple("NetworkCreated", [])
+
+def neuron_text(weights, radius, class_name) -> str:
+    hidden_neuron = HiddenNeuron(weights, radius)
+    hidden_neuron.output_neuron = OutputNeuron(class_name)
+    return str(hidden_neuron)
+
+def describe_comment(description) -> str:
+    """
+    Formats a description stored as a comment of a step.
+
+    :param description: Comparison, NeuronAdded, text or None.
+    :return: str - Text of the comment.
+    """
+    if description is None:
+        return ""
+    if isinstance(description, Comparison):
+        comment = "Comparing training point {} to hidden neuron {}".format(
+            description.training_point, neuron_text(description.weights, description.radius, description.class_name))
+        if description.result == NO_HIT:
+            return comment + " - no hit"
+        if description.result == HIT:
+            return comment + " - hit, class matches"
+        return comment + " - hit, class doesn't match - updating hidden neuron to {}".format(
+            neuron_text(description.weights, description.new_radius, description.class_name))
+    if isinstance(description, NeuronAdded):
+        return "No sufficient hidden neuron for training point {} - adding new hidden neuron".format(description.training_point)
+    return str(description)
+
+def describe_action(description) -> str:
+    """
+    Formats a description stored as an action of a step.
+
+    :param description: Comparison (with CONFLICT), NeuronAdded, NetworkCreated, text or None.
+    :return: str - Text of the action.
+    """
+    if description is None:
+        return ""
+    if isinstance(description, Comparison):
+        return "Modifying hidden neuron {} to {}".format(neuron_text(description.weights, description.radius, description.class_name),
+                                                         neuron_text(description.weights, description.new_radius, description.class_name))
+    if isinstance(description, NeuronAdded):
+        point = description.training_point
+        action = "Adding new hidden neuron at ({}) r = {}".format(",".join(f"{coordinate}" for coordinate in point.coordinates), description.radius)
+        if description.new_output_neuron:
+            return action + "; Adding new output neuron {}".format(OutputNeuron(point.class_name))
+        return action + "; Output neuron already existed for class {}".format(point.class_name)
+    if isinstance(description, NetworkCreated):
+        return "No action - new network was created"
+    return str(description)
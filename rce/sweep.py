@@ -0,0 +1,65 @@
+"""
+Parallel search of r_max. Every run trains one r_max value with one ordering of the training points
+in a process pool, the dataset is shared by all processes in shared memory (rce.evaluation.run_parallel).
+"""
+from collections import namedtuple
+import numpy as np
+from rce.evaluation import run_parallel, score, split_holdout, to_points
+from rce.metrics import Metric
+from rce.rce_trainer import RceTrainer
+
+# Result of one run of the sweep
+#   ordering - 0 for the order of the dataset, otherwise index of a seeded shuffle of the training points
+#   training_time - wall time of RceTrainer.Train in seconds
+#   accuracy - fraction of held-out points classified (uniquely) to their class, None without held-out points
+SweepResult = namedtuple("SweepResult", ["r_max", "ordering", "hidden_neurons", "epochs", "training_time", "accuracy"])
+
+def ordered(training_indexes : np.ndarray, ordering : int, seed : int) -> np.ndarray:
+    """
+    Returns training indexes in the given ordering, 0 keeps the order of the dataset.
+    """
+    if ordering == 0:
+        return training_indexes
+    return np.random.default_rng([seed, ordering]).permutation(training_indexes)
+
+def _run(dataset : tuple, task : tuple) -> SweepResult:
+    r_max, ordering, holdout, seed, use_spatial_index, metric = task
+    _, coordinates, codes, class_names = dataset
+    training_indexes, holdout_indexes = split_holdout(len(codes), holdout, seed)
+    training_indexes = ordered(training_indexes, ordering, seed)
+
+    rce_trainer = RceTrainer(r_max, use_spatial_index=use_spatial_index, metric=metric)
+    stats = rce_trainer.Train(to_points(coordinates, codes, class_names, training_indexes), record_trace=False)
+    accuracy, _, _ = score(rce_trainer.rce_network, coordinates[holdout_indexes], codes[holdout_indexes], class_names)
+    return SweepResult(r_max, ordering, len(rce_trainer.rce_network.hidden_layer), stats.epochs, stats.total_time, accuracy)
+
+def sweep(coordinates : np.ndarray, labels, r_max_values, orderings : int = 1, holdout : float = 0.2, seed : int = 0,
+          workers : int = None, use_spatial_index : bool = True, metric : Metric = None) -> list[SweepResult]:
+    """
+    Trains a network for every r_max value and ordering and evaluates it on held-out points.
+    All runs use the same split of the dataset (rce.evaluation.split_holdout). Results do not depend on the number of workers.
+
+    :param coordinates: (N, d) array of coordinates of the dataset.
+    :param labels: Class names of the points.
+    :param r_max_values: Values of r_max to train.
+    :param orderings: Number of orderings of training points per r_max, the first one is the order of the dataset.
+    :param holdout: Fraction of points held out for evaluation, 0 trains on all points.
+    :param seed: Seed of the split and of the orderings.
+    :param workers: Number of processes, None for the number of CPUs, 1 trains in the current process.
+    :param use_spatial_index: As in RceTrainer.
+    :param metric: As in RceTrainer.
+    :return: list[SweepResult] - Results ordered by r_max_values and orderings.
+    """
+    if len(coordinates) == 0:
+        return []
+    tasks = [(r_max, ordering, holdout, seed, use_spatial_index, metric) for r_max in r_max_values for ordering in range(orderings)]
+    return run_parallel(coordinates, labels, _run, tasks, workers)
+
+def smallest_model(results : list[SweepResult], min_accuracy : float = None, max_training_time : float = None) -> SweepResult:
+    """
+    Returns the run with the fewest hidden neurons (then the fastest one) which satisfies the limits, None if there is none.
+    """
+    candidates = [result for result in results
+                  if (min_accuracy is None or (result.accuracy is not None and result.accuracy >= min_accuracy))
+                  and (max_training_time is None or result.training_time <= max_training_time)]
+    return min(candidates, key=lambda result: (result.hidden_neurons, result.training_time), default=None)
@@ -0,0 +1,75 @@
+import time
+from collections import namedtuple
+
+# Statistics of one training, returned by RceTrainer.Train
+#   distance_evaluations - distances of (training point, hidden neuron) pairs evaluated, vectorized checks included
+#   point_visits - training points visited (compared with the network)
+#   hits - visits of training points inside of a hypersphere of their class
+#   shrinks - radius shrinks of hidden neurons
+#   neurons_added - hidden neurons added
+#   epoch_times - wall time of every epoch in seconds (including pauses between steps of RceTrainer.iter_steps)
+TrainingStats = namedtuple("TrainingStats", ["epochs", "distance_evaluations", "point_visits", "hits", "shrinks",
+                                             "neurons_added", "epoch_times", "total_time"])
+
+class TrainingObserver():
+    """
+    Base class of observers of training (RceTrainer.add_observer). All methods do nothing,
+    subclasses override the ones they need. Methods are called from the thread which trains.
+    """
+    def training_started(self, rce_trainer):
+        pass
+
+    def epoch_started(self, iteration : int):
+        pass
+
+    def point_started(self, train_input_index : int):
+        pass
+
+    def point_finished(self, train_input_index : int, activations : dict, hit : bool):
+        """
+        :param activations: Index of activated hidden neuron -> distance, before any change of the network by the point.
+        """
+        pass
+
+    def neuron_shrunk(self, index : int, radius : float):
+        pass
+
+    def neuron_added(self, index : int):
+        pass
+
+    def epoch_finished(self, iteration : int, elapsed : float):
+        pass
+
+    def training_finished(self, stats : TrainingStats):
+        pass
+
+class TrainingCounters():
+    __slots__ = ("point_visits", "hits", "shrinks", "neurons_added", "exact_distances", "epoch_times", "start_time", "epoch_start_time")
+
+    def __init__(self):
+        """
+        Counters updated during training, converted to TrainingStats by stats().
+        """
+        self.point_visits = 0
+        self.hits = 0
+        self.shrinks = 0
+        self.neurons_added = 0
+        self.exact_distances = 0
+        self.epoch_times = []
+        self.start_time = time.perf_counter()
+        self.epoch_start_time = self.start_time
+
+    def start_epoch(self):
+        self.epoch_start_time = time.perf_counter()
+
+    def finish_epoch(self) -> float:
+        elapsed = time.perf_counter() - self.epoch_start_time
+        self.epoch_times.append(elapsed)
+        return elapsed
+
+    def stats(self, rce_network) -> TrainingStats:
+        """
+        :param rce_network: Trained network, its distance_evaluations are added to the exact distances counted by the trainer.
+        """
+        return TrainingStats(len(self.epoch_times), rce_network.distance_evaluations + self.exact_distances, self.point_visits,
+                             self.hits, self.shrinks, self.neurons_added, list(self.epoch_times), time.perf_counter() - self.start_time)
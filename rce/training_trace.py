@@ -0,0 +1,156 @@
+import bisect
+import copy
+from collections import namedtuple
+from rce.rce_network import RceNetwork
+from rce.hidden_neuron import HiddenNeuron
+from rce.output_neuron import OutputNeuron
+
+# Types of events recorded during training
+COMPARE = "compare"         # (COMPARE, train_input_index, index_of_hidden_neuron)
+SHRINK = "shrink"           # (SHRINK, index_of_hidden_neuron, new_radius)
+ADD_HIDDEN = "add_hidden"   # (ADD_HIDDEN, weights, radius, class_name)
+ADD_OUTPUT = "add_output"   # (ADD_OUTPUT, class_name)
+EPOCH_END = "epoch_end"     # (EPOCH_END, iteration)
+
+# State of the network which is not stored in the layers, saved for every step
+TraceStep = namedtuple("TraceStep", ["event_end", "iteration", "train_input_index", "index_of_hidden_neuron",
+                                     "hit", "modification", "step_comment", "step_action"])
+
+class TrainingTrace:
+    def __init__(self, keyframe_interval: int = 256):
+        """
+        Initialize an empty training trace.
+
+        Training is recorded as a log of events (compare, shrink radius, add hidden neuron,
+        add output neuron, end of epoch). A step is a point in the log at which the state of
+        the network is observable (one former snapshot). Full copies of the network (keyframes)
+        are kept every keyframe_interval events, or more sparsely when the network has more
+        hidden neurons than that, so the memory used per recorded event does not depend on
+        the size of the network. Any step is rebuilt on demand from the nearest keyframe.
+
+        First steps of every epoch and of every training vector in an epoch are indexed
+        while recording, so jumping to them does not search the steps.
+
+        :param keyframe_interval: Minimal number of events between two keyframes.
+        """
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.events : list[tuple] = []
+        self.steps : list[TraceStep] = []
+        self.keyframe_steps : list[int] = []  # Sorted indexes of steps with keyframe
+        self.keyframes : list[RceNetwork] = []
+        self.epoch_steps : list[int] = []  # First step of every epoch (iteration)
+        self.training_vector_steps : dict[tuple, int] = {}  # (iteration, train_input_index) -> first step
+        self._cached_index = None  # Last rebuilt step, speeds up stepping forward
+        self._cached_network = None
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __getitem__(self, index):
+        """
+        Rebuilds the network at the given step. Every call returns a new network, networks returned by
+        different calls do not share any state. The trace continues from the last returned network when
+        stepping forward, so returned networks should be treated as read-only.
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("training trace index out of range")
+        return self._rebuild(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def record(self, event_type, *args):
+        """
+        Appends an event to the log. Events that modify the network must be recorded
+        after the modification was applied to the trained network.
+        """
+        self.events.append((event_type,) + args)
+
+    def snapshot(self, rce_network : RceNetwork):
+        """
+        Marks the current state of the trained network as a new step.
+
+        :param rce_network: Network that is being trained, state after all recorded events.
+        """
+        self.steps.append(TraceStep(len(self.events), rce_network.iteration, rce_network.train_input_index,
+                                    rce_network.index_of_hidden_neuron, rce_network.hit, rce_network.modification,
+                                    rce_network.step_comment, rce_network.step_action))
+        index = len(self.steps) - 1
+        while len(self.epoch_steps) <= rce_network.iteration:
+            self.epoch_steps.append(index)
+        self.training_vector_steps.setdefault((rce_network.iteration, rce_network.train_input_index), index)
+        last_keyframe_events = self.steps[self.keyframe_steps[-1]].event_end if self.keyframes else None
+        if (last_keyframe_events is None
+                or len(self.events) - last_keyframe_events >= max(self.keyframe_interval, len(rce_network.hidden_layer))):
+            self.keyframe_steps.append(len(self.steps) - 1)
+            self.keyframes.append(copy.deepcopy(rce_network))
+
+    def last_change(self) -> tuple:
+        """
+        Returns the last step with events recorded since the previous step.
+
+        :return: tuple (index, step, events).
+        """
+        index = len(self.steps) - 1
+        start = self.steps[index - 1].event_end if index > 0 else 0
+        return index, self.steps[index], self.events[start:self.steps[index].event_end]
+
+    def step(self, index : int) -> TraceStep:
+        """
+        Returns the state of the given step without rebuilding the network (cheap).
+        """
+        return self.steps[index]
+
+    def epoch_start(self, iteration : int):
+        """
+        Returns index of the first step of the given epoch (iteration) or None if it was not recorded (yet).
+        """
+        if 0 <= iteration < len(self.epoch_steps):
+            return self.epoch_steps[iteration]
+        return None
+
+    def training_vector_start(self, iteration : int, train_input_index : int):
+        """
+        Returns index of the first step of the given training vector in the given epoch
+        or None if it was not recorded (yet).
+        """
+        return self.training_vector_steps.get((iteration, train_input_index))
+
+    def _rebuild(self, index : int) -> RceNetwork:
+        keyframe_position = bisect.bisect_right(self.keyframe_steps, index) - 1
+        keyframe_index = self.keyframe_steps[keyframe_position]
+        # Exactly one copy per rebuild, either of the last rebuilt network or of the keyframe
+        if self._cached_index is not None and keyframe_index <= self._cached_index <= index:
+            start_index, rce_network = self._cached_index, copy.deepcopy(self._cached_network)
+        else:
+            start_index, rce_network = keyframe_index, copy.deepcopy(self.keyframes[keyframe_position])
+
+        for event in self.events[self.steps[start_index].event_end:self.steps[index].event_end]:
+            self._apply(rce_network, event)
+
+        step = self.steps[index]
+        rce_network.iteration = step.iteration
+        rce_network.train_input_index = step.train_input_index
+        rce_network.index_of_hidden_neuron = step.index_of_hidden_neuron
+        rce_network.hit = step.hit
+        rce_network.modification = step.modification
+        rce_network.step_comment = step.step_comment
+        rce_network.step_action = step.step_action
+        self._cached_index, self._cached_network = index, rce_network
+        return rce_network
+
+    def _apply(self, rce_network : RceNetwork, event : tuple):
+        event_type = event[0]
+        if event_type == SHRINK:
+            rce_network.shrink_neuron(event[1], event[2])
+        elif event_type == ADD_OUTPUT:
+            rce_network.output_layer.append(OutputNeuron(event[1]))
+        elif event_type == ADD_HIDDEN:
+            hidden_neuron = HiddenNeuron(list(event[1]), event[2])
+            hidden_neuron.output_neuron = rce_network.output_layer[rce_network.class_id(event[3])]
+            rce_network.add_hidden_neuron(hidden_neuron)
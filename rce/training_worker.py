@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import namedtuple
+from rce.rce_trainer import RceTrainer
+from data.point import Point
+
+# Progress of training reported by TrainingWorker
+TrainingProgress = namedtuple("TrainingProgress", ["iteration", "train_input_index", "hidden_neurons", "steps"])
+
+class TrainingWorker():
+    def __init__(self, rce_trainer : RceTrainer, training_input : list[Point] = None, training_steps = None,
+                 on_progress = None, on_preview = None, on_finished = None,
+                 progress_interval : float = 0.1, preview_interval : float = 0.5, lock = None):
+        """
+        Initialize a worker which trains rce network (with trace) in a background thread.
+
+        Callbacks are called from the worker thread:
+            on_progress(TrainingProgress) - every progress_interval seconds and when training ends.
+            on_preview(index, RceNetwork) - every preview_interval seconds with a copy of the latest step.
+            on_finished(cancelled) - when training ends or is cancelled.
+
+        :param rce_trainer: Trainer whose rce_networks are filled by the worker.
+        :param training_input: Training points, training starts from the beginning (rce_trainer.iter_steps).
+        :param training_steps: Already started iter_steps generator to continue instead of training_input.
+        :param lock: Lock held while a step is computed. Other threads must hold it while reading rce_trainer.rce_networks.
+        """
+        self.rce_trainer = rce_trainer
+        self.training_steps = training_steps if training_steps is not None else rce_trainer.iter_steps(training_input)
+        self.on_progress = on_progress
+        self.on_preview = on_preview
+        self.on_finished = on_finished
+        self.progress_interval = progress_interval
+        self.preview_interval = preview_interval
+        self.lock = lock if lock is not None else threading.RLock()
+        self.cancelled = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        """
+        Stops the training after the current step. Steps computed so far stay in rce_trainer.rce_networks.
+        """
+        self.cancelled = True
+
+    def join(self, timeout : float = None):
+        self.thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return self.thread.is_alive()
+
+    def progress(self) -> TrainingProgress:
+        with self.lock:
+            rce_network = self.rce_trainer.rce_network
+            return TrainingProgress(rce_network.iteration, rce_network.train_input_index,
+                                    len(rce_network.hidden_layer), len(self.rce_trainer.rce_networks))
+
+    def run(self):
+        last_progress = last_preview = time.monotonic()
+        while not self.cancelled:
+            with self.lock:
+                try:
+                    next(self.training_steps)
+                except StopIteration:
+                    break
+            now = time.monotonic()
+            if self.on_progress is not None and now - last_progress >= self.progress_interval:
+                last_progress = now
+                self.on_progress(self.progress())
+            if self.on_preview is not None and now - last_preview >= self.preview_interval:
+                last_preview = now
+                with self.lock:
+                    index = len(self.rce_trainer.rce_networks) - 1
+                    rce_network = self.rce_trainer.rce_networks[index]
+                self.on_preview(index, rce_network)
+
+        if self.on_progress is not None:
+            self.on_progress(self.progress())
+        if self.on_finished is not None:
+            self.on_finished(self.cancelled)
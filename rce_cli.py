@@ -0,0 +1,310 @@
+"""
+Command line interface for training and using RCE networks without GUI.
+Imports neither PyQt5 nor matplotlib, so it runs on headless servers.
+
+    python3 rce_cli.py train DATASET MODEL [--r-max R] [--one-shot] [--metric M] [--weights W [W ...]]
+    python3 rce_cli.py classify MODEL [INPUT] [--format csv|json|npz|npy] [--batch-size N] [--output FILE]
+    python3 rce_cli.py bench DATASET [--r-max R] [--queries N] [--metric M] [--weights W [W ...]]
+    python3 rce_cli.py evaluate DATASET [--r-max R] [--folds K | --holdout F] [--workers N] [--seed S] [--output FILE] [--metric M]
+    python3 rce_cli.py prune MODEL DATASET OUTPUT [--no-consolidate] [--queries N]
+    python3 rce_cli.py sweep DATASET --r-max-values R [R ...] [--orderings N] [--holdout F] [--workers N] [--output FILE] [--metric M]
+
+Metric of a trained model is saved in the model file, classify and prune use it.
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+from data.dataset_io import iter_json_points, load_dataset
+from data.point import dict_coordinates
+from rce.evaluation import cross_validate, holdout_evaluation, summarize
+from rce.metrics import METRICS, get_metric
+from rce.model_file import load_model, save_model
+from rce.rce_network import AMBIGUOUS, UNIQUE, UNKNOWN
+from rce.one_shot_trainer import OneShotTrainer
+from rce.pruning import prune, pruning_report
+from rce.rce_trainer import RceTrainer
+from rce.sweep import smallest_model, sweep
+
+RESULT_NAMES = {UNKNOWN: "unknown", UNIQUE: "unique", AMBIGUOUS: "ambiguous"}
+INPUT_FORMATS = ("csv", "json", "npz", "npy")
+
+def train(args):
+    training_data = load_dataset(args.dataset)
+    trainer_class = OneShotTrainer if args.one_shot else RceTrainer
+    rce_trainer = trainer_class(args.r_max, use_spatial_index=not args.no_spatial_index, metric=metric(args))
+    stats = rce_trainer.Train(training_data.points(), record_trace=False)
+    save_model(args.model, rce_trainer.rce_network)
+    print("training points: {}".format(len(training_data)), file=sys.stderr)
+    print("hidden neurons: {}".format(len(rce_trainer.rce_network.hidden_layer)), file=sys.stderr)
+    if stats is not None:
+        print_stats(stats, sys.stderr)
+
+def print_stats(stats, file):
+    print("epochs: {}".format(stats.epochs), file=file)
+    print("point visits: {}, hits: {}, shrinks: {}, neurons added: {}".format(
+        stats.point_visits, stats.hits, stats.shrinks, stats.neurons_added), file=file)
+    print("distance evaluations: {}".format(stats.distance_evaluations), file=file)
+    print("epoch times: {}".format(" ".join("{:.3f}".format(epoch_time) for epoch_time in stats.epoch_times)), file=file)
+    print("training time: {:.3f} s".format(stats.total_time), file=file)
+
+def metric(args):
+    return get_metric(args.metric, args.weights)
+
+def read_batches(input_name : str, input_format : str, batch_size : int, dimensions : int = 2):
+    """
+    Reads points to classify in batches.
+
+    :param input_name: Path to the input file or - for stdin.
+    :param input_format: One of INPUT_FORMATS.
+    :param batch_size: Number of points in a batch.
+    :param dimensions: Number of coordinates, CSV columns after them are ignored.
+    :return: Generator of (N, d) float arrays.
+    """
+    if input_format in ("npz", "npy"):
+        # NumPy files need random access, stdin is read whole, .npy file is memory mapped
+        source = io.BytesIO(sys.stdin.buffer.read()) if input_name == "-" else input_name
+        if input_format == "npz":
+            with np.load(source, allow_pickle=False) as archive:
+                coordinates = archive["coordinates"]
+        else:
+            coordinates = np.load(source, mmap_mode=None if input_name == "-" else 'r', allow_pickle=False)
+        for start in range(0, len(coordinates), batch_size):
+            yield np.asarray(coordinates[start:start + batch_size], dtype=float)
+        return
+
+    if input_name == "-":
+        yield from read_text_batches(io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8"), input_format, batch_size, dimensions)
+    else:
+        with open(input_name, 'r', encoding="utf-8") as text:
+            yield from read_text_batches(text, input_format, batch_size, dimensions)
+
+def read_text_batches(text, input_format : str, batch_size : int, dimensions : int = 2):
+    """
+    Reads points from JSON array of points or from CSV lines x,y[,...] (first dimensions columns) with an optional header.
+    """
+    if input_format == "json":
+        points = iter_json_points(text)
+        while batch := list(itertools.islice(points, batch_size)):
+            yield np.array([dict_coordinates(point) for point in batch], dtype=float)
+        return
+
+    lines = (line for line in text if line.strip())
+    first_line = next(lines, None)
+    if first_line is None:
+        return
+    try:
+        float(first_line.split(",")[0])
+        lines = itertools.chain([first_line], lines)
+    except ValueError:
+        pass # Header
+    while batch := list(itertools.islice(lines, batch_size)):
+        yield np.loadtxt(batch, delimiter=",", usecols=range(dimensions), ndmin=2)
+
+def coordinate_columns(dimensions : int) -> list[str]:
+    """
+    Names of coordinate columns of CSV output - x,y for 2D, otherwise x0,x1,...
+    """
+    return ["x", "y"] if dimensions == 2 else ["x{}".format(i) for i in range(dimensions)]
+
+def classify(args):
+    rce_network = load_model(args.model)
+    input_format = args.format
+    if input_format is None:
+        extension = os.path.splitext(args.input)[1].lower().lstrip(".")
+        input_format = extension if extension in INPUT_FORMATS else "csv"
+    output_file = sys.stdout if args.output == "-" else open(args.output, 'w')
+    try:
+        output_file.write(",".join(coordinate_columns(rce_network.dimensions) + ["class_name", "result"]) + "\n")
+        count = 0
+        start = time.perf_counter()
+        for coordinates in read_batches(args.input, input_format, args.batch_size, rce_network.dimensions):
+            labels, results = rce_network.classify(coordinates)
+            output_file.writelines("{},{},{}\n".format(",".join(map(str, point)), "" if label is None else label, RESULT_NAMES[result])
+                                   for point, label, result in zip(coordinates.tolist(), labels.tolist(), results.tolist()))
+            count += len(coordinates)
+        elapsed = time.perf_counter() - start
+        print("classified points: {} in {:.3f} s".format(count, elapsed), file=sys.stderr)
+    finally:
+        if output_file is not sys.stdout:
+            output_file.close()
+
+def bench(args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    training_data = load_dataset(args.dataset)
+    load_time = time.perf_counter() - start
+    _, load_peak = tracemalloc.get_traced_memory()
+
+    tracemalloc.reset_peak()
+    rce_trainer = RceTrainer(args.r_max, use_spatial_index=not args.no_spatial_index, metric=metric(args))
+    start = time.perf_counter()
+    stats = rce_trainer.Train(training_data.points(), record_trace=False)
+    training_time = time.perf_counter() - start
+    _, training_peak = tracemalloc.get_traced_memory()
+    rce_network = rce_trainer.rce_network
+
+    coordinates = training_data.coordinates
+    queries = np.random.default_rng(args.seed).uniform(coordinates.min(axis=0), coordinates.max(axis=0), (args.queries, coordinates.shape[1]))
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    rce_network.classify(queries)
+    classification_time = time.perf_counter() - start
+    _, classification_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print("training points: {}".format(len(training_data)))
+    print("load time: {:.3f} s, peak memory {:.1f} MiB".format(load_time, load_peak / 2**20))
+    print("epochs: {}".format(rce_network.iteration))
+    print("hidden neurons: {}".format(len(rce_network.hidden_layer)))
+    print("training time: {:.3f} s, peak memory {:.1f} MiB".format(training_time, training_peak / 2**20))
+    if stats is not None:
+        print("distance evaluations: {}, shrinks: {}".format(stats.distance_evaluations, stats.shrinks))
+    print("classification of {} points: {:.3f} s ({:.0f} points/s), peak memory {:.1f} MiB".format(
+        args.queries, classification_time, args.queries / classification_time if classification_time > 0 else float("inf"),
+        classification_peak / 2**20))
+
+def prune_model(args):
+    rce_network = load_model(args.model, memory_map=False)
+    coordinates = load_dataset(args.dataset).coordinates
+    if len(coordinates) > 0 and coordinates.shape[1] != rce_network.dimensions:
+        raise ValueError("Dataset has {} dimensions, model has {}".format(coordinates.shape[1], rce_network.dimensions))
+    start = time.perf_counter()
+    pruned = prune(rce_network, coordinates, consolidate=not args.no_consolidate)
+    pruning_time = time.perf_counter() - start
+    save_model(args.output, pruned)
+
+    queries = np.random.default_rng(args.seed).uniform(coordinates.min(axis=0), coordinates.max(axis=0),
+                                                       (args.queries, coordinates.shape[1])) if len(coordinates) > 0 else coordinates
+    report = pruning_report(rce_network, pruned, queries)
+    print("hidden neurons: {} -> {} ({} removed)".format(report.neurons_before, report.neurons_after,
+                                                         report.neurons_before - report.neurons_after))
+    print("pruning time: {:.3f} s".format(pruning_time))
+    print("classification of {} points: {:.3f} s -> {:.3f} s (speedup {})".format(
+        report.queries, report.inference_time_before, report.inference_time_after,
+        "-" if report.speedup is None else "{:.2f}x".format(report.speedup)))
+
+def evaluate(args):
+    training_data = load_dataset(args.dataset)
+    if args.holdout is not None:
+        results = [holdout_evaluation(training_data, args.r_max, args.holdout, args.seed, not args.no_spatial_index, metric(args))]
+    else:
+        results = cross_validate(training_data, args.r_max, args.folds, args.seed, args.workers, not args.no_spatial_index,
+                                 metric(args))
+    summary = summarize(results)
+
+    print("{:>5} {:>8} {:>8} {:>8} {:>7} {:>10} {:>10} {:>9} {:>9} {:>9}".format(
+        "fold", "train", "test", "neurons", "epochs", "train", "classify", "accuracy", "ambiguous", "unknown"))
+    for result in results:
+        print("{:>5} {:>8} {:>8} {:>8} {:>7} {:>9.3f}s {:>9.3f}s {:>9} {:>9} {:>9}".format(
+            result.fold, result.training_points, result.test_points, result.hidden_neurons, result.epochs, result.training_time,
+            result.classification_time, fraction(result.accuracy), fraction(result.ambiguous_rate), fraction(result.unknown_rate)))
+    print("accuracy: {} (std {}), ambiguous: {}, unknown: {}".format(
+        fraction(summary.accuracy), fraction(summary.accuracy_std), fraction(summary.ambiguous_rate), fraction(summary.unknown_rate)))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"summary": summary._asdict(), "folds": [result._asdict() for result in results]}, f, indent=2)
+
+def fraction(value) -> str:
+    # Fractions of test points are None without test points
+    return "-" if value is None else "{:.4f}".format(value)
+
+def sweep_r_max(args):
+    training_data = load_dataset(args.dataset)
+    r_max_values = args.r_max_values
+    if args.r_max_range is not None:
+        start, stop, count = args.r_max_range
+        r_max_values = np.linspace(start, stop, int(count)).tolist()
+    results = sweep(training_data.coordinates, training_data.class_names, r_max_values, args.orderings, args.holdout,
+                    args.seed, args.workers, not args.no_spatial_index, metric(args))
+
+    print("{:>8} {:>8} {:>8} {:>7} {:>10} {:>9}".format("r_max", "ordering", "neurons", "epochs", "time", "accuracy"))
+    for result in results:
+        print("{:>8.4g} {:>8} {:>8} {:>7} {:>9.3f}s {:>9}".format(
+            result.r_max, result.ordering, result.hidden_neurons, result.epochs, result.training_time,
+            "-" if result.accuracy is None else "{:.4f}".format(result.accuracy)))
+    best = smallest_model(results, args.min_accuracy, args.max_time)
+    if best is not None:
+        print("smallest model: r_max {:.4g} ({} hidden neurons)".format(best.r_max, best.hidden_neurons))
+    else:
+        print("no model satisfies the limits")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump([result._asdict() for result in results], f, indent=2)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Trains and uses RCE networks without GUI.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = subparsers.add_parser("train", help="Trains a dataset (.json or .npz) into a model file.")
+    train_parser.add_argument("dataset")
+    train_parser.add_argument("model")
+    train_parser.add_argument("--one-shot", action="store_true", help="Radii of new neurons from the nearest point of another class, one pass.")
+    train_parser.set_defaults(function=train)
+
+    classify_parser = subparsers.add_parser("classify", help="Classifies points from a file or stdin, writes CSV.")
+    classify_parser.add_argument("model")
+    classify_parser.add_argument("input", nargs="?", default="-", help="File with points, - for stdin (default).")
+    classify_parser.add_argument("--format", choices=INPUT_FORMATS, help="Format of input, by default from the extension (csv for stdin).")
+    classify_parser.add_argument("--batch-size", type=int, default=65536)
+    classify_parser.add_argument("--output", default="-", help="Output CSV file, - for stdout (default).")
+    classify_parser.set_defaults(function=classify)
+
+    bench_parser = subparsers.add_parser("bench", help="Prints time and memory of loading, training and classification.")
+    bench_parser.add_argument("dataset")
+    bench_parser.add_argument("--queries", type=int, default=100_000)
+    bench_parser.add_argument("--seed", type=int, default=0)
+    bench_parser.set_defaults(function=bench)
+
+    evaluate_parser = subparsers.add_parser("evaluate", help="K-fold cross-validation or holdout evaluation of training.")
+    evaluate_parser.add_argument("dataset")
+    split = evaluate_parser.add_mutually_exclusive_group()
+    split.add_argument("--folds", type=int, default=5)
+    split.add_argument("--holdout", type=float, help="Fraction of held-out points, evaluates one split instead of folds.")
+    evaluate_parser.add_argument("--workers", type=int, help="Number of processes, by default the number of CPUs.")
+    evaluate_parser.add_argument("--seed", type=int, default=0)
+    evaluate_parser.add_argument("--output", help="JSON file for results.")
+    evaluate_parser.set_defaults(function=evaluate)
+
+    prune_parser = subparsers.add_parser("prune", help="Removes hidden neurons which are not needed to classify the dataset.")
+    prune_parser.add_argument("model")
+    prune_parser.add_argument("dataset", help="Points whose classification must not change, usually the training dataset.")
+    prune_parser.add_argument("output", help="Model file for the pruned network.")
+    prune_parser.add_argument("--no-consolidate", action="store_true", help="Only remove neurons, do not grow radii first.")
+    prune_parser.add_argument("--queries", type=int, default=100_000, help="Random points classified to measure the speedup.")
+    prune_parser.add_argument("--seed", type=int, default=0)
+    prune_parser.set_defaults(function=prune_model)
+
+    sweep_parser = subparsers.add_parser("sweep", help="Trains many values of r_max in parallel and evaluates them on held-out points.")
+    sweep_parser.add_argument("dataset")
+    values = sweep_parser.add_mutually_exclusive_group(required=True)
+    values.add_argument("--r-max-values", type=float, nargs="+")
+    values.add_argument("--r-max-range", type=float, nargs=3, metavar=("START", "STOP", "COUNT"))
+    sweep_parser.add_argument("--orderings", type=int, default=1, help="Shuffled orderings of training points per r_max (first is the dataset order).")
+    sweep_parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of points held out for accuracy.")
+    sweep_parser.add_argument("--workers", type=int, help="Number of processes, by default the number of CPUs.")
+    sweep_parser.add_argument("--seed", type=int, default=0)
+    sweep_parser.add_argument("--min-accuracy", type=float, help="Required accuracy of the reported smallest model.")
+    sweep_parser.add_argument("--max-time", type=float, help="Maximal training time (s) of the reported smallest model.")
+    sweep_parser.add_argument("--output", help="JSON file for results.")
+    sweep_parser.set_defaults(function=sweep_r_max)
+
+    for subparser in (train_parser, bench_parser, evaluate_parser):
+        subparser.add_argument("--r-max", type=float, default=3)
+    for subparser in (train_parser, bench_parser, evaluate_parser, sweep_parser):
+        subparser.add_argument("--no-spatial-index", action="store_true")
+        subparser.add_argument("--metric", choices=METRICS, default="euclidean", help="Distance of points to hidden neurons.")
+        subparser.add_argument("--weights", type=float, nargs="+", help="Weights of coordinates of weighted_euclidean.")
+    return parser
+
+def main(argv : list[str] = None):
+    args = build_parser().parse_args(argv)
+    args.function(args)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import json
 import os
+import sys
 from data.input_data import InputData
 from rce.rce_trainer import RceTrainer
 
@@ -11,7 +12,8 @@ def load_test_data(file_name):
 
 def main():
     script_dir = os.path.dirname(__file__)
-    training_data :InputData = load_test_data(script_dir + '/test_data_4_v4.json')
+    file_name = sys.argv[1] if len(sys.argv) > 1 else script_dir + '/test_files/Real.json'
+    training_data :InputData = load_test_data(file_name)
 
     rce_trainer = RceTrainer()
 
@@ -0,0 +1,40 @@
+"""
+Test files and helpers shared by test modules, so that test modules do not import each other.
+"""
+import glob
+import json
+import os
+
+from data.point import Point
+
+TEST_FILES_DIR = os.path.join(os.path.dirname(__file__), "..", "test_files")
+TEST_FILES = sorted(glob.glob(os.path.join(TEST_FILES_DIR, "*.json")))
+REAL_FILE = os.path.join(TEST_FILES_DIR, "Real.json")
+
+
+def load_points(file_name):
+    """
+    Loads training points from a test file. Rows with coordinates that are not numbers are skipped,
+    duplicated points are kept, so that also the bad input files can be used for training.
+    """
+    with open(file_name, 'r') as f:
+        parsed_data = json.loads(f.read())
+    points = []
+    for point in parsed_data:
+        try:
+            points.append(Point(float(point['x']), float(point['y']), point['class_name']))
+        except ValueError:
+            continue
+    return points
+
+
+def layers(rce_network):
+    hidden = [(neuron.weights, neuron.radius, neuron.output_neuron.class_name) for neuron in rce_network.hidden_layer]
+    output = [neuron.class_name for neuron in rce_network.output_layer]
+    return hidden, output
+
+
+def state(rce_network):
+    return (layers(rce_network), rce_network.iteration, rce_network.train_input_index,
+            rce_network.index_of_hidden_neuron, rce_network.hit, rce_network.modification,
+            rce_network.comment, rce_network.action)
@@ -0,0 +1,74 @@
+import io
+import json
+import os
+
+import numpy as np
+import pytest
+
+from data.dataset_io import iter_json_points, load_dataset, save_dataset
+from data.input_data import InputData
+from data.json_serializer import JsonSerializer
+from data.my_exceptions import AlreadyExists
+from data.point import Point
+from helpers import TEST_FILES
+
+VALID_FILES = [file_name for file_name in TEST_FILES if "bad_input" not in file_name]
+
+
+@pytest.mark.parametrize("file_name", TEST_FILES, ids=os.path.basename)
+@pytest.mark.parametrize("read_size", [1, 5, 1 << 20])
+def test_streaming_parser_matches_json(file_name, read_size):
+    with open(file_name, 'r') as f:
+        expected = json.loads(f.read())
+    with open(file_name, 'r') as f:
+        assert list(iter_json_points(f, read_size)) == expected
+
+
+@pytest.mark.parametrize("text", ["", "[", '[{"x": 1}', '{"x": 1}', "[1, 2]", '[{"x": 1}} ]'])
+def test_streaming_parser_rejects_invalid_files(text):
+    with pytest.raises(ValueError):
+        list(iter_json_points(io.StringIO(text), 2))
+
+
+@pytest.mark.parametrize("file_name", VALID_FILES, ids=os.path.basename)
+@pytest.mark.parametrize("extension", [".json", ".npz"])
+def test_save_and_load_round_trip(file_name, extension, tmp_path):
+    with open(file_name, 'r') as f:
+        expected = InputData(json.loads(f.read()))
+    assert np.array_equal(load_dataset(file_name).coordinates, expected.coordinates)
+
+    saved_file = str(tmp_path / ("dataset" + extension))
+    save_dataset(saved_file, expected)
+    loaded = load_dataset(saved_file)
+    assert np.array_equal(loaded.coordinates, expected.coordinates)
+    assert list(loaded.class_names) == list(expected.class_names)
+
+
+def test_load_reports_duplicates(tmp_path):
+    saved_file = str(tmp_path / "dataset.json")
+    with open(saved_file, 'w') as f:
+        json.dump([{"x": 1, "y": 1, "class_name": "Red"}] * 3, f)
+    with pytest.raises(AlreadyExists) as error:
+        load_dataset(saved_file)
+    assert len(error.value.duplicates) == 2
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 4096])
+def test_json_serializer_write_matches_serialize(chunk_size):
+    points = [Point(1.0, 2.0, "Red"), Point(3.5, 4, "Blue"), Point(-1.0, 0.5, "Green")]
+    for items in (points, points[:1], []):
+        output = io.StringIO()
+        JsonSerializer().write(items, output, chunk_size)
+        assert output.getvalue() == JsonSerializer().serialize(items)
+
+
+@pytest.mark.parametrize("extension", [".json", ".npz"])
+def test_n_dimensional_round_trip(extension, tmp_path):
+    coordinates = np.random.default_rng(0).normal(size=(50, 6))
+    input_data = InputData.from_coordinates(coordinates, ["Red", "Blue"] * 25)
+    saved_file = str(tmp_path / ("dataset" + extension))
+    save_dataset(saved_file, input_data)
+
+    loaded = load_dataset(saved_file)
+    assert np.array_equal(loaded.coordinates, coordinates)
+    assert list(loaded.class_names) == list(input_data.class_names)
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from benchmarks.datasets import CLASS_NAMES, SHAPES, generate, to_points
+
+
+@pytest.mark.parametrize("shape", list(SHAPES))
+@pytest.mark.parametrize("dimensions", [2, 3, 5])
+def test_generated_datasets(shape, dimensions):
+    coordinates, labels = generate(shape, 1000, dimensions, seed=1)
+    assert coordinates.ndim == 2 and coordinates.shape[1] == dimensions
+    assert 950 <= len(coordinates) <= 1000
+    assert len(labels) == len(coordinates)
+    assert set(labels) <= set(CLASS_NAMES) and len(set(labels)) >= 3
+    assert len(np.unique(coordinates, axis=0)) == len(coordinates)
+
+    same_coordinates, same_labels = generate(shape, 1000, dimensions, seed=1)
+    assert np.array_equal(coordinates, same_coordinates) and labels == same_labels
+    other_coordinates, _ = generate(shape, 1000, dimensions, seed=2)
+    assert not np.array_equal(coordinates[:10], other_coordinates[:10])
+
+
+def test_to_points():
+    coordinates, labels = generate("real", 50)
+    points = to_points(coordinates, labels)
+    assert [(point.x, point.y, point.class_name) for point in points] == [(x, y, label) for (x, y), label in zip(coordinates.tolist(), labels)]
@@ -0,0 +1,62 @@
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from data.point import Point
+from gui.decision_regions import DecisionRegions
+from gui.network_renderer import NetworkRenderer
+from rce.rce_network import AMBIGUOUS, RceNetwork
+from rce.rce_trainer import RceTrainer
+from helpers import REAL_FILE, load_points
+
+LIMITS = (-0.5, 9.5, -0.5, 9.5)
+
+
+def test_regions_match_classification():
+    rce_network = RceNetwork(3)
+    for x, y, class_name in [(2, 2, "Red"), (4, 2, "Green"), (8, 8, "not a color")]:
+        rce_network.add_new_neuron(Point(x, y, class_name), 1.5)
+    regions = DecisionRegions(LIMITS, (40, 50))
+    assert regions.update(rce_network)
+
+    grid_x, grid_y = np.meshgrid(regions.x, regions.y)
+    class_ids, results = rce_network.classify_ids(np.column_stack((grid_x.ravel(), grid_y.ravel())))
+    expected = regions.colors[class_ids + 1]
+    expected[results == AMBIGUOUS] = np.round(np.array(regions.ambiguous_color) * 255)
+    assert np.array_equal(regions.image, expected.reshape(40, 50, 4))
+    assert (results == AMBIGUOUS).any() and (regions.image[..., 3] == 0).any()
+    assert not regions.update(rce_network) and regions.classified_pixels == 40 * 50
+
+
+def test_stepping_updates_only_changed_pixels():
+    rce_trainer = RceTrainer(3)
+    rce_trainer.Train(load_points(REAL_FILE))
+    trace = rce_trainer.rce_networks
+    regions = DecisionRegions(LIMITS, (60, 60))
+    # Forward through every step, then jumps backward and forward
+    for index in list(range(len(trace))) + [0, len(trace) - 1, len(trace) // 2, 1]:
+        rce_network = trace[index]
+        regions.update(rce_network)
+        full = DecisionRegions(LIMITS, (60, 60))
+        full.update(rce_network)
+        assert np.array_equal(regions.image, full.image)
+    assert regions.classified_pixels < len(trace) * 60 * 60 / 4
+
+
+def test_renderer_draws_regions():
+    figure = Figure(figsize=(4, 4), dpi=50)
+    ax = figure.add_subplot()
+    canvas = FigureCanvasAgg(figure)
+    rce_trainer = RceTrainer(3)
+    points = load_points(REAL_FILE)
+    rce_trainer.Train(points, record_trace=False)
+
+    renderer = NetworkRenderer(canvas, ax, show_regions=True)
+    renderer.set_training_data(np.array([point.coordinates for point in points]), [point.class_name for point in points], LIMITS)
+    renderer.update(rce_trainer.rce_network)
+    assert renderer.regions.shape == renderer.regions_shape()
+    assert renderer.regions_image.get_array().shape == renderer.regions.shape + (4,)
+    assert renderer.points.get_animated()
+
+    renderer.set_show_regions(False)
+    assert not renderer.points.get_animated() and not renderer.regions_image.get_visible()
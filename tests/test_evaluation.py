@@ -0,0 +1,85 @@
+import json
+
+import numpy as np
+import pytest
+
+import rce_cli
+from benchmarks.datasets import generate
+from data.input_data import InputData
+from data.point import Point
+from rce.evaluation import cross_validate, holdout_evaluation, score, split_folds, summarize
+from rce.rce_network import RceNetwork
+from helpers import REAL_FILE
+
+
+def dataset(size=240, seed=2):
+    coordinates, labels = generate("clustered", size, seed=seed)
+    return InputData.from_arrays(coordinates[:, 0], coordinates[:, 1], labels)
+
+
+def test_folds_partition_dataset():
+    test_sets = [split_folds(103, 5, 7, fold)[1] for fold in range(5)]
+    assert sorted(np.concatenate(test_sets).tolist()) == list(range(103))
+    assert {len(test_indexes) for test_indexes in test_sets} == {20, 21}
+    training_indexes, test_indexes = split_folds(103, 5, 7, 2)
+    assert len(np.intersect1d(training_indexes, test_indexes)) == 0 and len(training_indexes) + len(test_indexes) == 103
+
+
+def test_cross_validation_is_deterministic_and_parallel():
+    input_data = dataset()
+    in_process = cross_validate(input_data, 1.5, folds=4, seed=1, workers=1)
+    parallel = cross_validate(input_data, 1.5, folds=4, seed=1, workers=3)
+
+    def without_times(results):
+        return [result[:5] + result[7:] for result in results]
+    assert without_times(parallel) == without_times(in_process)
+    assert without_times(cross_validate(input_data, 1.5, folds=4, seed=2, workers=1)) != without_times(in_process)
+    assert [result.fold for result in in_process] == [0, 1, 2, 3]
+    assert sum(result.test_points for result in in_process) == len(input_data)
+    for result in in_process:
+        assert result.accuracy + result.ambiguous_rate + result.unknown_rate <= 1
+
+    summary = summarize(in_process)
+    assert summary.folds == 4
+    assert summary.accuracy == pytest.approx(sum(result.accuracy * result.test_points for result in in_process) / len(input_data))
+
+
+def test_score_counts_results():
+    rce_network = RceNetwork(1)
+    rce_network.add_new_neuron(Point(0.0, 0.0, "Red"))
+    rce_network.add_new_neuron(Point(1.5, 0.0, "Green"))
+    rce_network.add_new_neuron(Point(10.0, 0.0, "Red"))
+    coordinates = np.array([[0.0, 0.0], [1.5, 0.0], [0.75, 0.0], [10.0, 0.0], [100.0, 0.0]])
+    class_names = ["Green", "Red"]
+    # Correct, correct, ambiguous, wrong class, unknown
+    assert score(rce_network, coordinates, np.array([1, 0, 1, 0, 1]), class_names) == (0.4, 0.2, 0.2)
+    assert score(rce_network, coordinates[:0], np.array([], dtype=int), class_names) == (None, None, None)
+
+
+def test_holdout_evaluation_matches_training_on_split():
+    input_data = dataset(100)
+    result = holdout_evaluation(input_data, 2, holdout=0.3, seed=4)
+    assert (result.training_points, result.test_points) == (70, 30)
+
+    with pytest.raises(ValueError):
+        cross_validate(input_data, 2, folds=1)
+
+
+def test_evaluate_cli(tmp_path, capsys):
+    output_file = str(tmp_path / "evaluation.json")
+    rce_cli.main(["evaluate", REAL_FILE, "--folds", "3", "--workers", "1", "--output", output_file])
+
+    with open(output_file, 'r') as f:
+        results = json.load(f)
+    assert results["summary"]["folds"] == 3 and len(results["folds"]) == 3
+    assert "accuracy" in capsys.readouterr().out
+
+
+def test_evaluate_cli_without_test_points(tmp_path, capsys):
+    output_file = str(tmp_path / "evaluation.json")
+    rce_cli.main(["evaluate", REAL_FILE, "--holdout", "0", "--output", output_file])
+
+    with open(output_file, 'r') as f:
+        results = json.load(f)
+    assert results["folds"][0]["test_points"] == 0 and results["summary"]["accuracy"] is None
+    assert "accuracy: - (std -), ambiguous: -, unknown: -" in capsys.readouterr().out
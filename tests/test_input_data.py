@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from data.input_data import InputData
+from data.my_exceptions import AlreadyExists
+from data.point import Point
+
+
+def test_bulk_load_matches_per_point_api():
+    generator = np.random.default_rng(0)
+    xs, ys = generator.uniform(0, 10, 500), generator.uniform(0, 10, 500)
+    labels = generator.choice(["Red", "Green", "Blue"], 500)
+    bulk = InputData.from_arrays(xs, ys, labels)
+    parsed = InputData([{"x": str(x), "y": y, "class_name": c} for x, y, c in zip(xs, ys, labels)])
+    per_point = InputData()
+    for x, y, c in zip(xs.tolist(), ys.tolist(), labels.tolist()):
+        per_point.add_point(Point(x, y, c))
+
+    for input_data in (bulk, parsed):
+        assert len(input_data) == len(per_point)
+        assert [str(point) for point in input_data.points()] == [str(point) for point in per_point.points()]
+        assert list(input_data.data) == list(per_point.data)
+        assert np.array_equal(input_data.coordinates, per_point.coordinates)
+        assert list(input_data.class_names) == list(per_point.class_names)
+
+
+def test_per_point_api_after_bulk_load():
+    input_data = InputData.from_arrays([0.0, 1.0], [0.0, 1.0], ["Red", "Blue"])
+    assert input_data.contains_point(Point(1.0, 1.0, "Green"))
+    with pytest.raises(AlreadyExists):
+        input_data.add_point(Point(0.0, 0.0, "Blue"))
+    assert input_data.add_point(Point(2.0, 2.0, "Red"))
+    assert input_data.remove_point(Point(0.0, 0.0, "Red"))
+    input_data.add_points([3.0], [3.0], ["Blue"])
+    assert input_data.coordinates.tolist() == [[1.0, 1.0], [2.0, 2.0], [3.0, 3.0]]
+    assert list(input_data.class_names) == ["Blue", "Red", "Blue"]
+    assert list(input_data.data) == ["1.0,1.0", "2.0,2.0", "3.0,3.0"]
+    input_data.remove_all_points()
+    assert len(input_data) == 0 and input_data.coordinates.shape == (0, 2)
+
+
+def test_all_duplicates_are_reported_and_nothing_is_added():
+    input_data = InputData.from_arrays([0.0, 1.0], [0.0, 1.0], ["Red", "Blue"])
+    with pytest.raises(AlreadyExists) as error:
+        input_data.add_points([5.0, 1.0, 5.0, 6.0, 5.0], [5.0, 1.0, 5.0, 6.0, 5.0], ["a", "b", "c", "d", "e"])
+    assert [str(point) for point in error.value.duplicates] == [str(Point(1.0, 1.0, "b")), str(Point(5.0, 5.0, "c")), str(Point(5.0, 5.0, "e"))]
+    assert len(input_data) == 2
+
+
+def test_columns_of_different_lengths():
+    with pytest.raises(ValueError):
+        InputData.from_arrays([0.0, 1.0], [0.0], ["Red", "Blue"])
+
+
+def test_n_dimensional_points():
+    coordinates = np.array([[0.0, 1.0, 2.0], [0.0, 1.0, 3.0], [0.0, 1.0, 2.0], [1.0, 1.0, 2.0]])
+    with pytest.raises(AlreadyExists) as error:
+        InputData.from_coordinates(coordinates, ["a", "b", "c", "d"])
+    assert [str(point) for point in error.value.duplicates] == ["[0.0, 1.0, 2.0, class = c]"]
+
+    input_data = InputData([{"coordinates": [0.0, 1.0, 2.0], "class_name": "a"}, {"coordinates": [1, 1, 2], "class_name": "b"}])
+    assert input_data.dimensions == 3
+    assert input_data.contains_point(Point.from_coordinates([1.0, 1.0, 2.0], "b"))
+    assert input_data.points()[0].to_dict() == {"coordinates": [0.0, 1.0, 2.0], "class_name": "a"}
+    assert not input_data.add_point(Point(5.0, 5.0, "c"))
+    with pytest.raises(ValueError):
+        input_data.add_points([5.0], [5.0], ["c"])
+    assert Point(1.5, 2, "a").key() == "1.5,2" and Point(1.5, 2, "a").to_dict() == {"x": 1.5, "y": 2, "class_name": "a"}
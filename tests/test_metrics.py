@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+import rce_cli
+from benchmarks.datasets import generate, to_points
+from rce.metrics import Chebyshev, Euclidean, Manhattan, SquaredEuclidean, WeightedEuclidean, get_metric, metric_from_dict
+from rce.model_file import load_model, save_model
+from rce.one_shot_trainer import OneShotTrainer
+from rce.pruning import prune
+from rce.rce_network import UNIQUE
+from rce.rce_trainer import RceTrainer
+from helpers import REAL_FILE, load_points
+
+METRICS = [Euclidean(), SquaredEuclidean(), Manhattan(), Chebyshev(), WeightedEuclidean([1, 4, 0.25])]
+
+
+@pytest.mark.parametrize("metric", METRICS, ids=str)
+def test_kernels_match_scalar_distance(metric):
+    rng = np.random.default_rng(0)
+    points, centers = rng.uniform(-3, 3, (20, 3)), rng.uniform(-3, 3, (7, 3))
+    expected = np.array([[metric.to_comparable(metric.distance(point, center)) for center in centers] for point in points])
+    assert metric.pairwise(points, centers) == pytest.approx(expected)
+    assert metric.point_values(points[0], centers) == pytest.approx(expected[0])
+    distances = np.array([[metric.distance(point, center) for center in centers] for point in points])
+    assert metric.from_comparable(expected) == pytest.approx(distances)
+
+
+@pytest.mark.parametrize("metric", METRICS, ids=str)
+def test_ball_extents_reach_the_radius(metric):
+    extents = metric.ball_extents(np.array([0.5, 2]), 3)
+    assert extents.shape == (2, 3)
+    for radius, extent in zip([0.5, 2], extents):
+        for dimension in range(3):
+            offset = np.zeros(3)
+            offset[dimension] = extent[dimension]
+            assert metric.distance(offset, np.zeros(3)) == pytest.approx(radius)
+    assert metric.coordinate_bound(2, 3) == pytest.approx(extents[1].max())
+
+
+def test_get_metric():
+    assert get_metric() == Euclidean() and get_metric("chebyshev") == Chebyshev()
+    assert get_metric("weighted_euclidean", [1, 2]) == WeightedEuclidean([1, 2]) != WeightedEuclidean([2, 1])
+    assert metric_from_dict(None) == Euclidean()
+    assert metric_from_dict(WeightedEuclidean([1, 2]).to_dict()) == WeightedEuclidean([1, 2])
+    for name, weights in [("cosine", None), ("weighted_euclidean", None), ("manhattan", [1, 2]), ("weighted_euclidean", [1, 0])]:
+        with pytest.raises(ValueError):
+            get_metric(name, weights)
+    with pytest.raises(ValueError):
+        RceTrainer(3, metric=WeightedEuclidean([1, 2, 3])).Train(load_points(REAL_FILE))
+
+
+@pytest.mark.parametrize("metric", METRICS[1:], ids=str)
+def test_training_with_metric(metric):
+    coordinates, labels = generate("real", 400, 3, seed=5)
+    points = to_points(coordinates, labels)
+    networks = []
+    for options, train_options in [({}, {}), ({"use_spatial_index": False}, {}), ({"distance_cache_bytes": 1 << 20}, {}),
+                                   ({}, {"use_worklist": True})]:
+        rce_trainer = RceTrainer(1, metric=metric, **options)
+        rce_trainer.Train(points, record_trace=False, **train_options)
+        networks.append(rce_trainer.rce_network)
+    for rce_network in networks[1:]:
+        assert np.array_equal(rce_network.centers, networks[0].centers) and np.array_equal(rce_network.radii, networks[0].radii)
+
+    # Training points are classified uniquely to their class, the same as with exact distances of the metric
+    rce_network = networks[0]
+    class_labels, results = rce_network.classify(coordinates)
+    assert (results == UNIQUE).all() and class_labels.tolist() == labels
+    activated = np.array([[metric.distance(point, center) for center in rce_network.centers] for point in coordinates[:50]])
+    activated = activated <= rce_network.radii
+    assert all(set(rce_network.class_ids[row].tolist()) == {rce_network.class_id(label)} for row, label in zip(activated, labels))
+
+    pruned = prune(rce_network, coordinates)
+    assert pruned.metric == metric and pruned.classify(coordinates)[0].tolist() == labels
+    one_shot = OneShotTrainer(1, metric=metric)
+    one_shot.Train(points)
+    assert one_shot.rce_network.classify(coordinates)[0].tolist() == labels
+
+
+def test_metric_is_saved_with_model(tmp_path):
+    model_file = str(tmp_path / "model.rce")
+    rce_cli.main(["train", REAL_FILE, model_file, "--metric", "weighted_euclidean", "--weights", "1", "4"])
+    rce_network = load_model(model_file)
+    assert rce_network.metric == WeightedEuclidean([1, 4])
+
+    rce_trainer = RceTrainer(3, metric=WeightedEuclidean([1, 4]))
+    rce_trainer.Train(load_points(REAL_FILE), record_trace=False)
+    assert np.array_equal(rce_network.radii, rce_trainer.rce_network.radii)
+    save_model(str(tmp_path / "copy.rce"), rce_network)
+    assert load_model(str(tmp_path / "copy.rce")).metric == WeightedEuclidean([1, 4])
@@ -0,0 +1,64 @@
+import os
+import struct
+
+import numpy as np
+import pytest
+
+from data.point import Point
+from rce.model_file import load_model, save_model
+from rce.rce_trainer import RceTrainer
+from helpers import TEST_FILES, layers, load_points
+
+
+@pytest.mark.parametrize("file_name", TEST_FILES, ids=os.path.basename)
+@pytest.mark.parametrize("memory_map", [True, False])
+def test_model_round_trip(file_name, memory_map, tmp_path):
+    rce_trainer = RceTrainer(1.5)
+    rce_trainer.Train(load_points(file_name), record_trace=False)
+    rce_network = rce_trainer.rce_network
+    model_file = str(tmp_path / "model.rce")
+    save_model(model_file, rce_network)
+    loaded = load_model(model_file, memory_map=memory_map)
+
+    assert loaded.r_max == rce_network.r_max
+    assert layers(loaded) == layers(rce_network)
+    queries = np.random.default_rng(0).uniform(-5, 15, (1000, 2))
+    expected_labels, expected_results = rce_network.classify(queries)
+    labels, results = loaded.classify(queries)
+    assert list(labels) == list(expected_labels)
+    assert np.array_equal(results, expected_results)
+
+
+def test_loaded_model_can_be_modified_without_changing_file(tmp_path):
+    rce_trainer = RceTrainer(2)
+    rce_trainer.Train([Point(0.0, 0.0, "Red"), Point(3.0, 0.0, "Blue")], record_trace=False)
+    model_file = str(tmp_path / "model.rce")
+    save_model(model_file, rce_trainer.rce_network)
+
+    loaded = load_model(model_file)
+    loaded.shrink_neuron(0, 0.5)
+    loaded.add_new_neuron(Point(10.0, 10.0, "Green"))
+    assert [neuron.radius for neuron in loaded.hidden_layer] == [0.5, 2, 2]
+    assert [neuron.output_neuron.class_name for neuron in loaded.hidden_layer] == ["Red", "Blue", "Green"]
+    assert layers(load_model(model_file)) == layers(rce_trainer.rce_network)
+
+
+def test_empty_model_round_trip(tmp_path):
+    model_file = str(tmp_path / "model.rce")
+    save_model(model_file, RceTrainer(2).rce_network)
+    assert len(load_model(model_file).hidden_layer) == 0
+
+
+def test_invalid_model_files(tmp_path):
+    model_file = str(tmp_path / "model.rce")
+    with open(model_file, 'wb') as f:
+        f.write(b"not a model")
+    with pytest.raises(ValueError):
+        load_model(model_file)
+
+    save_model(model_file, RceTrainer(2).rce_network)
+    with open(model_file, 'r+b') as f:
+        f.seek(8)
+        f.write(struct.pack("<I", 99))
+    with pytest.raises(ValueError):
+        load_model(model_file)
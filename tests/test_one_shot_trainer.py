@@ -0,0 +1,85 @@
+import math
+
+import pytest
+
+import rce_cli
+from benchmarks.datasets import generate, to_points
+from data.point import Point
+from data.input_data import InputData
+from rce.model_file import load_model
+from rce.one_shot_trainer import OneShotTrainer, nearest_opposite_distances
+from rce.rce_network import AMBIGUOUS, UNIQUE
+from helpers import TEST_FILES, REAL_FILE, load_points
+
+
+def brute_force_distances(points, max_distance):
+    distances = []
+    for point in points:
+        nearest = min((math.dist(point.coordinates, other.coordinates) for other in points if other.class_name != point.class_name),
+                      default=math.inf)
+        distances.append(nearest if nearest <= max_distance else math.inf)
+    return distances
+
+
+@pytest.mark.parametrize("shape, dimensions", [("real", 2), ("radial", 2), ("clustered", 3)])
+def test_nearest_opposite_distances(shape, dimensions):
+    coordinates, labels = generate(shape, 300, dimensions, seed=2)
+    points = to_points(coordinates, labels)
+    distances = nearest_opposite_distances(coordinates, labels, 1.5, max_chunk_bytes=4096)
+    assert distances.tolist() == pytest.approx(brute_force_distances(points, 1.5))
+
+
+def test_one_shot_training_is_final_after_one_pass():
+    for test_file in TEST_FILES:
+        points = load_points(test_file)
+        rce_trainer = OneShotTrainer(2)
+        stats = rce_trainer.Train(points)
+        rce_network = rce_trainer.rce_network
+        assert (stats.epochs, stats.shrinks, rce_network.iteration) == (1, 0, 1)
+        assert stats.neurons_added == len(rce_network.hidden_layer)
+
+        # Radii are set from the nearest point of another class when neurons are created
+        distances = dict(zip((point.key() for point in points), brute_force_distances(points, math.inf)))
+        for hidden_neuron in rce_network.hidden_layer:
+            key = ",".join(f"{coordinate}" for coordinate in hidden_neuron.weights)
+            assert hidden_neuron.radius == pytest.approx(min(2, distances[key] / 2))
+
+        # Every training point is covered only by its class, so a classic epoch would not change the network
+        if not any(points[i].key() == points[j].key() for i in range(len(points)) for j in range(i)):
+            labels, results = rce_network.classify(points)
+            assert (results == UNIQUE).all() and labels.tolist() == [point.class_name for point in points]
+
+
+def test_one_shot_training_of_generated_dataset():
+    coordinates, labels = generate("linear", 2000, seed=5)
+    points = to_points(coordinates, labels)
+    rce_trainer = OneShotTrainer(3)
+    stats = rce_trainer.Train(points)
+    assert stats.epochs == 1 and stats.point_visits == len(points)
+    result_labels, results = rce_trainer.rce_network.classify(coordinates)
+    assert (results == UNIQUE).all() and result_labels.tolist() == labels
+
+
+def test_one_shot_training_of_conflicting_duplicates():
+    points = [Point(0, 0, "Red"), Point(0, 0, "Green"), Point(5, 0, "Red")]
+    rce_trainer = OneShotTrainer(2)
+    rce_trainer.Train(points)
+    assert [hidden_neuron.radius for hidden_neuron in rce_trainer.rce_network.hidden_layer] == [0, 0, 2]
+    assert rce_trainer.rce_network.classify(points)[1].tolist() == [AMBIGUOUS, AMBIGUOUS, UNIQUE]
+
+
+def test_one_shot_training_does_not_support_trace():
+    with pytest.raises(ValueError):
+        OneShotTrainer(2).Train([Point(0, 0, "Red")], record_trace=True)
+    with pytest.raises(ValueError):
+        OneShotTrainer(2).Train([Point(0, 0, "Red")], use_worklist=True)
+
+
+def test_one_shot_cli(tmp_path, capsys):
+    model_file = str(tmp_path / "model.rce")
+    rce_cli.main(["train", REAL_FILE, model_file, "--r-max", "3", "--one-shot"])
+    assert "epochs: 1" in capsys.readouterr().err
+
+    rce_trainer = OneShotTrainer(3)
+    rce_trainer.Train(load_points(REAL_FILE))
+    assert load_model(model_file).radii.tolist() == rce_trainer.rce_network.radii.tolist()
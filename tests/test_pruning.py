@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+import rce_cli
+from benchmarks.datasets import generate, to_points
+from data.point import Point
+from rce.model_file import load_model
+from rce.one_shot_trainer import OneShotTrainer
+from rce.pruning import grown_radii, prune, pruning_report, redundant_neurons
+from rce.rce_network import AMBIGUOUS, RceNetwork, UNIQUE
+from rce.rce_trainer import RceTrainer
+from helpers import TEST_FILES, REAL_FILE, load_points
+
+
+def network(neurons, r_max=3):
+    rce_network = RceNetwork(r_max)
+    for x, y, radius, class_name in neurons:
+        rce_network.add_new_neuron(Point(x, y, class_name), radius)
+    return rce_network
+
+
+def assert_same_classification(rce_network, pruned, coordinates):
+    labels, results = rce_network.classify(coordinates)
+    pruned_labels, pruned_results = pruned.classify(coordinates)
+    assert pruned_labels.tolist() == labels.tolist() and pruned_results.tolist() == results.tolist()
+
+
+def test_contained_neuron_is_removed():
+    rce_network = network([(0, 0, 0.5, "Red"), (0.5, 0, 2, "Red"), (5, 0, 1, "Green")])
+    coordinates = np.array([[0, 0], [0.5, 0], [5, 0], [0.2, 0.1]])
+    assert redundant_neurons(rce_network, coordinates).tolist() == [True, False, False]
+
+    pruned = prune(rce_network, coordinates, consolidate=False)
+    assert pruned.radii.tolist() == [2, 1] and [pruned.output_layer[i].class_name for i in pruned.class_ids] == ["Red", "Green"]
+    assert_same_classification(rce_network, pruned, coordinates)
+
+
+def test_nearest_neuron_of_ambiguous_point_is_kept():
+    # (1, 0) is inside of both Red hyperspheres and of the Green one, its label comes from the nearest Red one
+    rce_network = network([(0, 0, 2, "Red"), (1.2, 0, 0.5, "Red"), (2.5, 0, 2, "Green")])
+    coordinates = np.array([[0, 0], [1.2, 0], [2.5, 0], [1, 0]])
+    assert rce_network.classify(coordinates)[1].tolist() == [UNIQUE, AMBIGUOUS, UNIQUE, AMBIGUOUS]
+    assert not redundant_neurons(rce_network, coordinates)[1]
+    assert_same_classification(rce_network, prune(rce_network, coordinates), coordinates)
+
+
+def test_grown_radii_stop_before_other_classes():
+    rce_network = network([(0, 0, 0.5, "Red"), (1, 0, 0.5, "Red"), (3, 0, 0.5, "Green")])
+    coordinates = np.array([[0, 0], [1, 0], [3, 0]])
+    assert grown_radii(rce_network, coordinates).tolist() == [1, 1, 0.5]
+
+    pruned = prune(rce_network, coordinates)
+    assert len(pruned.hidden_layer) == 2
+    assert_same_classification(rce_network, pruned, coordinates)
+
+
+@pytest.mark.parametrize("consolidate", [False, True])
+def test_pruning_keeps_classification_of_training_points(consolidate):
+    for test_file in TEST_FILES:
+        points = load_points(test_file)
+        coordinates = np.array([point.coordinates for point in points], dtype=float)
+        for rce_trainer in (RceTrainer(3), OneShotTrainer(10)):
+            rce_trainer.Train(points, record_trace=False)
+            pruned = prune(rce_trainer.rce_network, coordinates, consolidate)
+            assert len(pruned.hidden_layer) <= len(rce_trainer.rce_network.hidden_layer)
+            assert (pruned.radii <= pruned.r_max).all()
+            assert_same_classification(rce_trainer.rce_network, pruned, coordinates)
+
+
+@pytest.mark.parametrize("dimensions", [2, 4])
+def test_pruning_of_generated_dataset(dimensions):
+    coordinates, labels = generate("real", 2000, dimensions, seed=4)
+    rce_trainer = OneShotTrainer(2)
+    rce_trainer.Train(to_points(coordinates, labels))
+    pruned = prune(rce_trainer.rce_network, coordinates)
+    assert len(pruned.hidden_layer) < len(rce_trainer.rce_network.hidden_layer)
+    assert_same_classification(rce_trainer.rce_network, pruned, coordinates)
+
+    report = pruning_report(rce_trainer.rce_network, pruned, coordinates, repeats=1)
+    assert (report.neurons_before, report.neurons_after, report.queries) == (len(rce_trainer.rce_network.hidden_layer),
+                                                                            len(pruned.hidden_layer), len(coordinates))
+
+
+def test_prune_cli(tmp_path, capsys):
+    model_file, pruned_file = str(tmp_path / "model.rce"), str(tmp_path / "pruned.rce")
+    rce_cli.main(["train", REAL_FILE, model_file, "--r-max", "10", "--one-shot"])
+    rce_cli.main(["prune", model_file, REAL_FILE, pruned_file, "--queries", "1000"])
+    assert "hidden neurons: 7 -> 6 (1 removed)" in capsys.readouterr().out
+
+    coordinates = np.array([point.coordinates for point in load_points(REAL_FILE)], dtype=float)
+    assert_same_classification(load_model(model_file), load_model(pruned_file), coordinates)
@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+import rce_cli
+from data.dataset_io import save_dataset
+from data.input_data import InputData
+from rce.model_file import load_model
+from helpers import REAL_FILE
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def classify_output(model_file, input_file, tmp_path, *options):
+    output_file = str(tmp_path / "output.csv")
+    rce_cli.main(["classify", model_file, input_file, "--output", output_file, "--batch-size", "4", *options])
+    with open(output_file, 'r') as f:
+        return f.read().splitlines()
+
+
+def test_train_and_classify(tmp_path):
+    model_file = str(tmp_path / "model.rce")
+    rce_cli.main(["train", REAL_FILE, model_file, "--r-max", "3"])
+    rce_network = load_model(model_file)
+
+    points = np.array([[1.0, 2.0], [5.0, 5.0], [100.0, 100.0], [8.1, 2.1], [3.0, 4.0]])
+    csv_file = str(tmp_path / "points.csv")
+    with open(csv_file, 'w') as f:
+        f.write("x,y\n" + "".join("{},{}\n".format(x, y) for x, y in points))
+    npy_file = str(tmp_path / "points.npy")
+    np.save(npy_file, points)
+
+    labels, results = rce_network.classify(points)
+    expected = ["x,y,class_name,result"] + ["{},{},{},{}".format(x, y, "" if label is None else label, rce_cli.RESULT_NAMES[result])
+                                            for (x, y), label, result in zip(points.tolist(), labels, results)]
+    assert classify_output(model_file, csv_file, tmp_path) == expected
+    assert classify_output(model_file, npy_file, tmp_path) == expected
+    assert len(classify_output(model_file, REAL_FILE, tmp_path)) == 19
+
+
+def test_n_dimensional_train_and_classify(tmp_path):
+    coordinates = np.random.default_rng(1).uniform(0, 5, (80, 3))
+    dataset_file, model_file = str(tmp_path / "dataset.npz"), str(tmp_path / "model.rce")
+    save_dataset(dataset_file, InputData.from_coordinates(coordinates, ["Red", "Blue"] * 40))
+    rce_cli.main(["train", dataset_file, model_file, "--r-max", "1.5"])
+    rce_network = load_model(model_file)
+    assert rce_network.dimensions == 3
+
+    csv_file = str(tmp_path / "points.csv")
+    with open(csv_file, 'w') as f:
+        f.write("".join("{},{},{},ignored\n".format(*point) for point in coordinates[:5]))
+    lines = classify_output(model_file, csv_file, tmp_path)
+    assert lines[0] == "x0,x1,x2,class_name,result"
+    assert [line.split(",")[3:] for line in lines[1:]] == [["Red", "unique"], ["Blue", "unique"]] * 2 + [["Red", "unique"]]
+
+
+def test_cli_does_not_import_gui_libraries():
+    code = ("import sys, rce_cli; rce_cli.main(['bench', {!r}, '--queries', '100']); "
+            "assert not any(module.split('.')[0] in ('PyQt5', 'matplotlib') for module in sys.modules)").format(REAL_FILE)
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, check=True, capture_output=True)
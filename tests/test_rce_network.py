@@ -0,0 +1,109 @@
+import os
+
+import numpy as np
+import pytest
+
+from data.point import Point
+from rce.rce_network import AMBIGUOUS, UNIQUE, UNKNOWN, RceNetwork
+from rce.rce_trainer import RceTrainer
+from helpers import TEST_FILES, load_points
+
+
+@pytest.mark.parametrize("file_name", TEST_FILES, ids=os.path.basename)
+def test_classify_training_points(file_name):
+    training_input = load_points(file_name)
+    rce_trainer = RceTrainer(2)
+    rce_trainer.Train(training_input, record_trace=False)
+
+    labels, results = rce_trainer.rce_network.classify(training_input)
+
+    # Trained network is not in conflict with any training point
+    assert results.tolist() == [UNIQUE] * len(training_input)
+    assert labels.tolist() == [point.class_name for point in training_input]
+
+
+def test_classify_results_and_chunks():
+    rce_network = RceNetwork(2)
+    rce_network.add_new_neuron(Point(0.0, 0.0, "Red"))
+    rce_network.add_new_neuron(Point(3.0, 0.0, "Blue"))
+    rce_network.add_new_neuron(Point(0.5, 0.0, "Red"))
+    points = np.array([[-1.0, 0.0], [1.5, 0.0], [4.0, 0.0], [10.0, 10.0], [2.4, 0.0]])
+
+    labels, results = rce_network.classify(points)
+
+    assert results.tolist() == [UNIQUE, AMBIGUOUS, UNIQUE, UNKNOWN, AMBIGUOUS]
+    assert labels.tolist() == ["Red", "Red", "Blue", None, "Blue"]
+    for chunk_size in (1, 2, 3):
+        chunk_labels, chunk_results = rce_network.classify([Point(x, y, None) for x, y in points], chunk_size=chunk_size)
+        assert chunk_labels.tolist() == labels.tolist()
+        assert chunk_results.tolist() == results.tolist()
+
+
+def test_classify_empty():
+    for points in (np.empty((0, 2)), np.empty(0), []):
+        labels, results = RceNetwork().classify(points)
+        assert len(labels) == len(results) == 0
+    labels, results = RceNetwork().classify([Point(1.0, 1.0, "Red")])
+    assert labels.tolist() == [None] and results.tolist() == [UNKNOWN]
+
+
+def test_classify_with_spatial_index_matches_linear_scan():
+    generator = np.random.default_rng(0)
+    training_input = [Point(float(x), float(y), str(c)) for (x, y), c in
+                      zip(generator.uniform(-20, 20, (400, 2)), generator.integers(0, 3, 400))]
+    rce_trainer = RceTrainer(3)
+    rce_trainer.Train(training_input, record_trace=False)
+    linear = RceNetwork(3, use_spatial_index=False)
+    linear.output_layer = rce_trainer.rce_network.output_layer
+    for hidden_neuron in rce_trainer.rce_network.hidden_layer:
+        linear.add_hidden_neuron(hidden_neuron)
+    queries = generator.uniform(-25, 25, (5000, 2))
+
+    labels, results = rce_trainer.rce_network.classify(queries, chunk_size=100)
+    linear_labels, linear_results = linear.classify(queries)
+
+    assert rce_trainer.rce_network.spatial_index is not None
+    assert results.tolist() == linear_results.tolist()
+    assert labels.tolist() == linear_labels.tolist()
+
+
+def test_classify_input_shapes():
+    rce_network = RceNetwork(2)
+    rce_network.add_new_neuron(Point(0.0, 0.0, "Red"))
+
+    assert rce_network.classify([[0.0, 0.0], [5.0, 5.0]])[1].tolist() == [UNIQUE, UNKNOWN]
+    assert rce_network.classify(np.array([0.5, 0.5]))[0].tolist() == ["Red"]
+    for points in (np.array([[0.0, 0.0, 50.0]]), [[0.0, 0.0, 50.0]], np.zeros((2, 2, 2))):
+        with pytest.raises(ValueError):
+            rce_network.classify(points)
+
+
+def test_str_lists_limited_number_of_neurons():
+    rce_network = RceNetwork(0.5)
+    for i in range(30):
+        rce_network.add_new_neuron(Point(float(i), 0.0, "Red"))
+
+    assert "... (10 more)" in str(rce_network)
+    assert str(rce_network).count("r=0.50") == 20
+    assert rce_network.to_string().count("r=0.50") == 30
+    assert rce_network.action == "Adding new hidden neuron at (29.0,0.0) r = 0.5; Output neuron already existed for class Red"
+
+
+@pytest.mark.parametrize("dimensions", [3, 8])
+def test_n_dimensional_classify_with_spatial_index_matches_linear_scan(dimensions):
+    generator = np.random.default_rng(dimensions)
+    coordinates = generator.uniform(0, 4, (300, dimensions))
+    training_input = [Point.from_coordinates(point, str(c)) for point, c in zip(coordinates.tolist(), generator.integers(0, 3, 300))]
+    indexed = RceTrainer(1.5)
+    indexed.Train(training_input, record_trace=False)
+    linear = RceTrainer(1.5, use_spatial_index=False)
+    linear.Train(training_input, record_trace=False)
+
+    queries = generator.uniform(-1, 5, (2000, dimensions))
+    labels, results = indexed.rce_network.classify(queries)
+    expected_labels, expected_results = linear.rce_network.classify(queries)
+    assert list(labels) == list(expected_labels) and np.array_equal(results, expected_results)
+    labels, results = indexed.rce_network.classify(training_input)
+    assert list(labels) == [point.class_name for point in training_input] and (results == UNIQUE).all()
+    with pytest.raises(ValueError):
+        indexed.rce_network.classify(queries[:, :2])
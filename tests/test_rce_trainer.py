@@ -0,0 +1,232 @@
+import os
+import random
+
+import pytest
+
+from data.point import Point
+from rce.rce_trainer import RceTrainer
+from rce.training_stats import TrainingObserver
+from helpers import TEST_FILES, layers, load_points
+
+
+@pytest.mark.parametrize("file_name", TEST_FILES, ids=os.path.basename)
+@pytest.mark.parametrize("r_max", [0.5, 3])
+def test_untraced_training_matches_traced(file_name, r_max):
+    training_input = load_points(file_name)
+
+    traced = RceTrainer(r_max)
+    traced.Train(training_input)
+    fast = RceTrainer(r_max)
+    fast.Train(training_input, record_trace=False)
+
+    assert fast.training_done
+    assert len(fast.rce_networks) == 0
+    assert layers(fast.rce_network) == layers(traced.rce_networks[-1])
+    assert layers(fast.rce_network) == layers(traced.rce_network)
+    assert fast.rce_network.iteration == traced.rce_network.iteration
+
+
+def reference_train(training_input, r_max):
+    """
+    Plain per-neuron RCE training loop (as it was implemented before vectorization).
+    """
+    hidden = []  # [weights, radius, class_name]
+    modification = True
+    while modification:
+        modification = False
+        for point in training_input:
+            hit = False
+            for neuron in hidden:
+                distance = ((point.x - neuron[0][0]) ** 2 + (point.y - neuron[0][1]) ** 2) ** 0.5
+                if distance <= neuron[1]:
+                    if neuron[2] == point.class_name:
+                        hit = True
+                    else:
+                        modification = True
+                        neuron[1] = distance / 2
+            if not hit:
+                hidden.append([[point.x, point.y], r_max, point.class_name])
+                modification = True
+    return [tuple(neuron) for neuron in hidden]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("r_max", [1, 2, 2.5])
+@pytest.mark.parametrize("use_spatial_index", [False, True])
+def test_vectorized_training_matches_per_neuron_loop(seed, r_max, use_spatial_index):
+    generator = random.Random(seed)
+    # Integer coordinates create many points lying exactly on the boundary of hyperspheres
+    coordinates = generator.sample([(x, y) for x in range(12) for y in range(12)], 120)
+    training_input = [Point(float(x), float(y), generator.choice(["Red", "Green", "Blue"])) for x, y in coordinates]
+
+    rce_trainer = RceTrainer(r_max, use_spatial_index=use_spatial_index)
+    rce_trainer.Train(training_input, record_trace=False)
+
+    assert layers(rce_trainer.rce_network)[0] == reference_train(training_input, r_max)
+    assert rce_trainer.rce_network.radii.tolist() == [neuron.radius for neuron in rce_trainer.rce_network.hidden_layer]
+    assert rce_trainer.rce_network.centers.tolist() == [neuron.weights for neuron in rce_trainer.rce_network.hidden_layer]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("r_max", [1, 2.5, 4])
+def test_worklist_training_matches_full_passes(seed, r_max):
+    generator = random.Random(seed)
+    coordinates = generator.sample([(x, y) for x in range(15) for y in range(15)], 150)
+    training_input = [Point(float(x), float(y), generator.choice(["Red", "Green", "Blue"])) for x, y in coordinates]
+    # Points at the same position with different classes would shrink radii forever
+    training_input += [point for point in load_points(TEST_FILES[seed]) if (point.x, point.y) not in coordinates]
+
+    full = RceTrainer(r_max)
+    full.Train(training_input, record_trace=False)
+    worklist = RceTrainer(r_max)
+    worklist.Train(training_input, record_trace=False, use_worklist=True)
+
+    assert layers(worklist.rce_network) == layers(full.rce_network)
+    assert worklist.rce_network.iteration == full.rce_network.iteration
+    report = worklist.worklist_report
+    assert report.epochs == full.rce_network.iteration
+    assert report.point_visits + report.saved_point_visits == report.epochs * len(training_input)
+    assert report.saved_point_visits > 0 and report.saved_comparisons > 0
+
+
+def test_worklist_requires_training_without_trace():
+    with pytest.raises(ValueError):
+        RceTrainer(1).Train(load_points(TEST_FILES[0]), use_worklist=True)
+
+
+@pytest.mark.parametrize("use_spatial_index", [False, True])
+@pytest.mark.parametrize("distance_cache_bytes", [1, 4000, 10 ** 8])
+@pytest.mark.parametrize("use_worklist", [False, True])
+def test_distance_cache_training_matches_uncached(use_spatial_index, distance_cache_bytes, use_worklist):
+    generator = random.Random(7)
+    coordinates = generator.sample([(x, y) for x in range(15) for y in range(15)], 150)
+    training_input = [Point(float(x), float(y), generator.choice(["Red", "Green", "Blue"])) for x, y in coordinates]
+
+    uncached = RceTrainer(2.5, use_spatial_index=use_spatial_index)
+    uncached.Train(training_input, record_trace=False)
+    cached = RceTrainer(2.5, use_spatial_index=use_spatial_index, distance_cache_bytes=distance_cache_bytes)
+    cached.Train(training_input, record_trace=False, use_worklist=use_worklist)
+
+    assert layers(cached.rce_network) == layers(uncached.rce_network)
+    assert cached.rce_network.iteration == uncached.rce_network.iteration
+    distance_cache = cached.distance_cache
+    if distance_cache_bytes == 10 ** 8:
+        assert distance_cache.hits > 0 and distance_cache.evictions == 0
+    else:
+        assert distance_cache.evictions > 0
+        largest_row = max(distance_cache._row_bytes(row) for row in distance_cache.rows.values())
+        assert distance_cache.size_bytes <= max(distance_cache_bytes, largest_row)
+
+
+class CountingObserver(TrainingObserver):
+    def __init__(self):
+        self.calls = {}
+        self.stats = None
+
+    def count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def training_started(self, rce_trainer):
+        self.count("training_started")
+
+    def epoch_started(self, iteration):
+        self.count("epoch_started")
+
+    def point_started(self, train_input_index):
+        self.count("point_started")
+
+    def point_finished(self, train_input_index, activations, hit):
+        self.count("point_finished")
+        if hit:
+            self.count("hit")
+
+    def neuron_shrunk(self, index, radius):
+        self.count("neuron_shrunk")
+
+    def neuron_added(self, index):
+        self.count("neuron_added")
+
+    def epoch_finished(self, iteration, elapsed):
+        self.count("epoch_finished")
+
+    def training_finished(self, stats):
+        self.count("training_finished")
+        self.stats = stats
+
+
+@pytest.mark.parametrize("record_trace, use_worklist", [(True, False), (False, False), (False, True)])
+def test_training_stats_and_observer(record_trace, use_worklist):
+    training_input = load_points(TEST_FILES[0])
+    rce_trainer = RceTrainer(2)
+    observer = CountingObserver()
+    rce_trainer.add_observer(observer)
+    stats = rce_trainer.Train(training_input, record_trace=record_trace, use_worklist=use_worklist)
+
+    assert stats is rce_trainer.stats is observer.stats
+    assert stats.epochs == rce_trainer.rce_network.iteration == len(stats.epoch_times)
+    assert stats.neurons_added == len(rce_trainer.rce_network.hidden_layer)
+    assert stats.distance_evaluations >= stats.shrinks > 0
+    assert observer.calls == {"training_started": 1, "epoch_started": stats.epochs, "point_started": stats.point_visits,
+                              "point_finished": stats.point_visits, "hit": stats.hits, "neuron_shrunk": stats.shrinks,
+                              "neuron_added": stats.neurons_added, "epoch_finished": stats.epochs, "training_finished": 1}
+    if use_worklist:
+        assert stats.point_visits == rce_trainer.worklist_report.point_visits
+    else:
+        assert stats.point_visits == stats.epochs * len(training_input)
+        assert stats.hits + stats.neurons_added == stats.point_visits
+
+
+def test_training_stats_do_not_depend_on_trace():
+    training_input = load_points(TEST_FILES[1])
+    traced = RceTrainer(3).Train(training_input)
+    rce_trainer = RceTrainer(3)
+    fast = rce_trainer.Train(training_input, record_trace=False)
+
+    # All but the times
+    assert fast[:-2] == traced[:-2]
+
+
+def reference_train_nd(training_input, r_max):
+    """
+    Plain per-neuron RCE training loop for points with any number of coordinates.
+    """
+    hidden = []  # [weights, radius, class_name]
+    modification = True
+    while modification:
+        modification = False
+        for point in training_input:
+            hit = False
+            for neuron in hidden:
+                distance = sum((a - b) ** 2 for a, b in zip(point.coordinates, neuron[0])) ** 0.5
+                if distance <= neuron[1]:
+                    if neuron[2] == point.class_name:
+                        hit = True
+                    else:
+                        modification = True
+                        neuron[1] = distance / 2
+            if not hit:
+                hidden.append([list(point.coordinates), r_max, point.class_name])
+                modification = True
+    return [tuple(neuron) for neuron in hidden]
+
+
+@pytest.mark.parametrize("dimensions", [1, 3, 8])
+@pytest.mark.parametrize("use_spatial_index, distance_cache_bytes, use_worklist", [(False, 0, False), (True, 0, False),
+                                                                                    (True, 4000, True)])
+def test_n_dimensional_training_matches_per_neuron_loop(dimensions, use_spatial_index, distance_cache_bytes, use_worklist):
+    generator = random.Random(dimensions)
+    coordinates = {tuple(float(generator.randrange(4)) for _ in range(dimensions)) for _ in range(150)}
+    training_input = [Point.from_coordinates(point, generator.choice(["Red", "Green", "Blue"])) for point in sorted(coordinates)]
+    generator.shuffle(training_input)
+    r_max = 1.5 * dimensions ** 0.5
+
+    rce_trainer = RceTrainer(r_max, use_spatial_index=use_spatial_index, distance_cache_bytes=distance_cache_bytes)
+    rce_trainer.Train(training_input, record_trace=False, use_worklist=use_worklist)
+
+    assert layers(rce_trainer.rce_network)[0] == reference_train_nd(training_input, r_max)
+    assert rce_trainer.rce_network.dimensions == dimensions
+
+
+def test_training_points_must_have_same_dimensions():
+    with pytest.raises(ValueError):
+        RceTrainer(1).Train([Point(0.0, 0.0, "Red"), Point.from_coordinates([1.0, 1.0, 1.0], "Blue")])
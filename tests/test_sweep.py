@@ -0,0 +1,62 @@
+import json
+
+import numpy as np
+
+import rce_cli
+from benchmarks.datasets import generate, to_points
+from data.shared_dataset import SharedDataset
+from rce.rce_trainer import RceTrainer
+from rce.evaluation import split_holdout
+from rce.sweep import SweepResult, smallest_model, sweep
+from helpers import REAL_FILE
+
+
+def test_sweep_does_not_depend_on_workers():
+    coordinates, labels = generate("clustered", 300, seed=3)
+    in_process = sweep(coordinates, labels, [0.5, 1, 2], orderings=2, workers=1)
+    parallel = sweep(coordinates, labels, [0.5, 1, 2], orderings=2, workers=2)
+
+    assert [(result.r_max, result.ordering) for result in in_process] == [(r_max, ordering) for r_max in [0.5, 1, 2] for ordering in range(2)]
+    assert [result[:4] + result[5:] for result in parallel] == [result[:4] + result[5:] for result in in_process]
+    assert all(0 <= result.accuracy <= 1 for result in in_process)
+
+
+def test_sweep_trains_on_training_split():
+    coordinates, labels = generate("random", 200, seed=1)
+    training_indexes, holdout_indexes = split_holdout(len(labels), 0.25, 0)
+    assert len(holdout_indexes) == 50 and len(np.union1d(training_indexes, holdout_indexes)) == 200
+
+    rce_trainer = RceTrainer(1.5)
+    stats = rce_trainer.Train(to_points(coordinates[training_indexes], [labels[i] for i in training_indexes]), record_trace=False)
+    result = sweep(coordinates, labels, [1.5], holdout=0.25, workers=1)[0]
+    assert (result.hidden_neurons, result.epochs) == (len(rce_trainer.rce_network.hidden_layer), stats.epochs)
+    assert sweep(coordinates, labels, [1.5], holdout=0, workers=1)[0].accuracy is None
+
+
+def test_shared_dataset_attach():
+    coordinates, labels = generate("radial", 50)
+    with SharedDataset(coordinates, labels) as dataset:
+        blocks, shared_coordinates, codes, class_names = SharedDataset.attach(dataset.handle())
+        assert shared_coordinates.tolist() == coordinates.tolist()
+        assert [class_names[code] for code in codes] == labels
+        del shared_coordinates, codes
+        for block in blocks:
+            block.close()
+
+
+def test_smallest_model():
+    results = [SweepResult(1, 0, 10, 2, 0.5, 0.9), SweepResult(2, 0, 5, 3, 2.0, 0.8), SweepResult(3, 0, 5, 3, 1.0, 0.7)]
+    assert smallest_model(results) == results[2]
+    assert smallest_model(results, min_accuracy=0.75) == results[1]
+    assert smallest_model(results, min_accuracy=0.75, max_training_time=1) == results[0]
+    assert smallest_model(results, min_accuracy=0.95) is None
+
+
+def test_sweep_cli(tmp_path, capsys):
+    output_file = str(tmp_path / "sweep.json")
+    rce_cli.main(["sweep", REAL_FILE, "--r-max-range", "1", "3", "3", "--workers", "1", "--output", output_file])
+
+    with open(output_file, 'r') as f:
+        results = json.load(f)
+    assert [result["r_max"] for result in results] == [1, 2, 3]
+    assert "smallest model" in capsys.readouterr().out
@@ -0,0 +1,87 @@
+import copy
+import os
+
+import pytest
+
+from data.point import Point
+from rce.rce_trainer import RceTrainer
+from rce.training_trace import TrainingTrace
+from helpers import TEST_FILES, load_points, state
+
+
+@pytest.mark.parametrize("file_name", TEST_FILES, ids=os.path.basename)
+@pytest.mark.parametrize("keyframe_interval", [1, 7, 100000])
+def test_rebuilt_steps_match_full_copies(file_name, keyframe_interval, monkeypatch):
+    # Keep a full copy of the network at every step as the reference
+    full_copies = []
+    snapshot = TrainingTrace.snapshot
+    def snapshot_with_copy(self, rce_network):
+        full_copies.append(copy.deepcopy(rce_network))
+        snapshot(self, rce_network)
+    monkeypatch.setattr(TrainingTrace, "snapshot", snapshot_with_copy)
+
+    rce_trainer = RceTrainer(1.5, keyframe_interval=keyframe_interval)
+    rce_trainer.Train(load_points(file_name))
+    trace = rce_trainer.rce_networks
+
+    assert len(trace) == len(full_copies)
+    # Random access, backwards and forwards
+    indexes = list(range(len(trace)))
+    for index in indexes[::-1] + indexes:
+        assert state(trace[index]) == state(full_copies[index])
+        assert trace.step(index).iteration == full_copies[index].iteration
+    assert state(trace[-1]) == state(full_copies[-1])
+    assert trace[0] is not trace[0]
+
+
+@pytest.mark.parametrize("file_name", TEST_FILES, ids=os.path.basename)
+def test_iter_steps_matches_train(file_name):
+    training_input = load_points(file_name)
+    rce_trainer = RceTrainer(1.5)
+    rce_trainer.Train(training_input)
+    lazy = RceTrainer(1.5)
+    steps = lazy.iter_steps(training_input)
+
+    index, step, events = next(steps)
+    assert (index, events, len(lazy.rce_networks)) == (0, [], 1)
+    assert not lazy.training_done
+    for index, step, events in steps:
+        assert len(lazy.rce_networks) == index + 1
+        assert step == rce_trainer.rce_networks.step(index)
+        assert events == rce_trainer.rce_networks.events[rce_trainer.rce_networks.step(index - 1).event_end:step.event_end]
+    assert lazy.training_done
+    assert len(lazy.rce_networks) == len(rce_trainer.rce_networks)
+    assert state(lazy.rce_networks[-1]) == state(rce_trainer.rce_networks[-1])
+
+
+@pytest.mark.parametrize("file_name", TEST_FILES, ids=os.path.basename)
+def test_epoch_and_training_vector_index(file_name):
+    rce_trainer = RceTrainer(1.5)
+    rce_trainer.Train(load_points(file_name))
+    trace = rce_trainer.rce_networks
+
+    # First occurrences found by scanning all steps
+    epoch_steps, training_vector_steps = {}, {}
+    for index in range(len(trace)):
+        step = trace.step(index)
+        epoch_steps.setdefault(step.iteration, index)
+        training_vector_steps.setdefault((step.iteration, step.train_input_index), index)
+
+    assert trace.epoch_steps == [epoch_steps[iteration] for iteration in range(len(epoch_steps))]
+    assert trace.epoch_start(len(epoch_steps)) is None
+    assert trace.training_vector_steps == training_vector_steps
+    assert trace.training_vector_start(len(epoch_steps), 0) is None
+
+
+def test_steps_store_descriptions_not_text():
+    training_input = [Point(0.0, 0.0, "Red"), Point(1.0, 0.0, "Green")]
+    rce_trainer = RceTrainer(3)
+    rce_trainer.Train(training_input)
+    trace = rce_trainer.rce_networks
+
+    assert not any(isinstance(step.step_comment, str) or isinstance(step.step_action, str) for step in trace.steps)
+    assert trace[0].action == "No action - new network was created"
+    shrink = trace[2]
+    assert shrink.comment == ("Comparing training point [1.0, 0.0, class = Green] to hidden neuron [[0.0, 0.0], r=3.00, output=[Red]]"
+                              " - hit, class doesn't match - updating hidden neuron to [[0.0, 0.0], r=0.50, output=[Red]]")
+    assert shrink.action == "Modifying hidden neuron [[0.0, 0.0], r=3.00, output=[Red]] to [[0.0, 0.0], r=0.50, output=[Red]]"
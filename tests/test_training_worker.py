@@ -0,0 +1,55 @@
+import threading
+
+from rce.rce_trainer import RceTrainer
+from rce.training_worker import TrainingWorker
+from helpers import TEST_FILES, layers, load_points, state
+
+
+def test_worker_matches_blocking_training():
+    training_input = load_points(TEST_FILES[-3])
+    blocking = RceTrainer(1.5)
+    blocking.Train(training_input)
+
+    progress, previews, finished = [], [], []
+    rce_trainer = RceTrainer(1.5)
+    worker = TrainingWorker(rce_trainer, training_input, on_progress=progress.append,
+                            on_preview=lambda index, rce_network: previews.append((index, rce_network)),
+                            on_finished=finished.append, progress_interval=0, preview_interval=0)
+    worker.start()
+    worker.join(60)
+
+    assert not worker.is_running()
+    assert finished == [False]
+    assert rce_trainer.training_done
+    assert layers(rce_trainer.rce_network) == layers(blocking.rce_network)
+    assert len(rce_trainer.rce_networks) == len(blocking.rce_networks)
+    assert progress[-1].steps == len(blocking.rce_networks)
+    assert progress[-1].hidden_neurons == len(blocking.rce_network.hidden_layer)
+    for index, rce_network in previews:
+        assert state(rce_network) == state(blocking.rce_networks[index])
+
+
+def test_worker_cancel():
+    training_input = load_points(TEST_FILES[-3])
+    rce_trainer = RceTrainer(1.5)
+    started = threading.Event()
+    resume = threading.Event()
+    finished = []
+
+    def on_progress(progress):
+        started.set()
+        resume.wait(10)
+
+    worker = TrainingWorker(rce_trainer, training_input, on_progress=on_progress,
+                            on_finished=finished.append, progress_interval=0)
+    worker.start()
+    assert started.wait(10)
+    worker.cancel()
+    resume.set()
+    worker.join(10)
+
+    assert finished == [True]
+    assert not rce_trainer.training_done
+    # Steps computed before cancellation can still be rebuilt
+    assert 0 < len(rce_trainer.rce_networks) < 10
+    assert rce_trainer.rce_networks[-1] is not None